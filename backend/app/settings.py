@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import os
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -39,6 +41,8 @@ CORS_ALLOWED_ORIGINS = [
     "http://forms.comfamiliar.com",
 ]
 
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -46,13 +50,35 @@ LOGGING = {
         "console": {"class": "logging.StreamHandler"},
     },
     "loggers": {
-        "django.db.backends": {
+        "dbal.slow_query": {
             "handlers": ["console"],
-            "level": "DEBUG",
+            "level": "WARNING",
+        },
+        "forms.nplusone": {
+            "handlers": ["console"],
+            "level": "WARNING",
         },
     },
 }
 
+# Instrumentación de consultas DB2 (dbal.ibmi.instrumentation).
+# Reemplaza el logging DEBUG de django.db.backends: solo se registran las
+# consultas por encima de SLOW_QUERY_MS, muestreadas con SLOW_QUERY_SAMPLE_RATE.
+DBAL_INSTRUMENTATION = {
+    "ENABLED": True,
+    "SLOW_QUERY_MS": int(os.environ.get("DB2_SLOW_QUERY_MS", "500")),
+    "SLOW_QUERY_SAMPLE_RATE": float(os.environ.get("DB2_SLOW_QUERY_SAMPLE_RATE", "1.0")),
+    "MAX_FINGERPRINTS": 500,
+}
+
+# Detector de consultas N+1 (forms.middleware.n_plus_one). En CI se puede
+# activar NPLUSONE_RAISE=1 para que las peticiones con N+1 fallen.
+NPLUSONE_DETECTOR = {
+    "ENABLED": DEBUG,
+    "THRESHOLD": 5,
+    "RAISE": os.environ.get("NPLUSONE_RAISE") == "1",
+}
+
 
 # Application definition
 
@@ -77,6 +103,10 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "forms.middleware.deadline.DeadlineMiddleware",
+    "forms.middleware.query_context.QueryContextMiddleware",
+    "forms.middleware.cache_versions.CacheVersionsMiddleware",
+    "forms.middleware.n_plus_one.NPlusOneDetectorMiddleware",
 ]
 
 ROOT_URLCONF = "app.urls"
@@ -114,10 +144,46 @@ DATABASES = {
         "PORT": os.environ.get("DB2_PORT"),
         "OPTIONS": {
             "driver": "IBM i Access ODBC Driver",
+            "use_dsn": os.environ.get("DB2_USE_DSN", "1") == "1",
+            # Atributos de rendimiento del IBM i Access ODBC Driver. Vacío =
+            # se respeta lo configurado en odbc.ini.
+            "block_fetch": os.environ.get("DB2_BLOCK_FETCH", "1"),
+            "block_size_kb": os.environ.get("DB2_BLOCK_SIZE_KB", "256"),
+            "compression": os.environ.get("DB2_COMPRESSION", "1"),
+            "lazy_close": os.environ.get("DB2_LAZY_CLOSE", "1"),
+            "extended_dynamic": os.environ.get("DB2_EXTENDED_DYNAMIC", ""),
+            "package_library": os.environ.get("DB2_PACKAGE_LIBRARY", ""),
+            "package": os.environ.get("DB2_PACKAGE", ""),
+            "query_optimize_goal": os.environ.get("DB2_QUERY_OPTIMIZE_GOAL", ""),
+            # Filas por fetchmany en QuerySet.iterator() / cursores por bloques
+            "fetch_size": int(os.environ.get("DB2_FETCH_SIZE", "2000")),
+            # Límite por statement en segundos (0 = solo el deadline de la petición)
+            "query_timeout": int(os.environ.get("DB2_QUERY_TIMEOUT", "0")),
+            # Espera máxima al abrir la conexión (además del deadline de la petición)
+            "login_timeout": int(os.environ.get("DB2_LOGIN_TIMEOUT", "10")),
+            # Output converters de pyodbc (dbal/ibmi/converters.py). Apagados
+            # hasta confirmar los formatos con DB2_CHECK_CONVERTERS=1 manage.py
+            # test forms.tests.test_db_converters contra el driver real.
+            "output_converters": os.environ.get("DB2_OUTPUT_CONVERTERS", "0") == "1",
         },
     }
 }
 
+# "shared": caché en disco compartida por los workers de gunicorn y por el
+# drenador del spool, usada para contadores de versión
+# (forms/utils/cache_versions.py). En docker-compose SHARED_CACHE_DIR es un
+# volumen montado en ambos contenedores: si cada uno tuviera el suyo, el
+# drenador nunca vería los cambios de formularios y webhooks.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "shared": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("SHARED_CACHE_DIR", "/tmp/tiforms-cache"),
+        "TIMEOUT": None,
+    },
+}
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -162,5 +228,89 @@ STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Presupuesto de tiempo por petición (segundos), por nombre de URL. Debe
+# quedar por debajo del proxy_read_timeout de nginx (30s) y del --timeout de
+# gunicorn (60s). Aplica a consultas DB2 y llamadas HTTP salientes.
+REQUEST_DEADLINES = {
+    "ENABLED": os.environ.get("REQUEST_DEADLINES_ENABLED", "1") == "1",
+    "DEFAULT": float(os.environ.get("REQUEST_DEADLINE_SECONDS", "25")),
+    "VIEWS": {
+        "health-check": 2,
+        "beneficiarios": 10,
+        "consecutivos-recibos": 10,
+    },
+    "RETRY_AFTER": 5,
+}
+
+# Ingesta de submissions (forms/services/submission_service.py)
+SUBMISSION_INGEST = {
+    "FORM_CACHE_TTL": 60,
+    "VALIDATE": os.environ.get("SUBMISSION_VALIDATE", "1") == "1",
+    "STRIP_UNKNOWN_FIELDS": os.environ.get("SUBMISSION_STRIP_UNKNOWN", "0") == "1",
+    "BATCH_MAX_ITEMS": int(os.environ.get("SUBMISSION_BATCH_MAX_ITEMS", "100")),
+}
+
+# API genérica POST /api/<model_name>/ (forms/services/generic_model_service.py)
+GENERIC_API = {
+    "BULK_MAX_ITEMS": int(os.environ.get("GENERIC_API_BULK_MAX_ITEMS", "500")),
+    "BULK_BATCH_SIZE": 100,
+}
+
+# Spool local de submissions cuando DB2 no responde
+# (forms/services/submission_spool.py, manage.py drain_submission_spool)
+SUBMISSION_SPOOL = {
+    "ENABLED": os.environ.get("SUBMISSION_SPOOL_ENABLED", "1") == "1",
+    "PATH": os.path.join(BASE_DIR, "uploads", ".spool", "submissions.sqlite3"),
+    "DB_TIMEOUT": float(os.environ.get("SUBMISSION_SPOOL_DB_TIMEOUT", "5")),
+    "COOLDOWN": 15,
+    "DRAIN_BATCH_SIZE": 100,
+}
+
+# Exportación de submissions (GET /api/forms/<slug>/export/, manage.py export_submissions)
+SUBMISSION_EXPORT = {
+    "CHUNK_SIZE": int(os.environ.get("SUBMISSION_EXPORT_CHUNK_SIZE", "1000")),
+}
+
+# Almacenamiento de FORMSUBMISSION.DATA (forms/utils/submission_codec.py):
+# "json" guarda texto en DATA; "zlib"/"zstd" comprimen en DATA_BLOB los
+# payloads de al menos MIN_BYTES. Migración: manage.py compress_submissions
+SUBMISSION_STORAGE = {
+    "CODEC": os.environ.get("SUBMISSION_STORAGE_CODEC", "json"),
+    "MIN_BYTES": int(os.environ.get("SUBMISSION_STORAGE_MIN_BYTES", "1024")),
+}
+
+# Entrega de webhooks en segundo plano (forms/services/webhook_delivery.py)
+WEBHOOK_DELIVERY = {
+    "MAX_WORKERS": int(os.environ.get("WEBHOOK_DELIVERY_WORKERS", "4")),
+}
+
+# Circuit breaker por host para webhooks y la API de CME
+# (forms/services/circuit_breaker.py, estado en GET /api/metrics/circuit-breakers/, solo staff)
+CIRCUIT_BREAKER = {
+    "ENABLED": os.environ.get("CIRCUIT_BREAKER_ENABLED", "1") == "1",
+    "WINDOW": 60,
+    "MIN_REQUESTS": 5,
+    "FAILURE_RATE": 0.5,
+    "OPEN_SECONDS": int(os.environ.get("CIRCUIT_BREAKER_OPEN_SECONDS", "30")),
+}
+
+# Header Idempotency-Key en POST /api/submissions/ (tabla TIFORMS.IDEMPOTENCY_KEY)
+IDEMPOTENCY = {
+    "TTL_SECONDS": int(os.environ.get("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600))),
+    "PROCESSING_TIMEOUT": 120,
+    "CACHE_SIZE": 2048,
+    "CACHE_TTL_SECONDS": 600,
+}
+
+# Retención de FORMSUBMISSION y SUBMISSION_TASK_LOG (manage.py archive_submissions).
+# FORMS permite políticas por formulario (slug o id -> días, None = conservar).
+SUBMISSION_RETENTION = {
+    "DEFAULT_DAYS": int(os.environ.get("SUBMISSION_RETENTION_DAYS", "365")),
+    "TASK_LOG_DAYS": int(os.environ.get("TASK_LOG_RETENTION_DAYS", "90")),
+    "FORMS": {},
+    "BATCH_SIZE": 500,
+    "ARCHIVE_DIR": os.environ.get("ARCHIVE_DIR", os.path.join(BASE_DIR, "archive")),
+}
+
 MEDIA_URL = "/uploads/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "uploads")
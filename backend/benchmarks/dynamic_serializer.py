@@ -0,0 +1,85 @@
+"""
+Benchmark del serializer de POST /api/<model_name>/ para soporte_fomag:
+construir el serializer y validar un payload típico, sin guardar.
+
+Compara, por petición:
+- cached: serializer por modelo y campos ya construidos (DynamicSerializerCache)
+- legacy: crear la clase con type(...) y que DRF introspeccione el modelo
+
+Usa una configuración de Django mínima (SQLite en memoria); no toca DB2.
+
+Uso (desde backend/):
+    python benchmarks/dynamic_serializer.py --repeat 5000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+settings.configure(
+    INSTALLED_APPS=[
+        "django.contrib.contenttypes",
+        "django.contrib.auth",
+        "rest_framework",
+        "forms",
+    ],
+    DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}},
+    USE_TZ=True,
+)
+django.setup()
+
+from rest_framework import serializers  # noqa: E402
+from forms.models.soporte_fomag import SoporteFomag  # noqa: E402
+from forms.views.mixins import DynamicSerializerCache  # noqa: E402
+
+PAYLOAD = {
+    "mrcodcons": "123456",
+    "benumdocbe": "1088000000",
+    "autorizacion": "SI",
+    "img_autorizacion": "uploads/autorizacion.pdf",
+    "servicio_directo": "NO",
+    "orden_comfamiliar": "SI",
+    "img_orden": "uploads/orden.pdf",
+    "certificado": "SI",
+    "firma_usuario": "uploads/firma.png",
+}
+
+
+def legacy_serializer_class(model_class):
+    return type(
+        f"Dynamic{model_class.__name__}Serializer",
+        (serializers.ModelSerializer,),
+        {"Meta": type("Meta", (), {"model": model_class, "fields": "__all__"})},
+    )
+
+
+def measure(get_class, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        serializer = get_class(SoporteFomag)(data=PAYLOAD)
+        serializer.is_valid(raise_exception=True)
+        timings.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(timings), statistics.quantiles(timings, n=100)[98]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    cache = DynamicSerializerCache()
+    for name, get_class in (("legacy", legacy_serializer_class), ("cached", cache.get)):
+        p50, p99 = measure(get_class, args.repeat)
+        print(f"{name:7s} p50 {p50:7.1f} µs  p99 {p99:7.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
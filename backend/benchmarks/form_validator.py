@@ -0,0 +1,119 @@
+"""
+Benchmark del validador compilado de submissions sobre un formulario de 100
+campos con dependencias condicionales (cadenas depends_on de hasta 4 niveles).
+
+Compara, por submission:
+- compiled: FormValidator ya compilado y cacheado (lo que hace la ingesta)
+- compile+validate: compilar en cada submission (sin caché)
+- naive: recorrer los campos buscando al padre linealmente y resolviendo la
+  cadena de dependencias de cada campo, con las opciones en listas
+
+Uso (desde backend/):
+    python benchmarks/form_validator.py --fields 100 --repeat 2000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from forms.utils.form_validator import FieldSpec, FormValidator  # noqa: E402
+
+
+def build_form(n_fields, seed=7):
+    rng = random.Random(seed)
+    specs = []
+    for i in range(n_fields):
+        kind = rng.choice(["text", "text", "select", "radio", "date", "checkbox"])
+        options = frozenset(f"op{j}" for j in range(8)) if kind in ("select", "radio", "checkbox") else None
+        depends_on = depends_value = None
+        # Un tercio de los campos depende de un select/radio anterior
+        parents = [s for s in specs if s.options and s.field_type != "checkbox"]
+        if parents and rng.random() < 0.33:
+            parent = rng.choice(parents[-10:])
+            depends_on, depends_value = parent.name, rng.choice(sorted(parent.options))
+        specs.append(FieldSpec(f"campo_{i}", kind, rng.random() < 0.5, options, depends_on, depends_value))
+    # Orden de presentación distinto del orden de dependencias
+    rng.shuffle(specs)
+    return specs
+
+
+def build_payload(specs, seed=11):
+    rng = random.Random(seed)
+    data = {}
+    for spec in specs:
+        if spec.options:
+            data[spec.name] = rng.choice(sorted(spec.options))
+        elif spec.field_type == "date":
+            data[spec.name] = "2025-03-01"
+        else:
+            data[spec.name] = "valor"
+    return data
+
+
+def naive_validate(specs, data):
+    """Lo que haría una validación directa sobre los modelos, sin compilar"""
+
+    def is_active(spec):
+        while spec.depends_on:
+            parent = next((s for s in specs if s.name == spec.depends_on), None)
+            if parent is None:
+                return True
+            if data.get(spec.depends_on) != spec.depends_value:
+                return False
+            spec = parent
+        return True
+
+    cleaned, errors = dict(data), {}
+    for spec in specs:
+        if not is_active(spec):
+            cleaned.pop(spec.name, None)
+            continue
+        value = cleaned.get(spec.name)
+        if not value:
+            if spec.required:
+                errors[spec.name] = "Este campo es obligatorio"
+            continue
+        if spec.options and value not in list(spec.options):
+            errors[spec.name] = "Opción no válida"
+    return cleaned, errors
+
+
+def measure(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1e6)
+    times.sort()
+    return statistics.median(times), times[int(len(times) * 0.95)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fields", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    specs = build_form(args.fields)
+    data = build_payload(specs)
+    validator = FormValidator(specs)
+
+    cleaned, errors = validator.validate(data)
+    expected, _ = naive_validate(specs, data)
+    assert cleaned == expected, "compiled y naive deben quitar los mismos campos"
+
+    print(f"{args.fields} campos, {sum(1 for s in specs if s.depends_on)} condicionales, "
+          f"{len(data) - len(cleaned)} inactivos en el payload")
+    print(f"{'modo':<20}{'p50 µs':>10}{'p95 µs':>10}")
+    for label, fn in [
+        ("compiled", lambda: validator.validate(data)),
+        ("compile+validate", lambda: FormValidator(specs).validate(data)),
+        ("naive", lambda: naive_validate(specs, data)),
+    ]:
+        p50, p95 = measure(fn, args.repeat)
+        print(f"{label:<20}{p50:>10.1f}{p95:>10.1f}")
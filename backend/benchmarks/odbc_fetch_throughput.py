@@ -0,0 +1,97 @@
+"""
+Benchmark del throughput de lectura según los atributos de conexión ODBC
+(BlockFetch, BlockSizeKB, AllowDataCompression).
+
+Usa la FakeConnection de dbal/ibmi_driver.py, que simula el costo de cada
+viaje de red (latencia + ancho de banda) al traer un bloque de filas, así se
+pueden comparar configuraciones sin un IBM i. Los valores absolutos dependen
+de --rtt-ms / --bandwidth-mbps; lo que interesa es la relación entre filas.
+
+Con --dsn se mide además contra un IBM i real (requiere el driver ODBC):
+    python benchmarks/odbc_fetch_throughput.py --dsn PROD --uid U --pwd P \\
+        --query 'SELECT * FROM "TIFORMS"."FORMSUBMISSION" FETCH FIRST 20000 ROWS ONLY'
+
+Uso (desde backend/):
+    python benchmarks/odbc_fetch_throughput.py --rows 20000 --rtt-ms 1
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dbal.ibmi_driver import FakeConnection, IbmiDriver  # noqa: E402
+
+CONFIGURATIONS = [
+    ("sin block fetch", {"block_fetch": 0}),
+    ("block 32KB", {"block_fetch": 1, "block_size_kb": 32}),
+    ("block 256KB", {"block_fetch": 1, "block_size_kb": 256}),
+    ("block 256KB + compresión", {"block_fetch": 1, "block_size_kb": 256, "compression": 1}),
+    ("block 512KB + compresión", {"block_fetch": 1, "block_size_kb": 512, "compression": 1}),
+]
+
+
+def drain(cursor, fetch_size):
+    rows = 0
+    while True:
+        chunk = cursor.fetchmany(fetch_size)
+        if not chunk:
+            return rows
+        rows += len(chunk)
+
+
+def run_simulated(args):
+    print(f"Simulado: {args.rows} filas de {args.row_bytes} bytes, RTT {args.rtt_ms} ms, "
+          f"{args.bandwidth_mbps} Mbps, fetchmany({args.fetch_size})")
+    print(f"{'configuración':<28}{'viajes':>8}{'segundos':>10}{'filas/s':>12}")
+    for label, attributes in CONFIGURATIONS:
+        conn = FakeConnection(
+            {"ATTRIBUTES": attributes},
+            rows=args.rows,
+            row_bytes=args.row_bytes,
+            round_trip_ms=args.rtt_ms,
+            bandwidth_mbps=args.bandwidth_mbps,
+        )
+        cursor = conn.cursor()
+        start = time.perf_counter()
+        cursor.execute("SELECT 1")
+        fetched = drain(cursor, args.fetch_size)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<28}{conn.round_trips:>8}{elapsed:>10.3f}{fetched / elapsed:>12.0f}")
+
+
+def run_live(args):
+    print(f"\nIBM i ({args.dsn}): {args.query}")
+    print(f"{'configuración':<28}{'filas':>8}{'segundos':>10}{'filas/s':>12}")
+    for label, attributes in CONFIGURATIONS:
+        params = {"DSN": args.dsn, "UID": args.uid, "PWD": args.pwd, "ATTRIBUTES": attributes}
+        conn = IbmiDriver().connect(params)
+        try:
+            cursor = conn.cursor()
+            start = time.perf_counter()
+            cursor.execute(args.query)
+            fetched = drain(cursor, args.fetch_size)
+            elapsed = time.perf_counter() - start
+        finally:
+            conn.close()
+        print(f"{label:<28}{fetched:>8}{elapsed:>10.3f}{fetched / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--row-bytes", type=int, default=400)
+    parser.add_argument("--rtt-ms", type=float, default=1.0)
+    parser.add_argument("--bandwidth-mbps", type=float, default=100.0)
+    parser.add_argument("--fetch-size", type=int, default=500)
+    parser.add_argument("--dsn")
+    parser.add_argument("--uid")
+    parser.add_argument("--pwd")
+    parser.add_argument("--query")
+    args = parser.parse_args()
+
+    run_simulated(args)
+    if args.dsn and args.query:
+        run_live(args)
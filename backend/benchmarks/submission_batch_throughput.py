@@ -0,0 +1,69 @@
+"""
+Throughput de ingesta: POST /api/submissions/ uno a uno frente a
+POST /api/submissions/batch/ con lotes de distintos tamaños, contra un
+servidor en ejecución (crea submissions reales en el formulario indicado).
+
+Uso (desde backend/):
+    python benchmarks/submission_batch_throughput.py \\
+        --base-url http://localhost:8000/api --form-id 1 \\
+        --field nombre=Prueba --total 200 --batch-sizes 10 50 100
+"""
+
+import argparse
+import time
+
+import requests
+
+
+def parse_fields(values):
+    data = {}
+    for value in values:
+        key, _, field_value = value.partition("=")
+        data[key] = field_value
+    return data
+
+
+def run_single(session, args, data):
+    start = time.perf_counter()
+    for _ in range(args.total):
+        response = session.post(
+            f"{args.base_url}/submissions/", json={"form_id": args.form_id, **data}, timeout=60
+        )
+        response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def run_batch(session, args, data, batch_size):
+    start = time.perf_counter()
+    sent = 0
+    while sent < args.total:
+        size = min(batch_size, args.total - sent)
+        items = [{"form_id": args.form_id, "data": data} for _ in range(size)]
+        response = session.post(f"{args.base_url}/submissions/batch/", json=items, timeout=120)
+        if response.status_code != 201:
+            raise RuntimeError(f"HTTP {response.status_code}: {response.text[:500]}")
+        sent += size
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000/api")
+    parser.add_argument("--form-id", type=int, required=True)
+    parser.add_argument("--field", action="append", default=[], help="campo=valor del payload")
+    parser.add_argument("--total", type=int, default=200)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[10, 50, 100])
+    args = parser.parse_args()
+
+    data = parse_fields(args.field)
+    session = requests.Session()
+
+    print(f"{args.total} submissions al formulario {args.form_id}")
+    print(f"{'modo':<16}{'segundos':>10}{'subs/s':>10}")
+
+    elapsed = run_single(session, args, data)
+    print(f"{'individual':<16}{elapsed:>10.2f}{args.total / elapsed:>10.1f}")
+
+    for batch_size in args.batch_sizes:
+        elapsed = run_batch(session, args, data, batch_size)
+        print(f"{f'lote de {batch_size}':<16}{elapsed:>10.2f}{args.total / elapsed:>10.1f}")
@@ -0,0 +1,94 @@
+"""
+Benchmark del almacenamiento de FORMSUBMISSION.DATA con payloads sintéticos
+parecidos a los de producción: textos largos, listas de opciones y firmas
+como data URL base64.
+
+Compara por códec (json = texto en DATA, zlib, zstd si está instalado):
+- bytes guardados por submission (DATA o DATA_BLOB)
+- p50 de codificar (pack) y de decodificar al leer (unpack)
+
+El tiempo de lectura desde DB2 no se mide aquí: con BLOB viajan menos bytes
+por ODBC, así que la diferencia real a favor de los códecs suele ser mayor.
+
+Uso (desde backend/):
+    python benchmarks/submission_storage_codec.py --submissions 2000
+"""
+
+import argparse
+import base64
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from forms.utils.submission_codec import DEFAULTS, pack, unpack, zstandard  # noqa: E402
+
+WORDS = (
+    "paciente consulta control afiliado cotizante beneficiario soporte "
+    "medicamento autorización servicio urgencias remisión orden"
+).split()
+
+
+def build_payload(rng, n_fields, signature_bytes):
+    data = {}
+    for i in range(n_fields):
+        kind = i % 4
+        if kind == 0:
+            data[f"campo_{i}"] = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 60)))
+        elif kind == 1:
+            data[f"campo_{i}"] = [f"opcion_{rng.randint(1, 9)}" for _ in range(rng.randint(1, 4))]
+        elif kind == 2:
+            data[f"campo_{i}"] = f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        else:
+            data[f"campo_{i}"] = str(rng.randint(10**6, 10**10))
+    if signature_bytes:
+        # Firma dibujada: PNG con mucho fondo repetido
+        raw = bytes(rng.choice((0, 0, 0, 255)) for _ in range(signature_bytes))
+        data["firma"] = "data:image/png;base64," + base64.b64encode(raw).decode()
+    return json.dumps(data)
+
+
+def p50_us(func, payloads):
+    timings = []
+    for payload in payloads:
+        start = time.perf_counter()
+        func(payload)
+        timings.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--submissions", type=int, default=1000)
+    parser.add_argument("--fields", type=int, default=40)
+    parser.add_argument("--signature-bytes", type=int, default=6000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    payloads = [
+        build_payload(rng, args.fields, args.signature_bytes if i % 2 == 0 else 0)
+        for i in range(args.submissions)
+    ]
+    raw_bytes = sum(len(p.encode()) for p in payloads)
+    print(f"{len(payloads)} submissions, {raw_bytes / len(payloads):.0f} bytes de JSON de media")
+
+    codecs = ["json", "zlib"] + (["zstd"] if zstandard is not None else [])
+    for codec in codecs:
+        config = dict(DEFAULTS, CODEC=codec)
+        stored = [pack(p, config) for p in payloads]
+        size = sum(len(b) if b is not None else len(d.encode()) for d, b in stored)
+        encode = p50_us(lambda p: pack(p, config), payloads)
+        decode = p50_us(lambda row: unpack(*row), stored)
+        print(
+            f"{codec:5s} {size / len(payloads):9.0f} bytes/fila ({size / raw_bytes:6.1%})  "
+            f"pack p50 {encode:7.1f} µs  unpack p50 {decode:7.1f} µs"
+        )
+    if zstandard is None:
+        print("zstd: paquete zstandard no instalado")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark del listado de SUBMISSION_TASK_LOG a medida que crece la tabla.
+
+Siembra una tabla con el mismo esquema e índices de sql/sentences.sql en
+SQLite (no requiere DB2) y mide, para cada tamaño:
+
+- keyset: primera página y página profunda con el SQL que generan
+  /api/task-logs/ y /api/task-logs/by-webhook/<id>/ (limit + 1, sin COUNT)
+- legacy: lo que hacía la vista anterior (todas las filas filtradas + COUNT)
+
+Uso (desde backend/):
+    python benchmarks/task_log_listing.py --sizes 10000 100000 1000000
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+SCHEMA = """
+CREATE TABLE SUBMISSION_TASK_LOG (
+    ID INTEGER PRIMARY KEY,
+    FORMSUBMISSION_ID INTEGER NOT NULL,
+    WEBHOOK_CONFIG_ID INTEGER NOT NULL,
+    STATUS VARCHAR(20) NOT NULL,
+    ATTEMPT INTEGER NOT NULL,
+    RESPONSE_DATA VARCHAR(4000),
+    ERROR_MESSAGE TEXT,
+    STARTED_AT TIMESTAMP NOT NULL,
+    COMPLETED_AT TIMESTAMP
+);
+CREATE INDEX TASK_LOG_STARTED_IDX ON SUBMISSION_TASK_LOG (STARTED_AT DESC, ID DESC);
+CREATE INDEX TASK_LOG_WEBHOOK_IDX ON SUBMISSION_TASK_LOG (WEBHOOK_CONFIG_ID, STARTED_AT DESC, ID DESC);
+CREATE INDEX TASK_LOG_WEBHOOK_STATUS_IDX ON SUBMISSION_TASK_LOG (WEBHOOK_CONFIG_ID, STATUS, STARTED_AT DESC, ID DESC);
+CREATE INDEX TASK_LOG_SUBMISSION_IDX ON SUBMISSION_TASK_LOG (FORMSUBMISSION_ID, STARTED_AT DESC, ID DESC);
+"""
+
+COLUMNS = "ID, FORMSUBMISSION_ID, WEBHOOK_CONFIG_ID, STATUS, ATTEMPT, ERROR_MESSAGE, STARTED_AT, COMPLETED_AT"
+
+KEYSET_FIRST = f"""
+SELECT {COLUMNS} FROM SUBMISSION_TASK_LOG
+WHERE WEBHOOK_CONFIG_ID = ? AND STATUS = ?
+ORDER BY STARTED_AT DESC, ID DESC LIMIT ?
+"""
+
+KEYSET_SEEK = f"""
+SELECT {COLUMNS} FROM SUBMISSION_TASK_LOG
+WHERE WEBHOOK_CONFIG_ID = ? AND STATUS = ?
+AND (STARTED_AT < ? OR (STARTED_AT = ? AND ID < ?))
+ORDER BY STARTED_AT DESC, ID DESC LIMIT ?
+"""
+
+KEYSET_ALL = f"""
+SELECT {COLUMNS} FROM SUBMISSION_TASK_LOG
+ORDER BY STARTED_AT DESC, ID DESC LIMIT ?
+"""
+
+LEGACY_ROWS = """
+SELECT * FROM SUBMISSION_TASK_LOG
+WHERE WEBHOOK_CONFIG_ID = ? AND STATUS = ?
+ORDER BY STARTED_AT DESC
+"""
+
+LEGACY_COUNT = """
+SELECT COUNT(*) FROM SUBMISSION_TASK_LOG
+WHERE WEBHOOK_CONFIG_ID = ? AND STATUS = ?
+"""
+
+WEBHOOKS = 20
+STATUSES = ("success", "success", "success", "failed", "running")
+RESPONSE = '{"status_code": 200, "headers": {}, "content": "' + "x" * 400 + '"}'
+
+
+def seed(conn, start, end, base_time):
+    rng = random.Random(start)
+    batch = []
+    for i in range(start + 1, end + 1):
+        started = base_time + datetime.timedelta(seconds=i // 3, microseconds=rng.randint(0, 999999))
+        batch.append(
+            (
+                i,
+                i // 2 + 1,
+                rng.randint(1, WEBHOOKS),
+                rng.choice(STATUSES),
+                1,
+                RESPONSE,
+                "",
+                started.isoformat(" "),
+                started.isoformat(" "),
+            )
+        )
+        if len(batch) >= 50000:
+            conn.executemany("INSERT INTO SUBMISSION_TASK_LOG VALUES (?,?,?,?,?,?,?,?,?)", batch)
+            batch = []
+    if batch:
+        conn.executemany("INSERT INTO SUBMISSION_TASK_LOG VALUES (?,?,?,?,?,?,?,?,?)", batch)
+    conn.commit()
+
+
+def timed(conn, sql, params, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = conn.execute(sql, params).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), rows
+
+
+def run(sizes, limit, repeat, legacy_max):
+    fd, path = tempfile.mkstemp(suffix=".sqlite3")
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    base_time = datetime.datetime(2024, 1, 1)
+
+    print(f"{'filas':>10} {'keyset p1':>11} {'keyset p<=20':>11} {'sin filtro':>11} {'legacy':>11}")
+    seeded = 0
+    try:
+        for size in sizes:
+            seed(conn, seeded, size, base_time)
+            seeded = size
+            conn.execute("ANALYZE")
+
+            params = (7, "success")
+            first_ms, rows = timed(conn, KEYSET_FIRST, params + (limit + 1,), repeat)
+
+            # Avanza hasta 20 páginas para medir una página profunda
+            cursor_row = rows[limit - 1]
+            for _ in range(19):
+                seek_params = params + (cursor_row[6], cursor_row[6], cursor_row[0], limit + 1)
+                rows = conn.execute(KEYSET_SEEK, seek_params).fetchall()
+                if len(rows) <= limit:
+                    break
+                cursor_row = rows[limit - 1]
+            seek_params = params + (cursor_row[6], cursor_row[6], cursor_row[0], limit + 1)
+            deep_ms, _ = timed(conn, KEYSET_SEEK, seek_params, repeat)
+
+            all_ms, _ = timed(conn, KEYSET_ALL, (limit + 1,), repeat)
+
+            if size <= legacy_max:
+                rows_ms, _ = timed(conn, LEGACY_ROWS, params, max(1, repeat // 5))
+                count_ms, _ = timed(conn, LEGACY_COUNT, params, max(1, repeat // 5))
+                legacy = f"{rows_ms + count_ms:>9.2f}ms"
+            else:
+                legacy = f"{'-':>11}"
+
+            print(f"{size:>10} {first_ms:>9.2f}ms {deep_ms:>9.2f}ms {all_ms:>9.2f}ms {legacy}")
+    finally:
+        conn.close()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=25)
+    parser.add_argument("--legacy-max", type=int, default=1000000, help="Tamaño máximo para medir el listado sin paginar")
+    args = parser.parse_args()
+    run(args.sizes, args.limit, args.repeat, args.legacy_max)
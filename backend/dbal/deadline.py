@@ -0,0 +1,97 @@
+"""
+Deadline de la petición en curso, compartido por las consultas DB2 y las
+llamadas HTTP salientes. El middleware DeadlineMiddleware lo fija según el
+presupuesto de cada endpoint; el cursor de dbal.ibmi lo aplica como timeout
+del statement y los clientes `requests` lo usan para acotar su timeout.
+"""
+
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from .exceptions import DeadlineExceeded
+
+# Instante (time.monotonic) en que vence la petición actual; None = sin límite
+_deadline: ContextVar[Optional[float]] = ContextVar("dbal_deadline", default=None)
+
+
+def set_deadline(seconds: Optional[float], start: Optional[float] = None):
+    """
+    Fija el deadline a `start + seconds` (sin ampliar uno ya más cercano) y
+    devuelve el token para reset_deadline().
+    """
+    if seconds is None:
+        return _deadline.set(_deadline.get())
+    expires_at = (start if start is not None else time.monotonic()) + seconds
+    current = _deadline.get()
+    if current is not None:
+        expires_at = min(current, expires_at)
+    return _deadline.set(expires_at)
+
+
+def reset_deadline(token) -> None:
+    _deadline.reset(token)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    token = set_deadline(seconds)
+    try:
+        yield
+    finally:
+        reset_deadline(token)
+
+
+@contextmanager
+def suspended() -> Iterator[None]:
+    """
+    Desactiva el deadline dentro del bloque, para escrituras cortas de
+    registro (p.ej. marcar un task log como fallido) que deben completarse
+    aunque la petición ya no tenga tiempo.
+    """
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Segundos que le quedan a la petición (None = sin deadline)"""
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def check() -> None:
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("Se agotó el tiempo disponible para la petición")
+
+
+def timeout_for(default: Optional[float]) -> Optional[float]:
+    """
+    Timeout para una llamada saliente: el menor entre `default` y lo que le
+    queda a la petición. Falla de inmediato si ya no queda tiempo.
+    """
+    check()
+    left = remaining()
+    if left is None:
+        return default
+    if default is None:
+        return left
+    return min(default, left)
+
+
+def statement_timeout(default: int = 0) -> int:
+    """
+    Timeout en segundos enteros para SQL_ATTR_QUERY_TIMEOUT (0 = sin límite).
+    Se redondea hacia arriba: un timeout de 0 desactivaría el límite.
+    """
+    left = timeout_for(default or None)
+    if left is None:
+        return 0
+    return max(1, math.ceil(left))
@@ -1,3 +1,8 @@
 class Db2ConnectionError(Exception):
     """Error personalizado para conexión DB2."""
     pass
+
+
+class DeadlineExceeded(Exception):
+    """La petición agotó su presupuesto de tiempo (ver dbal.deadline)."""
+    pass
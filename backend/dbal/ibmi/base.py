@@ -1,19 +1,38 @@
+import threading
+import time
+
 import pyodbc
 from django.db.backends.base.base import BaseDatabaseWrapper
-from django.db.backends.base.features import BaseDatabaseFeatures
+from dbal import deadline
+from dbal.exceptions import DeadlineExceeded
 from dbal.ibmi_driver import IbmiDriver
+from .features import DatabaseFeatures
 from .operations import DatabaseOperations
 from .schema import DatabaseSchemaEditor
 from .introspection import DatabaseIntrospection
 from .creation import DatabaseCreation
 from .client import FakeClient
+from . import converters, instrumentation
+
+
+def _raise_if_deadline_exceeded(error):
+    left = deadline.remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("Se agotó el tiempo disponible para la petición") from error
 
 
 class IbmiCursorWrapper:
-    def __init__(self, real_cursor, ops):
+    def __init__(self, real_cursor, ops, name=None, fetch_size=None):
         self.cursor = real_cursor
         self.ops = ops
+        # Traduce pyodbc.* a django.db.* (IntegrityError, OperationalError...)
+        # también cuando el cursor se usa sin el CursorWrapper de Django
+        self.wrap_database_errors = ops.connection.wrap_database_errors
+        self.name = name
         self._lastrowid = None
+        if fetch_size:
+            # fetchmany() sin tamaño usa arraysize (1 por defecto en pyodbc)
+            self.cursor.arraysize = fetch_size
 
     def prepare_sql(self, sql, params):
         """
@@ -41,11 +60,24 @@ class IbmiCursorWrapper:
 
     def execute(self, sql, params=None):
         sql, params = self.prepare_sql(sql, params)
-
-        if params:
-            result = self.cursor.execute(sql, params)
-        else:
-            result = self.cursor.execute(sql)
+        deadline.check()
+
+        start = time.perf_counter()
+        try:
+            with self.wrap_database_errors:
+                try:
+                    if params:
+                        result = self.cursor.execute(sql, params)
+                    else:
+                        result = self.cursor.execute(sql)
+                except pyodbc.Error as e:
+                    # El statement lo canceló SQL_ATTR_QUERY_TIMEOUT por el deadline
+                    _raise_if_deadline_exceeded(e)
+                    raise
+        finally:
+            instrumentation.record_query(
+                sql, time.perf_counter() - start, self._current_rowcount()
+            )
 
         # Captura último ID generado
         if sql.strip().upper().startswith("INSERT"):
@@ -66,10 +98,25 @@ class IbmiCursorWrapper:
             _, new_params = self.prepare_sql(sql, params)
             new_param_list.append(new_params)
 
-        result = self.cursor.executemany(sql, new_param_list)
+        deadline.check()
+        start = time.perf_counter()
+        try:
+            with self.wrap_database_errors:
+                try:
+                    result = self.cursor.executemany(sql, new_param_list)
+                except pyodbc.Error as e:
+                    _raise_if_deadline_exceeded(e)
+                    raise
+        finally:
+            instrumentation.record_query(
+                sql, time.perf_counter() - start, self._current_rowcount(), many=True
+            )
         self._lastrowid = None
         return result
 
+    def _current_rowcount(self):
+        return getattr(self.cursor, "rowcount", -1)
+
     @property
     def lastrowid(self):
         return self._lastrowid
@@ -87,15 +134,18 @@ class IbmiCursorWrapper:
 
     # --- Compatibilidad con Django ORM ---
     def fetchone(self):
-        return self.cursor.fetchone()
+        with self.wrap_database_errors:
+            return self.cursor.fetchone()
 
     def fetchall(self):
-        return self.cursor.fetchall()
+        with self.wrap_database_errors:
+            return self.cursor.fetchall()
 
     def fetchmany(self, size=None):
-        if size is None:
-            return self.cursor.fetchmany()
-        return self.cursor.fetchmany(size)
+        with self.wrap_database_errors:
+            if size is None:
+                return self.cursor.fetchmany()
+            return self.cursor.fetchmany(size)
 
     @property
     def description(self):
@@ -125,7 +175,7 @@ class DatabaseWrapper(BaseDatabaseWrapper):
     vendor = "ibmi"
     display_name = "IBM i Access"
 
-    features_class = BaseDatabaseFeatures
+    features_class = DatabaseFeatures
     ops_class = DatabaseOperations
     SchemaEditorClass = DatabaseSchemaEditor
     introspection_class = DatabaseIntrospection
@@ -149,6 +199,7 @@ class DatabaseWrapper(BaseDatabaseWrapper):
     def __init__(self, settings_dict, alias="default", *args, **kwargs):
         super().__init__(settings_dict, alias, *args, **kwargs)
         self.ops = self.ops_class(self)
+        self._named_cursor_idx = 0
 
     @property
     def operators(self):
@@ -160,30 +211,108 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         self.connection_autocommit = autocommit
 
     def get_connection_params(self):
-        return {
-            "DSN": self.settings_dict.get("NAME"),
+        """
+        Traduce settings.DATABASES a parámetros de conexión. Con
+        OPTIONS["use_dsn"] (por defecto) NAME es el DSN de odbc.ini y las
+        demás OPTIONS sobrescriben sus atributos; sin él se conecta con
+        DRIVER + SYSTEM=HOST y NAME como base de datos relacional.
+
+        PORT no se envía: el IBM i Access ODBC Driver resuelve por sí mismo
+        el puerto del servidor de bases de datos del host.
+        """
+        settings_dict = self.settings_dict
+        options = dict(settings_dict.get("OPTIONS") or {})
+
+        params = {
+            "UID": settings_dict.get("USER"),
+            "PWD": settings_dict.get("PASSWORD"),
+            "LOGIN_TIMEOUT": options.pop("login_timeout", None),
+            "OUTPUT_CONVERTERS": options.pop("output_converters", False),
+            "ATTRIBUTES": options,
         }
+        driver = options.pop("driver", None)
+        if options.pop("use_dsn", True):
+            params["DSN"] = settings_dict.get("NAME")
+        else:
+            params["DRIVER"] = driver
+            params["SYSTEM"] = settings_dict.get("HOST")
+            params["DATABASE"] = settings_dict.get("NAME")
+        return params
 
     def get_new_connection(self, conn_params):
         driver = IbmiDriver()
-        return driver.connect(conn_params, test_only=False)
+        # El login tampoco puede esperar más de lo que le queda a la petición
+        conn_params = {
+            **conn_params,
+            "LOGIN_TIMEOUT": deadline.statement_timeout(conn_params.get("LOGIN_TIMEOUT") or 0),
+        }
+        connection = driver.connect(conn_params, test_only=False)
+        if conn_params.get("OUTPUT_CONVERTERS", False):
+            converters.registry.install(connection._conn)
+        return connection
 
     def ensure_connection(self):
         if self.connection is None:
             params = self.get_connection_params()
             self.connection = self.get_new_connection(params)
 
+    def is_usable(self):
+        """
+        Lo consulta close_old_connections() tras un error: una conexión que
+        DB2 cortó (p.ej. durante una caída) se descarta y la siguiente
+        petición abre otra.
+        """
+        try:
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute("SELECT 1 FROM SYSIBM.SYSDUMMY1")
+            finally:
+                cursor.close()
+        except pyodbc.Error:
+            return False
+        return True
+
     def _cursor(self, name=None):
         """
         Método principal que Django usa para crear cursores
         """
-        return self.create_cursor(name)
+        with self.wrap_database_errors:
+            return self.create_cursor(name)
+
+    @property
+    def fetch_size(self):
+        options = self.settings_dict.get("OPTIONS") or {}
+        return int(options.get("fetch_size") or self.features.default_fetch_size)
+
+    @property
+    def query_timeout(self):
+        """Timeout por statement en segundos (OPTIONS["query_timeout"], 0 = sin límite)"""
+        options = self.settings_dict.get("OPTIONS") or {}
+        return int(options.get("query_timeout") or 0)
 
     def create_cursor(self, name=None):
+        """
+        Con name se crea un cursor de lectura por bloques: ODBC no tiene
+        cursores con nombre como PostgreSQL, pero cada statement es un cursor
+        forward-only en el servidor y el driver trae las filas por bloques, así
+        que basta con no materializar el result set (fetchmany de fetch_size).
+        """
         self.ensure_connection()
+        # pyodbc aplica Connection.timeout (SQL_ATTR_QUERY_TIMEOUT) a los
+        # cursores que se crean después: el menor entre query_timeout y lo
+        # que le queda a la petición.
+        self.connection._conn.timeout = deadline.statement_timeout(self.query_timeout)
         real_cursor = self.connection.cursor()
         # Devolvemos el cursor envuelto para interceptar execute / executemany
-        return IbmiCursorWrapper(real_cursor, self.ops)
+        return IbmiCursorWrapper(
+            real_cursor, self.ops, name=name, fetch_size=self.fetch_size
+        )
+
+    def chunked_cursor(self):
+        self._named_cursor_idx += 1
+        return self._cursor(
+            name="_django_curs_%d_%d" % (threading.current_thread().ident, self._named_cursor_idx)
+        )
 
     def _commit(self):
         if self.connection:
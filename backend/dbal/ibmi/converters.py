@@ -0,0 +1,182 @@
+import datetime
+import decimal
+import logging
+from typing import Any, Callable, Dict, Optional
+
+# Tipos SQL de ODBC (sql.h / sqlext.h)
+SQL_CHAR = 1
+SQL_NUMERIC = 2
+SQL_DECIMAL = 3
+SQL_WCHAR = -8  # GRAPHIC
+
+logger = logging.getLogger("dbal")
+
+# pyodbc entrega a los output converters los bytes crudos de la columna
+# (SQL_C_BINARY). Se asume que el IBM i Access ODBC Driver entrega CHAR ya en
+# el juego de caracteres del cliente, GRAPHIC como UTF-16 y DECIMAL como texto
+# o SQL_NUMERIC_STRUCT; sin confirmarlo contra el driver real
+# (DriverByteFormatsTest en forms/tests/test_db_converters.py) el registro
+# queda apagado por defecto (OPTIONS "output_converters"). Ante bytes que no
+# encajan en esos formatos el converter se desactiva en esa conexión y el
+# valor sale con el tipo que habría dado pyodbc (str o Decimal).
+CHAR_ENCODING = "utf-8"
+GRAPHIC_ENCODING = "utf-16-le"
+
+# SQL_NUMERIC_STRUCT: precision (1), scale (1), sign (1), val (16, little-endian)
+_NUMERIC_STRUCT_SIZE = 19
+
+
+class UnrecognizedValue(ValueError):
+    """Bytes que no tienen el formato esperado para el tipo SQL"""
+
+
+def rtrim_char(value: Optional[bytes]) -> Optional[str]:
+    """CHAR de ancho fijo -> str sin el relleno de espacios a la derecha"""
+    if value is None:
+        return None
+    try:
+        return value.decode(CHAR_ENCODING).rstrip(" ")
+    except UnicodeDecodeError:
+        raise UnrecognizedValue(f"CHAR no está en {CHAR_ENCODING}: {value[:20]!r}")
+
+
+def rtrim_graphic(value: Optional[bytes]) -> Optional[str]:
+    if value is None:
+        return None
+    try:
+        return value.decode(GRAPHIC_ENCODING).rstrip(" 　")
+    except UnicodeDecodeError:
+        raise UnrecognizedValue(f"GRAPHIC no está en {GRAPHIC_ENCODING}: {value[:20]!r}")
+
+
+def _numeric_struct(value: bytes) -> decimal.Decimal:
+    scale = int.from_bytes(value[1:2], "little", signed=True)
+    sign = 1 if value[2] == 1 else -1
+    unscaled = int.from_bytes(value[3:], "little")
+    return decimal.Decimal(sign * unscaled).scaleb(-scale)
+
+
+def decimal_to_python(value: Optional[bytes]) -> Any:
+    """
+    DECIMAL/NUMERIC -> int cuando la columna tiene escala 0, Decimal en otro
+    caso. Acepta la representación en texto ("123", "-1.50", "1,50") o
+    SQL_NUMERIC_STRUCT, según lo que entregue el driver.
+    """
+    if value is None:
+        return None
+
+    try:
+        text = value.decode("ascii").strip()
+    except UnicodeDecodeError:
+        text = None
+
+    if text and all(c in "0123456789+-.," for c in text):
+        if "." in text or "," in text:
+            return decimal.Decimal(text.replace(",", "."))
+        return int(text)
+
+    if len(value) == _NUMERIC_STRUCT_SIZE:
+        number = _numeric_struct(value)
+        if value[1] == 0:
+            return int(number)
+        return number
+
+    raise UnrecognizedValue(f"Valor DECIMAL no reconocido: {value!r}")
+
+
+def numeric_date(value: Any) -> Optional[datetime.date]:
+    """
+    Fecha guardada como número (DECIMAL(8,0) AAAAMMDD o DECIMAL(7,0) CAAMMDD,
+    el formato de fecha histórico de IBM i). 0 y NULL -> None.
+
+    No hay forma de distinguirla de un número cualquiera por el tipo SQL, así
+    que se aplica por columna (ver rows_to_dict(column_converters=...)). Acepta
+    int, Decimal o texto, así que no depende de los output converters.
+    """
+    if isinstance(value, (str, bytes)):
+        value = value.strip() or 0
+    if value is None:
+        return None
+    number = int(value)
+    if number == 0:
+        return None
+    if number < 10_000_000:
+        # CAAMMDD: C=0 -> 19xx, C=1 -> 20xx
+        century, rest = divmod(number, 1_000_000)
+        number = (1900 + century * 100) * 10_000 + rest
+    year, rest = divmod(number, 10_000)
+    month, day = divmod(rest, 100)
+    return datetime.date(year, month, day)
+
+
+class ConverterRegistry:
+    """
+    Output converters de pyodbc que se instalan en cada conexión nueva
+    (DatabaseWrapper.get_new_connection). La conversión ocurre una sola vez,
+    al leer la columna, en lugar de recorrer cada fila en Python.
+    """
+
+    def __init__(self) -> None:
+        self._converters: Dict[int, Callable[[Optional[bytes]], Any]] = {}
+
+    def register(self, sql_type: int, func: Callable[[Optional[bytes]], Any]) -> None:
+        self._converters[sql_type] = func
+
+    def unregister(self, sql_type: int) -> None:
+        self._converters.pop(sql_type, None)
+
+    def converters(self) -> Dict[int, Callable[[Optional[bytes]], Any]]:
+        return dict(self._converters)
+
+    def install(self, raw_connection) -> None:
+        for sql_type, func in self._converters.items():
+            raw_connection.add_output_converter(sql_type, _with_fallback(raw_connection, sql_type, func))
+
+
+def _driver_default(raw_connection, sql_type: int, value: bytes) -> Any:
+    """
+    El valor como lo habría convertido pyodbc sin output converter: str con
+    la decodificación de la conexión (sin recortar) o Decimal. Un DECIMAL
+    que tampoco es texto (p.ej. empaquetado) no tiene equivalente y falla.
+    """
+    if sql_type in (SQL_DECIMAL, SQL_NUMERIC):
+        try:
+            return decimal.Decimal(value.decode("ascii").strip().replace(",", "."))
+        except (UnicodeDecodeError, decimal.InvalidOperation):
+            raise UnrecognizedValue(f"Valor DECIMAL no reconocido: {value!r}")
+
+    encoding = GRAPHIC_ENCODING if sql_type == SQL_WCHAR else CHAR_ENCODING
+    try:
+        encoding = raw_connection.getdecoding(sql_type)[0]
+    except (AttributeError, ValueError):
+        pass
+    return value.decode(encoding, errors="replace")
+
+
+def _with_fallback(raw_connection, sql_type: int, func: Callable[[Optional[bytes]], Any]):
+    """
+    Si func no reconoce los bytes, el converter se quita de la conexión (las
+    lecturas siguientes vuelven a la conversión propia de pyodbc) y el valor
+    actual se convierte como lo haría pyodbc, para no entregar bytes.
+    """
+
+    def convert(value: Optional[bytes]) -> Any:
+        try:
+            return func(value)
+        except UnrecognizedValue as e:
+            logger.warning("Output converter %s desactivado en la conexión: %s", func.__name__, e)
+            try:
+                raw_connection.remove_output_converter(sql_type)
+            except (AttributeError, KeyError):
+                pass
+            return _driver_default(raw_connection, sql_type, value)
+
+    convert.__wrapped__ = func
+    return convert
+
+
+registry = ConverterRegistry()
+registry.register(SQL_CHAR, rtrim_char)
+registry.register(SQL_WCHAR, rtrim_graphic)
+registry.register(SQL_DECIMAL, decimal_to_python)
+registry.register(SQL_NUMERIC, decimal_to_python)
@@ -1,6 +1,12 @@
-class FakeFeatures:
-    def __init__(self, wrapper):
-        self.wrapper = wrapper
-    # Django puede acceder a atributos mínimos, por ejemplo:
-    can_return_id_from_insert = True
+from django.db.backends.base.features import BaseDatabaseFeatures
+
+
+class DatabaseFeatures(BaseDatabaseFeatures):
+    # El driver ODBC trae el result set por bloques (BlockFetch) y pyodbc
+    # lo consume con fetchmany, así QuerySet.iterator() no materializa todo.
+    can_use_chunked_reads = True
     supports_transactions = True
+    can_return_columns_from_insert = False
+    empty_fetchmany_value = []
+    # Tamaño de fetchmany por defecto (OPTIONS["fetch_size"] lo sobrescribe)
+    default_fetch_size = 2000
@@ -0,0 +1,218 @@
+import logging
+import random
+import re
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger("dbal.slow_query")
+
+# Límites superiores (en ms) de los buckets del histograma por fingerprint
+HISTOGRAM_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+DEFAULTS = {
+    "ENABLED": True,
+    "SLOW_QUERY_MS": 500,
+    "SLOW_QUERY_SAMPLE_RATE": 1.0,
+    "MAX_FINGERPRINTS": 500,
+}
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w\"])-?\d+(?:\.\d+)?(?![\w\"])")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Vista que está ejecutando las consultas (la fija el middleware)
+current_view: ContextVar[Optional[str]] = ContextVar("dbal_current_view", default=None)
+
+# Listas que están recolectando las consultas del contexto actual
+_collectors: ContextVar[Tuple[List["QueryRecord"], ...]] = ContextVar(
+    "dbal_query_collectors", default=()
+)
+
+
+class QueryRecord(NamedTuple):
+    sql: str
+    fingerprint: str
+    duration_ms: float
+    rowcount: int
+    view: Optional[str]
+    many: bool
+
+
+def get_config() -> Dict[str, Any]:
+    """Configuración efectiva: DEFAULTS + settings.DBAL_INSTRUMENTATION"""
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "DBAL_INSTRUMENTATION", {}) or {})
+    return config
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql: str) -> str:
+    """
+    Normaliza una sentencia SQL para agrupar consultas equivalentes:
+    literales y marcadores se reemplazan por '?', las listas IN (?, ?, ...)
+    se colapsan y los espacios se compactan.
+    """
+    normalized = _STRING_LITERAL.sub("?", sql)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PARAM_LIST.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+class FingerprintStats:
+    """Acumulado en proceso para un fingerprint"""
+
+    __slots__ = ("count", "total_ms", "max_ms", "rows", "buckets", "views")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        # Un bucket extra para los valores por encima del último límite
+        self.buckets = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        self.views: Dict[str, int] = {}
+
+    def add(self, record: QueryRecord) -> None:
+        self.count += 1
+        self.total_ms += record.duration_ms
+        if record.duration_ms > self.max_ms:
+            self.max_ms = record.duration_ms
+        if record.rowcount > 0:
+            self.rows += record.rowcount
+
+        index = len(HISTOGRAM_BUCKETS_MS)
+        for i, upper in enumerate(HISTOGRAM_BUCKETS_MS):
+            if record.duration_ms <= upper:
+                index = i
+                break
+        self.buckets[index] += 1
+
+        if record.view:
+            self.views[record.view] = self.views.get(record.view, 0) + 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        histogram = {f"le_{upper}ms": n for upper, n in zip(HISTOGRAM_BUCKETS_MS, self.buckets)}
+        histogram["gt_max"] = self.buckets[-1]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "rows": self.rows,
+            "histogram": histogram,
+            "views": dict(self.views),
+        }
+
+
+class QueryStatsRegistry:
+    """Histogramas por fingerprint, compartidos por todos los hilos del proceso"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, FingerprintStats] = {}
+        self.dropped = 0
+
+    def add(self, record: QueryRecord, max_fingerprints: int) -> None:
+        with self._lock:
+            stats = self._stats.get(record.fingerprint)
+            if stats is None:
+                if len(self._stats) >= max_fingerprints:
+                    # Evita crecer sin límite con SQL generado dinámicamente
+                    self.dropped += 1
+                    return
+                stats = self._stats[record.fingerprint] = FingerprintStats()
+            stats.add(record)
+
+    def snapshot(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = [
+                {"fingerprint": fp, **stats.as_dict()}
+                for fp, stats in self._stats.items()
+            ]
+        items.sort(key=lambda item: item["total_ms"], reverse=True)
+        return items[:limit] if limit else items
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.dropped = 0
+
+
+registry = QueryStatsRegistry()
+
+_hooks: List[Callable[[QueryRecord], None]] = []
+
+
+def register_hook(hook: Callable[[QueryRecord], None]) -> None:
+    """Registra una función que recibe cada QueryRecord ejecutado"""
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def unregister_hook(hook: Callable[[QueryRecord], None]) -> None:
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+@contextmanager
+def collect_queries() -> Iterator[List[QueryRecord]]:
+    """
+    Recolecta los QueryRecord ejecutados dentro del bloque (petición, test...).
+    Se puede anidar: cada nivel recibe todas las consultas de su bloque.
+    """
+    queries: List[QueryRecord] = []
+    token = _collectors.set(_collectors.get() + (queries,))
+    try:
+        yield queries
+    finally:
+        _collectors.reset(token)
+
+
+def record_query(sql: str, duration: float, rowcount: int = -1, many: bool = False) -> None:
+    """
+    Punto de entrada desde IbmiCursorWrapper. `duration` en segundos.
+    """
+    config = get_config()
+    collectors = _collectors.get()
+    if not config["ENABLED"] and not collectors:
+        return
+
+    record = QueryRecord(
+        sql=sql,
+        fingerprint=fingerprint(sql),
+        duration_ms=duration * 1000,
+        rowcount=rowcount if isinstance(rowcount, int) else -1,
+        view=current_view.get(),
+        many=many,
+    )
+
+    for queries in collectors:
+        queries.append(record)
+
+    if not config["ENABLED"]:
+        return
+
+    registry.add(record, config["MAX_FINGERPRINTS"])
+
+    if record.duration_ms >= config["SLOW_QUERY_MS"] and (
+        random.random() < config["SLOW_QUERY_SAMPLE_RATE"]
+    ):
+        logger.warning(
+            "Consulta lenta %.1f ms (vista=%s, filas=%s): %s",
+            record.duration_ms,
+            record.view or "-",
+            record.rowcount,
+            record.fingerprint,
+        )
+
+    for hook in list(_hooks):
+        try:
+            hook(record)
+        except Exception:
+            logger.exception("Error en hook de instrumentación SQL")
@@ -1,4 +1,5 @@
 from django.db.backends.base.operations import BaseDatabaseOperations
+from django.utils import timezone
 
 
 class DatabaseOperations(BaseDatabaseOperations):
@@ -61,10 +62,16 @@ class DatabaseOperations(BaseDatabaseOperations):
     def adapt_datetimefield_value(self, value):
         """
         Convierte valores de Python datetime a formato DB2 i.
+        Conserva los microsegundos para que las comparaciones sobre
+        TIMESTAMP (p.ej. la paginación por keyset) sean exactas. Un valor
+        con zona horaria se pasa a la de la conexión (UTC) antes de
+        formatearlo, como hacen los backends de Django sin zonas horarias.
         """
         if value is None:
             return None
-        return value.strftime("%Y-%m-%d %H:%M:%S")
+        if timezone.is_aware(value):
+            value = timezone.make_naive(value, self.connection.timezone)
+        return value.strftime("%Y-%m-%d %H:%M:%S.%f")
 
     def adapt_timefield_value(self, value):
         """
@@ -1,26 +1,165 @@
+import math
+import time
+
 import pyodbc
 from .base_driver import BaseDriver
 from .connection import Connection
 from .exceptions import Db2ConnectionError
 
+# Opciones de settings.DATABASES[...]["OPTIONS"] -> palabras clave del
+# IBM i Access ODBC Driver. Solo se envían las que tengan valor; el resto
+# queda como esté en odbc.ini / odbcinst.ini.
+CONNECTION_ATTRIBUTES = {
+    "naming": "Naming",
+    "default_libraries": "DefaultLibraries",
+    "commit_mode": "CommitMode",
+    # Rendimiento
+    "block_fetch": "BlockFetch",
+    "block_size_kb": "BlockSizeKB",
+    "compression": "AllowDataCompression",
+    "lazy_close": "LazyClose",
+    "extended_dynamic": "ExtendedDynamic",
+    "package_library": "DefaultPkgLibrary",
+    "package": "DefaultPackage",
+    "package_cache": "PackageCache",
+    "query_optimize_goal": "QueryOptimizeGoal",
+    "max_field_length": "MaxFieldLength",
+}
+
+
+def quote_value(value):
+    """Escapa un valor de connection string ODBC si contiene ; { } o espacios"""
+    value = str(value)
+    if any(c in value for c in ";{} ") or value != value.strip():
+        return "{" + value.replace("}", "}}") + "}"
+    return value
+
+
+def build_connection_string(params):
+    """
+    Construye la connection string a partir de los parámetros que arma
+    DatabaseWrapper.get_connection_params().
+
+    - Con DSN: DSN=...;UID=...;PWD=... y los atributos sobrescriben los del DSN.
+    - Sin DSN: DRIVER={...};SYSTEM=host;...
+    """
+    parts = []
+    if params.get("DSN"):
+        parts.append(("DSN", params["DSN"]))
+    else:
+        parts.append(("DRIVER", params.get("DRIVER") or "IBM i Access ODBC Driver"))
+        if params.get("SYSTEM"):
+            parts.append(("SYSTEM", params["SYSTEM"]))
+        if params.get("DATABASE"):
+            parts.append(("DATABASE", params["DATABASE"]))
+
+    if params.get("UID"):
+        parts.append(("UID", params["UID"]))
+    if params.get("PWD"):
+        parts.append(("PWD", params["PWD"]))
+
+    for option, keyword in CONNECTION_ATTRIBUTES.items():
+        value = params.get("ATTRIBUTES", {}).get(option)
+        if value is None or value == "":
+            continue
+        if isinstance(value, bool):
+            value = int(value)
+        parts.append((keyword, value))
+
+    return ";".join(f"{key}={quote_value(value)}" for key, value in parts)
+
+
 class IbmiDriver(BaseDriver):
     """Driver DB2/AS400 usando pyodbc."""
 
     def connect(self, params, test_only=False):
         if test_only:
             # Devuelve un connection fake
-            return FakeConnection()
+            return FakeConnection(params)
         try:
-            dsn_name = params.get('DSN', 'PROD')
-            conn = pyodbc.connect(f"DSN={dsn_name}", autocommit=True)
+            conn = pyodbc.connect(
+                build_connection_string(params),
+                autocommit=True,
+                timeout=params.get("LOGIN_TIMEOUT") or 0,
+            )
             return Connection(conn)
         except Exception as e:
             raise Db2ConnectionError(str(e))
 
+
 class FakeConnection:
+    """
+    Conexión de pruebas. Opcionalmente simula un result set de `rows` filas
+    y el costo de red del block fetch según los atributos de conexión
+    (BlockFetch, BlockSizeKB, AllowDataCompression), para comparar
+    configuraciones sin un IBM i (ver benchmarks/odbc_fetch_throughput.py).
+    """
+
+    def __init__(
+        self,
+        params=None,
+        rows=0,
+        row_bytes=200,
+        round_trip_ms=0.0,
+        bandwidth_mbps=100.0,
+        compression_ratio=0.4,
+    ):
+        attributes = (params or {}).get("ATTRIBUTES", {})
+        self.block_fetch = int(attributes.get("block_fetch", 1) or 0)
+        self.block_size_kb = int(attributes.get("block_size_kb", 32) or 32)
+        self.compression = int(attributes.get("compression", 0) or 0)
+        self.rows = rows
+        self.row_bytes = row_bytes
+        self.round_trip_ms = round_trip_ms
+        self.bandwidth_mbps = bandwidth_mbps
+        self.compression_ratio = compression_ratio
+        self.round_trips = 0
+        self.arraysize = 1
+        self._buffer = 0
+        self._remaining = 0
+
     def cursor(self): return self
-    def execute(self, q, p=None): return None
-    def fetchall(self): return []
     def commit(self): pass
     def rollback(self): pass
-    def close(self): pass
\ No newline at end of file
+    def close(self): pass
+
+    def execute(self, q, p=None):
+        self._remaining = self.rows
+        self._buffer = 0
+        return None
+
+    @property
+    def rows_per_block(self):
+        if not self.block_fetch:
+            return 1
+        return max(1, (self.block_size_kb * 1024) // self.row_bytes)
+
+    def _receive_block(self):
+        """Simula un viaje de red que trae el siguiente bloque de filas"""
+        rows = min(self.rows_per_block, self._remaining)
+        wire_bytes = rows * self.row_bytes
+        if self.compression:
+            wire_bytes *= self.compression_ratio
+        delay = self.round_trip_ms / 1000 + wire_bytes * 8 / (self.bandwidth_mbps * 1e6)
+        if delay:
+            time.sleep(delay)
+        self.round_trips += 1
+        self._buffer += rows
+        self._remaining -= rows
+
+    def fetchmany(self, size=None):
+        size = size or self.arraysize
+        result = []
+        while len(result) < size and (self._buffer or self._remaining):
+            if not self._buffer:
+                self._receive_block()
+            take = min(self._buffer, size - len(result))
+            result.extend((i,) for i in range(take))
+            self._buffer -= take
+        return result
+
+    def fetchall(self):
+        return self.fetchmany(self._buffer + self._remaining)
+
+    def expected_round_trips(self):
+        return math.ceil(self.rows / self.rows_per_block) if self.rows else 0
@@ -12,3 +12,5 @@ class FormsConfig(AppConfig):
         import forms.signals.webhook_signals
         import forms.listeners.webhook_listeners
         import forms.models.soporte_fomag
+        import forms.services.form_validation_service
+        import forms.services.webhook_config_cache
@@ -1,19 +1,28 @@
 # decorators.py
 _registered_models = {}
+_registered_filter_fields = {}
 
 
-def register_model_for_api(name=None):
+def register_model_for_api(name=None, filter_fields=()):
     """
     Decorador para registrar modelos en la API genérica.
 
+    filter_fields son los campos por los que se puede filtrar el listado
+    (GET /api/<name>/?campo=valor). Deben tener índice en la tabla, junto
+    con la PK, para que cada página sea un rango del índice.
+
     Uso:
-    @register_model_for_api('usuario')
+    @register_model_for_api('usuario', filter_fields=('documento',))
     class Usuario(models.Model):
     """
 
     def decorator(model_class):
         model_name = name or model_class.__name__.lower()
+        for field_name in filter_fields:
+            # FieldDoesNotExist al importar el modelo si el campo no existe
+            model_class._meta.get_field(field_name)
         _registered_models[model_name] = model_class
+        _registered_filter_fields[model_name] = tuple(filter_fields)
         return model_class
 
     return decorator
@@ -27,3 +36,8 @@ def get_registered_models():
 def get_model_by_name(model_name):
     """Obtener una clase de modelo por nombre"""
     return _registered_models.get(model_name)
+
+
+def get_model_filter_fields(model_name):
+    """Campos filtrables declarados al registrar el modelo"""
+    return _registered_filter_fields.get(model_name, ())
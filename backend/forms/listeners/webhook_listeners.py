@@ -1,8 +1,18 @@
 import json
+import random
 import requests
 from django.dispatch import receiver
 from django.utils import timezone
-from forms.models.forms import WebhookConfig, SubmissionTaskLog
+from dbal import deadline
+from dbal.exceptions import DeadlineExceeded
+from forms.models.forms import SubmissionTaskLog
+from forms.repositories.task_log_repository import TaskLogRepository
+from forms.services.circuit_breaker import CircuitOpen, get_breaker_config, guarded_request
+from forms.services.webhook_batch import webhook_batchers
+from forms.services.webhook_config_cache import webhook_config_cache
+from forms.services.webhook_delivery import delivery_queue
+from forms.services.webhook_payload import SubmissionPayload, transform_cache
+from forms.services.webhook_throttle import webhook_throttles
 from forms.signals.webhook_signals import submission_created
 
 
@@ -12,91 +22,257 @@ def handle_new_submission(sender, submission, **kwargs):
     Listener síncrono para nuevas submissions
     """
 
-    webhooks = WebhookConfig.objects.filter(form=submission.form, is_active=True)
+    # La submission ya está guardada: quedarse sin tiempo aquí no debe
+    # convertir la respuesta en un 503
+    with deadline.suspended():
+        webhooks = webhook_config_cache.get(submission.form_id)
 
+    payload = SubmissionPayload(submission)
     for webhook in webhooks:
-        process_webhook_sync(webhook, submission)
+        process_webhook_sync(webhook, submission, payload)
 
 
-def process_webhook_sync(webhook, submission):
+def process_webhook_sync(webhook, submission, payload=None, task_log=None, deferrals=0):
     """
-    Procesar webhook de forma síncrona
-    """
-    task_log = SubmissionTaskLog.objects.create(
-        submission=submission,
-        webhook=webhook,
-        status="running",
-        attempt=1,
-        started_at=timezone.now(),
-    )
+    Procesar webhook de forma síncrona.
+
+    payload (SubmissionPayload) se comparte entre los webhooks de la misma
+    submission para codificar su cuerpo una sola vez.
 
+    Si el circuito del host está abierto no se llama: el task log queda en
+    "pending" y la entrega se reintenta en segundo plano (delivery_queue)
+    cuando el circuito vuelva a admitir llamadas, con el mismo task_log.
+    Lo mismo si se superan rate_limit o max_in_flight del webhook
+    (forms/services/webhook_throttle.py): la entrega espera en la cola del
+    webhook y sale en segundo plano cuando hay hueco. Los webhooks con
+    "batch" solo acumulan la submission con su task log en "pending"
+    (buffer_for_batch) y se entregan con process_webhook_batch.
+
+    La llamada HTTP comparte el deadline de la petición que creó la
+    submission; las escrituras del task log se hacen con el deadline
+    suspendido para que el resultado quede registrado aunque se agote.
+    """
+    config_error = None
     try:
-        payload = {
-            "event_type": "form_submission",
-            "submission_id": submission.id,
-            "form_id": submission.form.id,
-            "form_name": submission.form.name,
-            "submitted_at": timezone.now().isoformat(),
-            "data": submission.data,
-        }
-
-        headers = {
-            "Content-Type": "application/json",
-            "User-Agent": "WebhookSystem/1.0",
-        }
-
-        custom_headers = webhook.headers_dict
-        if custom_headers:
-            headers.update(custom_headers)
-
-        response = requests.post(
-            webhook.url,
-            json=json.loads(str(payload.get("data"))),
-            headers=headers,
-            timeout=webhook.timeout,
-        )
+        batcher = webhook_batchers.get(webhook) if task_log is None else None
+        throttle = webhook_throttles.get(webhook)
+    except ValueError as e:
+        batcher = throttle = None
+        config_error = f"Config del webhook no válida: {str(e)}"
 
-        response_data = {
-            "status_code": response.status_code,
-            "headers": dict(response.headers),
-            "content": response.text[:1000],
-        }
+    if batcher is not None:
+        buffer_for_batch(batcher, webhook, [(submission, payload or SubmissionPayload(submission))])
+        return True
 
-        if response.status_code in [200, 201, 202]:
-            task_log.status = "success"
-        else:
-            task_log.status = "failed"
-            task_log.error_message = (
-                f"HTTP {response.status_code}: {response.text[:500]}"
+    with deadline.suspended():
+        if task_log is None:
+            task_log = SubmissionTaskLog.objects.create(
+                submission=submission,
+                webhook=webhook,
+                status="running",
+                attempt=1,
+                started_at=timezone.now(),
             )
 
-        task_log.response_data = json.dumps(response_data)
+    if config_error is not None:
+        handle_webhook_error(task_log, config_error)
+        return False
+
+    if throttle is None:
+        return deliver_webhook(webhook, submission, payload, task_log, deferrals)
+
+    if throttle.acquire():
+        try:
+            return deliver_webhook(webhook, submission, payload, task_log, deferrals)
+        finally:
+            throttle.release()
+
+    task_log.status = "pending"
+    task_log.error_message = "En cola por los límites de entrega del webhook"
+    with deadline.suspended():
+        task_log.save(update_fields=["status", "error_message"])
+    throttle.enqueue(deliver_webhook, webhook, submission, payload, task_log, deferrals)
+    return False
+
+
+def deliver_webhook(webhook, submission, payload, task_log, deferrals=0):
+    """
+    Llamada al webhook, ya dentro de sus límites de entrega; registra el
+    resultado en task_log.
+    """
+    if task_log.status != "running":
+        task_log.status = "running"
+        task_log.error_message = ""
+        task_log.started_at = timezone.now()
+        with deadline.suspended():
+            task_log.save(update_fields=["status", "error_message", "started_at"])
+
+    try:
+        if payload is None:
+            payload = SubmissionPayload(submission)
+        body = payload.body_for(transform_cache.get(webhook))
+
+        response = guarded_request(
+            "POST",
+            webhook.url,
+            data=body,
+            headers=webhook_headers(webhook),
+            timeout=deadline.timeout_for(webhook.timeout),
+        )
+
+        task_log.status, error_message, task_log.response_data = response_result(response)
+        if error_message:
+            task_log.error_message = error_message
         task_log.completed_at = timezone.now()
-        task_log.save()
+        with deadline.suspended():
+            task_log.save()
 
         return True
 
-    except requests.exceptions.Timeout:
-        error_msg = f"Timeout después de {webhook.timeout} segundos"
-        handle_webhook_error(task_log, error_msg)
+    except CircuitOpen as e:
+        defer_webhook(webhook, submission, payload, task_log, deferrals, e)
         return False
 
-    except requests.exceptions.ConnectionError:
-        error_msg = "Error de conexión - No se pudo alcanzar la URL"
-        handle_webhook_error(task_log, error_msg)
+    except Exception as e:
+        handle_webhook_error(task_log, webhook_error_message(webhook, e))
         return False
 
-    except requests.exceptions.RequestException as e:
-        error_msg = f"Error en la petición: {str(e)}"
-        handle_webhook_error(task_log, error_msg)
+
+def buffer_for_batch(batcher, webhook, entries):
+    """
+    Deja (submission, payload) en el buffer del batch del webhook después de
+    crear sus task logs en "pending" con un INSERT multi-fila: si el worker
+    se reinicia antes de enviar el batch, la entrega sigue registrada.
+    """
+    started_at = timezone.now()
+    with deadline.suspended():
+        task_log_ids = TaskLogRepository().bulk_insert(
+            [(submission.id, webhook.id, "pending", started_at) for submission, _ in entries]
+        )
+    batcher.add(
+        webhook,
+        [
+            (submission, payload, task_log_id)
+            for (submission, payload), task_log_id in zip(entries, task_log_ids)
+        ],
+    )
+
+
+def process_webhook_batch(webhook, entries, deferrals=0):
+    """
+    Entrega en batch de las submissions acumuladas por WebhookBatcher
+    (lista de (submission, payload, task_log_id)). El batch cuenta como una
+    sola llamada para rate_limit y max_in_flight. Corre en segundo plano
+    (delivery_queue).
+    """
+    throttle = webhook_throttles.get(webhook)
+    if throttle is None:
+        return deliver_webhook_batch(webhook, entries, deferrals)
+
+    if throttle.acquire():
+        try:
+            return deliver_webhook_batch(webhook, entries, deferrals)
+        finally:
+            throttle.release()
+
+    TaskLogRepository().update_result(
+        [task_log_id for _, _, task_log_id in entries],
+        "pending",
+        "En cola por los límites de entrega del webhook",
+    )
+    throttle.enqueue(deliver_webhook_batch, webhook, entries, deferrals)
+    return False
+
+
+def deliver_webhook_batch(webhook, entries, deferrals=0):
+    """
+    POST con un array JSON con el cuerpo de cada submission del batch; el
+    resultado se escribe en todos sus task logs con un solo UPDATE.
+    """
+    repository = TaskLogRepository()
+    task_log_ids = [task_log_id for _, _, task_log_id in entries]
+    repository.update_result(task_log_ids, "running")
+
+    try:
+        transform = transform_cache.get(webhook)
+        # Los cuerpos ya son JSON: el array se arma sin volver a codificarlos
+        body = b"[" + b",".join(payload.body_for(transform) for _, payload, _ in entries) + b"]"
+
+        response = guarded_request(
+            "POST",
+            webhook.url,
+            data=body,
+            headers=webhook_headers(webhook),
+            timeout=deadline.timeout_for(webhook.timeout),
+        )
+
+        status, error_message, response_data = response_result(response)
+        repository.update_result(
+            task_log_ids, status, error_message, response_data, timezone.now()
+        )
+        return True
+
+    except CircuitOpen as e:
+        delay = deferral_delay(e, deferrals)
+        if delay is None:
+            repository.update_result(
+                task_log_ids, "failed", f"{e} (sin más reintentos)", completed_at=timezone.now()
+            )
+        else:
+            repository.update_result(task_log_ids, "pending", f"{e}; reintento en {delay:.0f}s")
+            delivery_queue.schedule(
+                delay, process_webhook_batch, webhook, entries, deferrals + 1
+            )
         return False
 
     except Exception as e:
-        error_msg = f"Error inesperado: {str(e)}"
-        handle_webhook_error(task_log, error_msg)
+        repository.update_result(
+            task_log_ids, "failed", webhook_error_message(webhook, e), completed_at=timezone.now()
+        )
         return False
 
 
+def webhook_headers(webhook):
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": "WebhookSystem/1.0",
+    }
+
+    custom_headers = webhook.headers_dict
+    if custom_headers:
+        headers.update(custom_headers)
+    return headers
+
+
+def response_result(response):
+    """(status, error_message, response_data) del task log según la respuesta"""
+    response_data = {
+        "status_code": response.status_code,
+        "headers": dict(response.headers),
+        "content": response.text[:1000],
+    }
+
+    if response.status_code in [200, 201, 202]:
+        return "success", "", json.dumps(response_data)
+    return (
+        "failed",
+        f"HTTP {response.status_code}: {response.text[:500]}",
+        json.dumps(response_data),
+    )
+
+
+def webhook_error_message(webhook, error):
+    if isinstance(error, DeadlineExceeded):
+        return "Sin tiempo restante en la petición para llamar al webhook"
+    if isinstance(error, requests.exceptions.Timeout):
+        return f"Timeout después de {webhook.timeout} segundos"
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return "Error de conexión - No se pudo alcanzar la URL"
+    if isinstance(error, requests.exceptions.RequestException):
+        return f"Error en la petición: {str(error)}"
+    return f"Error inesperado: {str(error)}"
+
+
 def handle_webhook_error(task_log, error_message):
     """
     Manejar errores del webhook
@@ -104,4 +280,34 @@ def handle_webhook_error(task_log, error_message):
     task_log.status = "failed"
     task_log.error_message = error_message
     task_log.completed_at = timezone.now()
-    task_log.save()
+    with deadline.suspended():
+        task_log.save()
+
+
+def defer_webhook(webhook, submission, payload, task_log, deferrals, error):
+    """
+    Aplaza la entrega hasta que el circuito del host pase a semiabierto
+    (con algo de dispersión para no llegar todas a la vez), hasta
+    MAX_DEFERRALS veces.
+    """
+    delay = deferral_delay(error, deferrals)
+    if delay is None:
+        handle_webhook_error(task_log, f"{error} (sin más reintentos)")
+        return
+
+    task_log.status = "pending"
+    task_log.error_message = f"{error}; reintento en {delay:.0f}s"
+    with deadline.suspended():
+        task_log.save(update_fields=["status", "error_message"])
+
+    delivery_queue.schedule(
+        delay, process_webhook_sync, webhook, submission, payload, task_log, deferrals + 1
+    )
+
+
+def deferral_delay(error, deferrals):
+    """Espera antes de reintentar con el circuito abierto; None si se agotaron"""
+    config = get_breaker_config()
+    if deferrals >= config["MAX_DEFERRALS"]:
+        return None
+    return max(error.retry_after, 1.0) + random.uniform(0, config["OPEN_SECONDS"] / 2)
@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand, CommandError
+from forms.services.archive_service import SubmissionArchiver
+
+
+class Command(BaseCommand):
+    help = (
+        "Archiva submissions y task logs más antiguos que la política de "
+        "retención (settings.SUBMISSION_RETENTION), por lotes y con commit "
+        "por lote. Se puede interrumpir y volver a ejecutar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            choices=["all", "submissions", "task-logs"],
+            default="all",
+        )
+        parser.add_argument(
+            "--mode",
+            choices=SubmissionArchiver.MODES,
+            default="table",
+            help="table: tablas *_ARCHIVE en DB2; jsonl: ficheros .jsonl.gz en ARCHIVE_DIR",
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=None,
+            help="Ignora las políticas configuradas y usa este número de días",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Segundos de espera entre lotes para reducir la carga en DB2",
+        )
+        parser.add_argument("--max-batches", type=int, default=None)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        try:
+            archiver = SubmissionArchiver(
+                mode=options["mode"],
+                batch_size=options["batch_size"],
+                pause=options["pause"],
+                dry_run=options["dry_run"],
+                max_batches=options["max_batches"],
+                log=self.stdout.write,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        days = options["older_than_days"]
+        submissions = task_logs = 0
+
+        # Primero las submissions (archivan también sus task logs) y luego
+        # los task logs huérfanos de retención más corta.
+        if options["target"] in ("all", "submissions"):
+            submissions = archiver.archive_submissions(older_than_days=days)
+        if options["target"] in ("all", "task-logs"):
+            task_logs = archiver.archive_task_logs(older_than_days=days)
+
+        action = "por archivar" if options["dry_run"] else "archivados"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {submissions} submissions y {task_logs} task logs {action}"
+            )
+        )
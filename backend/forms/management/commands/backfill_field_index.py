@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from forms.models.forms import Form
+from forms.services.field_index_service import FieldIndexBackfill
+
+
+class Command(BaseCommand):
+    help = (
+        "Llena FORMSUBMISSION_FIELD_INDEX con los campos marcados como indexed "
+        "para las submissions existentes, por lotes y con commit por lote. "
+        "Se puede interrumpir y continuar con --after-id."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--form",
+            action="append",
+            default=None,
+            help="Slug o ID del formulario (repetible). Por defecto, todos los que tienen campos indexados",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--after-id", type=int, default=0)
+
+    def get_forms(self, values):
+        forms = []
+        for value in values:
+            queryset = Form.objects.only("id", "slug", "name")
+            form = queryset.filter(slug=value).first()
+            if form is None and value.isdigit():
+                form = queryset.filter(id=int(value)).first()
+            if form is None:
+                raise CommandError(f"Formulario no encontrado: {value}")
+            forms.append(form)
+        return forms
+
+    def handle(self, *args, **options):
+        forms = self.get_forms(options["form"]) if options["form"] else None
+        backfill = FieldIndexBackfill(batch_size=options["batch_size"], log=self.stdout.write)
+        total = backfill.run(forms, after_id=options["after_id"])
+        self.stdout.write(self.style.SUCCESS(f"Submissions indexadas: {total}"))
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+from forms.models.forms import Form
+from forms.services.submission_storage_service import SubmissionStorageMigrator
+from forms.utils.submission_codec import CODECS
+
+
+class Command(BaseCommand):
+    help = (
+        "Comprime en DATA_BLOB el DATA de las submissions existentes (o lo "
+        "devuelve a texto con --decompress), por lotes y con commit por lote. "
+        "Se puede interrumpir y volver a lanzar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--codec",
+            choices=CODECS,
+            default=None,
+            help="Por defecto SUBMISSION_STORAGE['CODEC']",
+        )
+        parser.add_argument("--decompress", action="store_true")
+        parser.add_argument("--form", default=None, help="Slug o ID del formulario")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--after-id", type=int, default=0)
+        parser.add_argument("--max-batches", type=int, default=None)
+        parser.add_argument("--pause", type=float, default=0.0, help="Segundos entre lotes")
+
+    def get_form(self, value):
+        queryset = Form.objects.only("id", "slug", "name")
+        form = queryset.filter(slug=value).first()
+        if form is None and value.isdigit():
+            form = queryset.filter(id=int(value)).first()
+        if form is None:
+            raise CommandError(f"Formulario no encontrado: {value}")
+        return form
+
+    def handle(self, *args, **options):
+        form = self.get_form(options["form"]) if options["form"] else None
+        try:
+            migrator = SubmissionStorageMigrator(
+                codec=options["codec"],
+                decompress=options["decompress"],
+                batch_size=options["batch_size"],
+                pause=options["pause"],
+                log=self.stdout.write,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        total = migrator.run(
+            form_id=form.id if form else None,
+            after_id=options["after_id"],
+            max_batches=options["max_batches"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Submissions migradas: {total}"))
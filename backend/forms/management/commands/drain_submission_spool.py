@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from forms.services.submission_spool import (
+    SpoolDrainer,
+    is_database_unavailable,
+    submission_spool,
+)
+from forms.services.webhook_batch import drain_deliveries
+
+
+class Command(BaseCommand):
+    help = (
+        "Inserta en FORMSUBMISSION las submissions que la API encoló en el "
+        "spool local mientras DB2 no respondía, en orden de llegada y por lotes. "
+        "Con --loop queda drenando cada --interval segundos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--max-batches", type=int, default=None)
+        parser.add_argument("--loop", action="store_true")
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Segundos entre pasadas con --loop (y tras un fallo de DB2)",
+        )
+
+    def handle(self, *args, **options):
+        drainer = SpoolDrainer(batch_size=options["batch_size"], log=self.stdout.write)
+
+        try:
+            while True:
+                try:
+                    stats = drainer.drain(max_batches=options["max_batches"])
+                except Exception as e:
+                    if not (options["loop"] and is_database_unavailable(e)):
+                        raise
+                    self.stderr.write(f"DB2 no disponible, se reintenta: {e}")
+                else:
+                    if stats.inserted or stats.duplicates or stats.rejected:
+                        self.stdout.write(
+                            self.style.SUCCESS(
+                                f"Insertadas: {stats.inserted}, duplicadas: {stats.duplicates}, "
+                                f"rechazadas: {stats.rejected}"
+                            )
+                        )
+                if not options["loop"]:
+                    break
+                close_old_connections()
+                time.sleep(options["interval"])
+        finally:
+            # Las entregas de webhooks encoladas (y los batches a medio
+            # juntar) terminan antes de salir
+            drain_deliveries()
+
+        counts = submission_spool.counts()
+        self.stdout.write(
+            f"Spool: {counts.get('pending', 0)} pendientes, {counts.get('rejected', 0)} rechazadas"
+        )
@@ -0,0 +1,75 @@
+import os
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from forms.models.forms import Form
+from forms.services.export_service import EXPORT_FORMATS, SubmissionExporter, parse_since
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporta las submissions de un formulario (slug o ID) a CSV o JSONL, "
+        "por lotes y con memoria constante. Con --state-file guarda el último "
+        "ID exportado y la siguiente ejecución continúa desde ahí."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("form", help="Slug o ID del formulario")
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+        parser.add_argument("--output", default="-", help="Fichero de salida (- = stdout)")
+        parser.add_argument("--since", default=None, help="Último ID ya exportado o fecha ISO 8601")
+        parser.add_argument(
+            "--state-file",
+            default=None,
+            help="Fichero con el último ID exportado (se lee si no hay --since y se actualiza al terminar)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=None)
+
+    def get_form(self, value):
+        forms = Form.objects.only("id", "slug", "name")
+        form = forms.filter(slug=value).first()
+        if form is None and value.isdigit():
+            form = forms.filter(id=int(value)).first()
+        if form is None:
+            raise CommandError(f"Formulario no encontrado: {value}")
+        return form
+
+    def handle(self, *args, **options):
+        form = self.get_form(options["form"])
+
+        raw_since = options["since"]
+        state_file = options["state_file"]
+        if raw_since is None and state_file and os.path.exists(state_file):
+            with open(state_file) as fh:
+                raw_since = fh.read().strip() or None
+        try:
+            since = parse_since(raw_since)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        exporter = SubmissionExporter(form, since=since, chunk_size=options["chunk_size"])
+        self.write(exporter.iter_format(options["format"]), options["output"])
+
+        if state_file and exporter.last_id is not None:
+            tmp_path = f"{state_file}.tmp"
+            with open(tmp_path, "w") as fh:
+                fh.write(str(exporter.last_id))
+            os.replace(tmp_path, state_file)
+
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"Formulario {form.slug or form.id}: {exporter.exported} submissions exportadas "
+                f"(último ID: {exporter.last_id or '-'})"
+            )
+        )
+
+    @staticmethod
+    def write(lines, output):
+        if output == "-":
+            for line in lines:
+                sys.stdout.write(line)
+            return
+        # newline="": csv.writer ya termina las filas en \r\n
+        with open(output, "w", encoding="utf-8", newline="") as fh:
+            for line in lines:
+                fh.write(line)
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from forms.services.idempotency_service import IdempotencyService
+
+
+class Command(BaseCommand):
+    help = "Borra por lotes las claves de idempotencia vencidas (TIFORMS.IDEMPOTENCY_KEY)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        deleted = IdempotencyService.purge_expired(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Claves vencidas borradas: {deleted}"))
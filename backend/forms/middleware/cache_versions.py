@@ -0,0 +1,16 @@
+from forms.utils.cache_versions import versions_snapshot
+
+
+class CacheVersionsMiddleware:
+    """
+    Los contadores de versión (forms/utils/cache_versions.py) se leen una
+    sola vez por petición: FormCache, ValidatorCache y WebhookConfigCache
+    comparten la lectura en lugar de ir cada uno a la caché en disco.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with versions_snapshot():
+            return self.get_response(request)
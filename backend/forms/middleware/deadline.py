@@ -0,0 +1,67 @@
+import logging
+import time
+
+from django.conf import settings
+from django.http import JsonResponse
+from dbal import deadline
+from dbal.exceptions import DeadlineExceeded
+
+logger = logging.getLogger("forms")
+
+DEFAULTS = {
+    "ENABLED": True,
+    "DEFAULT": 25,
+    "VIEWS": {},
+    "RETRY_AFTER": 5,
+}
+
+
+def get_deadline_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "REQUEST_DEADLINES", {}) or {})
+    return config
+
+
+class DeadlineMiddleware:
+    """
+    Fija el deadline de la petición según el presupuesto de su endpoint
+    (REQUEST_DEADLINES["VIEWS"] por nombre de URL, o DEFAULT) contado desde
+    que llega la petición. Si se agota, responde 503 en lugar de dejar el
+    worker bloqueado hasta el timeout de gunicorn.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request._deadline_start = time.monotonic()
+        try:
+            return self.get_response(request)
+        finally:
+            token = getattr(request, "_deadline_token", None)
+            if token is not None:
+                deadline.reset_deadline(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        config = get_deadline_config()
+        if not config["ENABLED"]:
+            return None
+
+        match = getattr(request, "resolver_match", None)
+        url_name = match.url_name if match else None
+        budget = config["VIEWS"].get(url_name, config["DEFAULT"])
+
+        request._deadline_token = deadline.set_deadline(budget, start=request._deadline_start)
+        return None
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, DeadlineExceeded):
+            return None
+
+        logger.warning("Deadline agotado en %s: %s", request.path, exception)
+        response = JsonResponse(
+            {"status": "error", "message": str(exception)},
+            status=503,
+        )
+        response["Retry-After"] = str(get_deadline_config()["RETRY_AFTER"])
+        return response
@@ -0,0 +1,42 @@
+import logging
+
+from dbal.ibmi.instrumentation import collect_queries, current_view
+from forms.utils.query_inspector import (
+    NPlusOneError,
+    describe_repeated,
+    find_repeated_queries,
+    get_detector_config,
+)
+
+logger = logging.getLogger("forms.nplusone")
+
+
+class NPlusOneDetectorMiddleware:
+    """
+    Agrupa por fingerprint las consultas de cada petición y avisa cuando una
+    misma SELECT se repite más de NPLUSONE_DETECTOR["THRESHOLD"] veces.
+    Con RAISE=True la petición falla (útil en CI).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        config = get_detector_config()
+        if not config["ENABLED"]:
+            return self.get_response(request)
+
+        with collect_queries() as queries:
+            response = self.get_response(request)
+            view = current_view.get()
+
+        response["X-Query-Count"] = str(len(queries))
+
+        repeated = find_repeated_queries(queries, config["THRESHOLD"])
+        if repeated:
+            message = describe_repeated(repeated, view or request.path)
+            if config["RAISE"]:
+                raise NPlusOneError(message)
+            logger.warning(message)
+
+        return response
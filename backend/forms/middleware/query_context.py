@@ -0,0 +1,27 @@
+from dbal.ibmi.instrumentation import current_view
+
+
+class QueryContextMiddleware:
+    """
+    Asocia las consultas SQL ejecutadas durante la petición con la vista
+    que las originó, para la instrumentación de dbal.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            token = getattr(request, "_query_view_token", None)
+            if token is not None:
+                current_view.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = getattr(request, "resolver_match", None)
+        view_name = (match.view_name if match else None) or getattr(
+            view_func, "__name__", request.path
+        )
+        request._query_view_token = current_view.set(view_name)
+        return None
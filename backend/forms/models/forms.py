@@ -6,6 +6,7 @@ from django.db import models
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from forms.signals.webhook_signals import submission_created
+from forms.utils.submission_codec import unpack
 
 
 class FormField(models.Model):
@@ -97,6 +98,12 @@ class FormField(models.Model):
         help_text="Clave para los resultados en la respuesta dinámica",
     )
 
+    indexed = models.SmallIntegerField(
+        default=0,
+        db_column="INDEXED",
+        help_text="Guardar sus valores en FORMSUBMISSION_FIELD_INDEX para búsquedas",
+    )
+
     class Meta:
         db_table = '"TIFORMS"."FORMFIELD"'
         managed = False
@@ -218,12 +225,25 @@ class WebhookConfig(models.Model):
     def __str__(self):
         return f"{self.name} - {self.form.name}"
 
+    def _parsed_json(self, attname):
+        """
+        JSON de headers/config decodificado una vez por valor: las instancias
+        de webhook_config_cache se reutilizan entre submissions.
+        """
+        raw = getattr(self, attname)
+        parsed = self.__dict__.setdefault("_json_cache", {})
+        entry = parsed.get(attname)
+        if entry is None or entry[0] != raw:
+            try:
+                value = json.loads(raw)
+            except (json.JSONDecodeError, TypeError):
+                value = {}
+            entry = parsed[attname] = (raw, value)
+        return entry[1]
+
     @property
     def headers_dict(self):
-        try:
-            return json.loads(self.headers)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        return self._parsed_json("headers")
 
     @headers_dict.setter
     def headers_dict(self, value):
@@ -231,10 +251,7 @@ class WebhookConfig(models.Model):
 
     @property
     def config_dict(self):
-        try:
-            return json.loads(self.config)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        return self._parsed_json("config")
 
     @config_dict.setter
     def config_dict(self, value):
@@ -296,7 +313,9 @@ class SubmissionTaskLog(models.Model):
 class FormSubmission(models.Model):
     id = models.AutoField(primary_key=True, db_column="ID")
     form = models.ForeignKey(Form, on_delete=models.CASCADE, db_column="FORM_ID")
-    data = models.TextField(db_column="DATA")
+    # NULL cuando el JSON está comprimido en DATA_BLOB (forms/utils/submission_codec.py)
+    data = models.TextField(null=True, db_column="DATA")
+    data_blob = models.BinaryField(null=True, blank=True, editable=False, db_column="DATA_BLOB")
     created_at = models.DateTimeField(auto_now_add=True, db_column="CREATED_AT")
 
     class Meta:
@@ -306,6 +325,77 @@ class FormSubmission(models.Model):
     def __str__(self):
         return f"Respuesta al formulario {self.form.name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Descomprime DATA_BLOB en data. La instancia queda como una fila sin
+        comprimir: si se vuelve a guardar por el ORM se escribe en DATA.
+        """
+        instance = super().from_db(db, field_names, values)
+        if instance.__dict__.get("data_blob") is not None:
+            instance.data = unpack(None, instance.data_blob)
+            instance.data_blob = None
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # Cargar data diferido también trae DATA_BLOB
+        if fields is not None and "data" in fields and "data_blob" not in fields:
+            fields = [*fields, "data_blob"]
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
+
+class SubmissionFieldIndex(models.Model):
+    """
+    Valores normalizados de los campos marcados como indexed, una fila por
+    (submission, campo, valor), para buscar submissions sin leer DATA.
+    """
+
+    id = models.AutoField(primary_key=True, db_column="ID")
+    submission = models.ForeignKey(
+        FormSubmission,
+        on_delete=models.CASCADE,
+        db_column="FORMSUBMISSION_ID",
+        related_name="field_index",
+    )
+    form = models.ForeignKey(Form, on_delete=models.CASCADE, db_column="FORM_ID")
+    field_name = models.CharField(max_length=200, db_column="FIELD_NAME")
+    value = models.CharField(max_length=255, db_column="VALUE")
+
+    class Meta:
+        db_table = '"TIFORMS"."FORMSUBMISSION_FIELD_INDEX"'
+        managed = False
+
+
+class IdempotencyKey(models.Model):
+    STATUS_CHOICES = [
+        ("processing", "Processing"),
+        ("completed", "Completed"),
+    ]
+
+    id = models.AutoField(primary_key=True, db_column="ID")
+    scope = models.CharField(max_length=50, db_column="SCOPE")
+    key = models.CharField(max_length=255, db_column="IDEMPOTENCY_KEY")
+    request_hash = models.CharField(max_length=64, db_column="REQUEST_HASH")
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default="processing", db_column="STATUS"
+    )
+    response_status = models.SmallIntegerField(
+        null=True, blank=True, db_column="RESPONSE_STATUS"
+    )
+    response_body = models.TextField(null=True, blank=True, db_column="RESPONSE_BODY")
+    # Sin FK: la submission puede archivarse antes de que venza la clave
+    submission_id = models.IntegerField(null=True, blank=True, db_column="SUBMISSION_ID")
+    created_at = models.DateTimeField(auto_now_add=True, db_column="CREATED_AT")
+    expires_at = models.DateTimeField(db_column="EXPIRES_AT")
+
+    def __str__(self):
+        return f"{self.scope}:{self.key} ({self.status})"
+
+    class Meta:
+        db_table = '"TIFORMS"."IDEMPOTENCY_KEY"'
+        managed = False
+        unique_together = (("scope", "key"),)
+
 
 @receiver(post_save, sender=FormSubmission)
 def trigger_submission_created(sender, instance, created, **kwargs):
@@ -2,7 +2,7 @@ from django.db import models
 from forms.decorators import register_model_for_api
 
 
-@register_model_for_api("soporte_fomag")
+@register_model_for_api("soporte_fomag", filter_fields=("benumdocbe", "mrcodcons"))
 class SoporteFomag(models.Model):
     id = models.AutoField(primary_key=True, db_column="ID")
     mrcodcons = models.DecimalField(
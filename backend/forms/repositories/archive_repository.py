@@ -0,0 +1,78 @@
+import datetime
+from typing import Any, Dict, List, Sequence
+from forms.repositories.base_repository import BaseRepository
+from forms.utils.db_helpers import rows_to_dict
+
+
+class ArchiveRepository(BaseRepository):
+    """
+    Operaciones por lotes de IDs para mover filas de las tablas calientes
+    (FORMSUBMISSION, SUBMISSION_TASK_LOG) a sus tablas de archivo.
+    """
+
+    @staticmethod
+    def _placeholders(values: Sequence[Any]) -> str:
+        return ", ".join("?" for _ in values)
+
+    def select_ids(
+        self,
+        table: str,
+        where_sql: str,
+        params: List[Any],
+        limit: int,
+        after_id: int = 0,
+    ) -> List[int]:
+        sql = f"""SELECT ID FROM {table}
+            WHERE ID > ? AND {where_sql}
+            ORDER BY ID
+            FETCH FIRST {int(limit)} ROWS ONLY"""
+
+        with self.conn.cursor() as cursor:
+            cursor.execute(sql, [after_id, *params])
+            return [int(row[0]) for row in cursor.fetchall()]
+
+    def select_child_ids(
+        self, table: str, fk_column: str, parent_ids: Sequence[int]
+    ) -> List[int]:
+        sql = f"""SELECT ID FROM {table}
+            WHERE {fk_column} IN ({self._placeholders(parent_ids)})
+            ORDER BY ID"""
+
+        with self.conn.cursor() as cursor:
+            cursor.execute(sql, list(parent_ids))
+            return [int(row[0]) for row in cursor.fetchall()]
+
+    def fetch_rows(
+        self, table: str, columns: Sequence[str], ids: Sequence[int]
+    ) -> List[Dict[str, Any]]:
+        sql = f"""SELECT {", ".join(columns)} FROM {table}
+            WHERE ID IN ({self._placeholders(ids)})
+            ORDER BY ID"""
+
+        with self.conn.cursor() as cursor:
+            cursor.execute(sql, list(ids))
+            return rows_to_dict(cursor, strip=False, single=False)  # type: ignore
+
+    def copy_rows(
+        self,
+        source: str,
+        target: str,
+        columns: Sequence[str],
+        ids: Sequence[int],
+        archived_at: datetime.datetime,
+    ) -> None:
+        """INSERT ... SELECT en el servidor: los CLOB no viajan por la red"""
+        column_list = ", ".join(columns)
+        sql = f"""INSERT INTO {target} ({column_list}, ARCHIVED_AT)
+            SELECT {column_list}, ? FROM {source}
+            WHERE ID IN ({self._placeholders(ids)})"""
+
+        with self.conn.cursor() as cursor:
+            cursor.execute(sql, [archived_at, *ids])
+
+    def delete_rows(self, table: str, ids: Sequence[int]) -> int:
+        sql = f"DELETE FROM {table} WHERE ID IN ({self._placeholders(ids)})"
+
+        with self.conn.cursor() as cursor:
+            cursor.execute(sql, list(ids))
+            return cursor.rowcount
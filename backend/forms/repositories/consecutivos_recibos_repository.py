@@ -26,7 +26,7 @@ class ConsecutivosRecibosRepository(BaseRepository):
 
             with self.conn.cursor() as cursor:
                 cursor.execute(sql, [search_param])
-                data = rows_to_dict(cursor, strip=True, single=False)
+                data = rows_to_dict(cursor, single=False)
             return data
         except Exception as e:
             print(f"❌ Error en consulta: {e}")
@@ -0,0 +1,48 @@
+from typing import List, Sequence
+
+from django.db import models
+from forms.repositories.base_repository import BaseRepository
+
+
+class GenericModelRepository(BaseRepository):
+    def bulk_insert(self, objs: Sequence[models.Model], batch_size: int = 100) -> List[int]:
+        """
+        Inserta instancias nuevas de un mismo modelo con un INSERT multi-fila
+        por lote y les asigna el pk generado, leído con SELECT ... FROM FINAL
+        TABLE en el orden de entrada. Los valores pasan por pre_save y
+        get_db_prep_save como en Model.save() (defaults, auto_now_add, ...).
+        """
+        if not objs:
+            return []
+
+        meta = objs[0]._meta
+        fields = [field for field in meta.concrete_fields if not field.db_returning]
+        quote_name = self.conn.ops.quote_name
+        columns = ", ".join(quote_name(field.column) for field in fields)
+        placeholders = f"({', '.join('?' for _ in fields)})"
+        ids: List[int] = []
+
+        for start in range(0, len(objs), batch_size):
+            chunk = objs[start : start + batch_size]
+            values = ", ".join(placeholders for _ in chunk)
+            sql = f"""SELECT {quote_name(meta.pk.column)} FROM FINAL TABLE (
+                INSERT INTO {meta.db_table} ({columns}) VALUES {values}
+            ) ORDER BY INPUT SEQUENCE"""
+
+            params = [
+                field.get_db_prep_save(field.pre_save(obj, add=True), connection=self.conn)
+                for obj in chunk
+                for field in fields
+            ]
+
+            with self.conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                chunk_ids = [int(row[0]) for row in cursor.fetchall()]
+
+            for obj, pk in zip(chunk, chunk_ids):
+                obj.pk = pk
+                obj._state.adding = False
+                obj._state.db = self.conn.alias
+            ids.extend(chunk_ids)
+
+        return ids
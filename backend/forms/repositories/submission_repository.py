@@ -0,0 +1,93 @@
+import datetime
+from typing import List, Optional, Sequence, Tuple
+from forms.models.forms import FormSubmission, SubmissionFieldIndex
+from forms.repositories.base_repository import BaseRepository
+from forms.utils.submission_codec import get_storage_config, pack
+
+
+class SubmissionRepository(BaseRepository):
+    # Filas por INSERT multi-fila (4 parámetros por fila)
+    INSERT_CHUNK = 100
+    # Filas de índice por INSERT multi-fila (4 parámetros por fila)
+    INDEX_CHUNK = 250
+
+    def bulk_insert(
+        self, rows: Sequence[Tuple[int, str, datetime.datetime]]
+    ) -> List[int]:
+        """
+        Inserta (form_id, data, created_at) con un INSERT multi-fila por lote
+        y devuelve los IDs generados en el mismo orden, leyendo la identidad
+        con SELECT ... FROM FINAL TABLE en lugar de IDENTITY_VAL_LOCAL().
+        Según SUBMISSION_STORAGE, data se guarda en DATA o comprimido en DATA_BLOB.
+        """
+        table = FormSubmission._meta.db_table
+        storage = get_storage_config()
+        ids: List[int] = []
+
+        for start in range(0, len(rows), self.INSERT_CHUNK):
+            chunk = rows[start : start + self.INSERT_CHUNK]
+            values = ", ".join("(?, ?, ?, ?)" for _ in chunk)
+            sql = f"""SELECT ID FROM FINAL TABLE (
+                INSERT INTO {table} (FORM_ID, DATA, DATA_BLOB, CREATED_AT) VALUES {values}
+            ) ORDER BY INPUT SEQUENCE"""
+
+            params = []
+            for form_id, data, created_at in chunk:
+                params.extend(
+                    [
+                        form_id,
+                        *pack(data, storage),
+                        self.conn.ops.adapt_datetimefield_value(created_at),
+                    ]
+                )
+
+            with self.conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                ids.extend(int(row[0]) for row in cursor.fetchall())
+
+        return ids
+
+    def insert_field_index(self, rows: Sequence[Tuple[int, int, str, str]]) -> None:
+        """Inserta (submission_id, form_id, field_name, value) en FORMSUBMISSION_FIELD_INDEX"""
+        table = SubmissionFieldIndex._meta.db_table
+
+        for start in range(0, len(rows), self.INDEX_CHUNK):
+            chunk = rows[start : start + self.INDEX_CHUNK]
+            values = ", ".join("(?, ?, ?, ?)" for _ in chunk)
+            sql = f"""INSERT INTO {table} (FORMSUBMISSION_ID, FORM_ID, FIELD_NAME, VALUE)
+                VALUES {values}"""
+
+            with self.conn.cursor() as cursor:
+                cursor.execute(sql, [value for row in chunk for value in row])
+
+    def delete_field_index(self, submission_ids: Sequence[int]) -> None:
+        table = SubmissionFieldIndex._meta.db_table
+        placeholders = ", ".join("?" for _ in submission_ids)
+
+        with self.conn.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {table} WHERE FORMSUBMISSION_ID IN ({placeholders})",
+                list(submission_ids),
+            )
+
+    def fetch_storage(self, submission_ids: Sequence[int]) -> List[Tuple[int, Optional[str], Optional[bytes]]]:
+        """(id, DATA, DATA_BLOB) de las submissions dadas"""
+        table = FormSubmission._meta.db_table
+        placeholders = ", ".join("?" for _ in submission_ids)
+
+        with self.conn.cursor() as cursor:
+            cursor.execute(
+                f"SELECT ID, DATA, DATA_BLOB FROM {table} WHERE ID IN ({placeholders}) ORDER BY ID",
+                list(submission_ids),
+            )
+            return [(int(row[0]), row[1], row[2]) for row in cursor.fetchall()]
+
+    def update_storage(self, rows: Sequence[Tuple[int, Optional[str], Optional[bytes]]]) -> None:
+        """Reescribe (id, DATA, DATA_BLOB) de cada submission"""
+        table = FormSubmission._meta.db_table
+
+        with self.conn.cursor() as cursor:
+            cursor.executemany(
+                f"UPDATE {table} SET DATA = ?, DATA_BLOB = ? WHERE ID = ?",
+                [(data, data_blob, submission_id) for submission_id, data, data_blob in rows],
+            )
@@ -0,0 +1,72 @@
+import datetime
+from typing import List, Optional, Sequence, Tuple
+from forms.models.forms import SubmissionTaskLog
+from forms.repositories.base_repository import BaseRepository
+
+
+class TaskLogRepository(BaseRepository):
+    """Escrituras por lotes de SUBMISSION_TASK_LOG (entregas de webhooks en batch)"""
+
+    # Filas por INSERT multi-fila (5 parámetros por fila)
+    INSERT_CHUNK = 200
+    # IDs por UPDATE ... WHERE ID IN (...)
+    UPDATE_CHUNK = 500
+
+    def bulk_insert(
+        self, rows: Sequence[Tuple[int, int, str, datetime.datetime]]
+    ) -> List[int]:
+        """
+        Inserta (submission_id, webhook_id, status, started_at) con un INSERT
+        multi-fila por lote y devuelve los IDs en el mismo orden (FINAL TABLE).
+        """
+        table = SubmissionTaskLog._meta.db_table
+        ids: List[int] = []
+
+        for start in range(0, len(rows), self.INSERT_CHUNK):
+            chunk = rows[start : start + self.INSERT_CHUNK]
+            values = ", ".join("(?, ?, ?, 1, ?, ?)" for _ in chunk)
+            sql = f"""SELECT ID FROM FINAL TABLE (
+                INSERT INTO {table}
+                    (FORMSUBMISSION_ID, WEBHOOK_CONFIG_ID, STATUS, ATTEMPT, ERROR_MESSAGE, STARTED_AT)
+                VALUES {values}
+            ) ORDER BY INPUT SEQUENCE"""
+
+            params = []
+            for submission_id, webhook_id, status, started_at in chunk:
+                params.extend(
+                    [
+                        submission_id,
+                        webhook_id,
+                        status,
+                        "",
+                        self.conn.ops.adapt_datetimefield_value(started_at),
+                    ]
+                )
+
+            with self.conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                ids.extend(int(row[0]) for row in cursor.fetchall())
+
+        return ids
+
+    def update_result(
+        self,
+        ids: Sequence[int],
+        status: str,
+        error_message: str = "",
+        response_data: Optional[str] = None,
+        completed_at: Optional[datetime.datetime] = None,
+    ) -> None:
+        """Mismo resultado para todas las filas: un UPDATE por lote de IDs"""
+        table = SubmissionTaskLog._meta.db_table
+        completed_at = self.conn.ops.adapt_datetimefield_value(completed_at)
+
+        for start in range(0, len(ids), self.UPDATE_CHUNK):
+            chunk = list(ids[start : start + self.UPDATE_CHUNK])
+            placeholders = ", ".join("?" for _ in chunk)
+            sql = f"""UPDATE {table}
+                SET STATUS = ?, ERROR_MESSAGE = ?, RESPONSE_DATA = ?, COMPLETED_AT = ?
+                WHERE ID IN ({placeholders})"""
+
+            with self.conn.cursor() as cursor:
+                cursor.execute(sql, [status, error_message, response_data, completed_at, *chunk])
@@ -1,5 +1,6 @@
 import logging
 import json
+from typing import Any, List, Tuple
 
 from django.db import transaction
 from rest_framework import serializers
@@ -12,10 +13,74 @@ from forms.models.forms import (
     SubmissionTaskLog,
     WebhookConfig,
 )
+from forms.services.webhook_batch import BatchConfig
+from forms.services.webhook_payload import WebhookTransform
+from forms.services.webhook_throttle import WebhookLimits
 
 logger = logging.getLogger("forms")
 
 
+class DynamicFieldsMixin:
+    """
+    Permite proyectar un serializer a un subconjunto de campos:
+    MiSerializer(queryset, many=True, fields=["id", "status"])
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+
+class CachedFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer que introspecciona el modelo una sola vez por clase: la
+    primera instancia guarda los campos construidos y los validadores del
+    modelo, y las siguientes crean sus campos con los mismos argumentos (sin
+    deepcopy de cada campo, que es lo que más cuesta en DRF).
+
+    Solo para serializers sin campos anidados: los argumentos se comparten.
+    """
+
+    def get_fields(self):
+        cls = type(self)
+        prototypes = cls.__dict__.get("_field_prototypes")
+        if prototypes is None:
+            # Sin lock: dos hilos pueden construirlos a la vez, el resultado es el mismo
+            prototypes = cls._field_prototypes = super().get_fields()
+        return {
+            name: field.__class__(*field._args, **field._kwargs)
+            for name, field in prototypes.items()
+        }
+
+    def get_validators(self):
+        cls = type(self)
+        validators = cls.__dict__.get("_model_validators")
+        if validators is None:
+            validators = cls._model_validators = super().get_validators()
+        return list(validators)
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer para altas masivas: validate_rows valida cada elemento por
+    separado y devuelve las filas válidas junto con los errores de las demás,
+    en lugar de descartar todo el lote si una falla.
+    """
+
+    def validate_rows(self) -> Tuple[List[Tuple[int, Any]], List[Tuple[int, Any]]]:
+        valid, errors = [], []
+        for index, item in enumerate(self.initial_data):
+            try:
+                valid.append((index, self.child.run_validation(item)))
+            except serializers.ValidationError as e:
+                errors.append((index, e.detail))
+        return valid, errors
+
+
 class FormFieldOptionSerializer(serializers.ModelSerializer):
     class Meta:
         model = FormFieldOption
@@ -36,6 +101,7 @@ class FormFieldSerializer(serializers.ModelSerializer):
             "label",
             "field_type",
             "required",
+            "indexed",
             "options",
             "depends_on",
             "depends_value",
@@ -66,6 +132,7 @@ class FormFieldSerializer(serializers.ModelSerializer):
         instance.label = validated_data.get("label", instance.label)
         instance.field_type = validated_data.get("field_type", instance.field_type)
         instance.required = validated_data.get("required", instance.required)
+        instance.indexed = validated_data.get("indexed", instance.indexed)
         instance.depends_on = validated_data.get("depends_on", instance.depends_on)
         instance.depends_value = validated_data.get(
             "depends_value", instance.depends_value
@@ -159,7 +226,16 @@ class FormSerializer(serializers.ModelSerializer):
         """Sobrescribir para ordenar los fields por field_order"""
         representation = super().to_representation(instance)
 
-        ordered_formfields = instance.formfieldform_set.all().order_by("field_order")
+        # FormViewSet ya precarga los campos ordenados por field_order
+        prefetched = getattr(instance, "_prefetched_objects_cache", {})
+        if "formfieldform_set" in prefetched:
+            return representation
+
+        ordered_formfields = (
+            instance.formfieldform_set.select_related("formfield")
+            .prefetch_related("formfield__options")
+            .order_by("field_order")
+        )
 
         representation["fields"] = FormFieldThroughSerializer(
             ordered_formfields, many=True
@@ -371,9 +447,18 @@ class WebhookConfigSerializer(serializers.ModelSerializer):
         """Validar que config sea un JSON válido"""
         if value:
             try:
-                json.loads(value)
+                config = json.loads(value)
             except json.JSONDecodeError:
                 raise serializers.ValidationError("Config debe ser un JSON válido")
+            if isinstance(config, dict):
+                # Mismas reglas que al entregar (forms/services/webhook_payload.py,
+                # webhook_throttle.py y webhook_batch.py)
+                try:
+                    WebhookTransform(config)
+                    WebhookLimits(config)
+                    BatchConfig(config)
+                except ValueError as e:
+                    raise serializers.ValidationError(str(e))
         return value
 
     def create(self, validated_data):
@@ -386,7 +471,7 @@ class WebhookConfigSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class SubmissionTaskLogSerializer(serializers.ModelSerializer):
+class SubmissionTaskLogSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     webhook_name = serializers.CharField(source="webhook.name", read_only=True)
     submission_info = serializers.CharField(source="submission.__str__", read_only=True)
     response_dict = serializers.SerializerMethodField()
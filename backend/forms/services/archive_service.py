@@ -0,0 +1,245 @@
+import datetime
+import gzip
+import json
+import logging
+import os
+import time
+from typing import Callable, List, Optional, Sequence
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from forms.models.forms import Form, FormSubmission, SubmissionTaskLog
+from forms.repositories.archive_repository import ArchiveRepository
+from forms.utils.submission_codec import unpack
+
+logger = logging.getLogger("forms")
+
+DEFAULTS = {
+    "DEFAULT_DAYS": 365,
+    "FORMS": {},
+    "TASK_LOG_DAYS": 90,
+    "BATCH_SIZE": 500,
+    "ARCHIVE_DIR": os.path.join(settings.BASE_DIR, "archive"),
+}
+
+# Tablas de archivo (ver sql/sentences.sql)
+ARCHIVE_TABLES = {
+    FormSubmission: '"TIFORMS"."FORMSUBMISSION_ARCHIVE"',
+    SubmissionTaskLog: '"TIFORMS"."SUBMISSION_TASK_LOG_ARCHIVE"',
+}
+
+
+def get_retention_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "SUBMISSION_RETENTION", {}) or {})
+    return config
+
+
+def model_columns(model) -> List[str]:
+    return [f'"{field.column}"' for field in model._meta.concrete_fields]
+
+
+class SubmissionArchiver:
+    """
+    Mueve a archivo (tablas *_ARCHIVE o ficheros JSONL comprimidos) las filas
+    más antiguas que la política de retención, por lotes de IDs. Cada lote
+    es una transacción independiente, así los bloqueos sobre las tablas de
+    producción duran solo lo que tarda un lote.
+
+    Es reanudable: las filas archivadas desaparecen de la tabla caliente, y
+    en modo JSONL el fichero de un lote se nombra por su rango de IDs, de modo
+    que si el proceso muere antes del DELETE el reintento lo sobrescribe sin
+    duplicar.
+    """
+
+    MODES = ("table", "jsonl")
+
+    def __init__(
+        self,
+        mode: str = "table",
+        batch_size: Optional[int] = None,
+        pause: float = 0.0,
+        dry_run: bool = False,
+        max_batches: Optional[int] = None,
+        repository: Optional[ArchiveRepository] = None,
+        log: Optional[Callable[[str], None]] = None,
+    ):
+        if mode not in self.MODES:
+            raise ValueError(f"Modo no válido: {mode}. Disponibles: {self.MODES}")
+
+        self.config = get_retention_config()
+        self.mode = mode
+        self.batch_size = batch_size or self.config["BATCH_SIZE"]
+        self.pause = pause
+        self.dry_run = dry_run
+        self.max_batches = max_batches
+        self.repository = repository or ArchiveRepository()
+        self.log = log or logger.info
+        self.batches = 0
+
+    # --- Políticas ---
+
+    def retention_days_for(self, form: Form) -> Optional[int]:
+        """Días de retención de un formulario (None = conservar siempre)"""
+        policies = self.config["FORMS"]
+        for key in (form.slug, form.id, str(form.id)):
+            if key in policies:
+                return policies[key]
+        return self.config["DEFAULT_DAYS"]
+
+    def _cutoff(self, days: int) -> datetime.datetime:
+        return timezone.now() - datetime.timedelta(days=days)
+
+    def _budget_left(self) -> bool:
+        return self.max_batches is None or self.batches < self.max_batches
+
+    # --- Submissions ---
+
+    def archive_submissions(self, older_than_days: Optional[int] = None) -> int:
+        total = 0
+        for form in Form.objects.only("id", "slug", "name").order_by("id"):
+            days = older_than_days if older_than_days is not None else self.retention_days_for(form)
+            if days is None:
+                continue
+            total += self._archive_form_submissions(form, days)
+            if not self._budget_left():
+                break
+        return total
+
+    def _archive_form_submissions(self, form: Form, days: int) -> int:
+        table = FormSubmission._meta.db_table
+        cutoff = self._cutoff(days)
+        archived = 0
+        after_id = 0
+
+        while self._budget_left():
+            ids = self.repository.select_ids(
+                table, '"FORM_ID" = ? AND "CREATED_AT" < ?', [form.id, cutoff],
+                self.batch_size, after_id=after_id,
+            )
+            if not ids:
+                break
+
+            if self.dry_run:
+                after_id = ids[-1]
+            else:
+                with transaction.atomic():
+                    # Los task logs dependen de la submission (ON DELETE CASCADE):
+                    # se archivan primero para no perderlos.
+                    log_ids = self.repository.select_child_ids(
+                        SubmissionTaskLog._meta.db_table, '"FORMSUBMISSION_ID"', ids
+                    )
+                    if log_ids:
+                        self._move(SubmissionTaskLog, log_ids)
+                    self._move(FormSubmission, ids)
+
+            archived += len(ids)
+            self.batches += 1
+            self.log(
+                f"Formulario {form.slug or form.id}: {archived} submissions "
+                f"{'por archivar' if self.dry_run else 'archivadas'} (hasta ID {ids[-1]})"
+            )
+            self._sleep()
+
+        return archived
+
+    # --- Task logs ---
+
+    def archive_task_logs(self, older_than_days: Optional[int] = None) -> int:
+        """
+        Task logs más antiguos que TASK_LOG_DAYS, por formulario: nunca más
+        tiempo que la retención del propio formulario y nada de los
+        formularios que se conservan siempre (política None).
+        older_than_days, como en archive_submissions, ignora las políticas.
+        """
+        total = 0
+        for form in Form.objects.only("id", "slug", "name").order_by("id"):
+            if older_than_days is not None:
+                days = older_than_days
+            else:
+                form_days = self.retention_days_for(form)
+                if form_days is None or self.config["TASK_LOG_DAYS"] is None:
+                    continue
+                days = min(self.config["TASK_LOG_DAYS"], form_days)
+            total += self._archive_form_task_logs(form, days)
+            if not self._budget_left():
+                break
+        return total
+
+    def _archive_form_task_logs(self, form: Form, days: int) -> int:
+        table = SubmissionTaskLog._meta.db_table
+        cutoff = self._cutoff(days)
+        archived = 0
+        after_id = 0
+
+        while self._budget_left():
+            ids = self.repository.select_ids(
+                table,
+                f'"STARTED_AT" < ? AND "FORMSUBMISSION_ID" IN '
+                f'(SELECT "ID" FROM {FormSubmission._meta.db_table} WHERE "FORM_ID" = ?)',
+                [cutoff, form.id],
+                self.batch_size,
+                after_id=after_id,
+            )
+            if not ids:
+                break
+
+            if self.dry_run:
+                after_id = ids[-1]
+            else:
+                with transaction.atomic():
+                    self._move(SubmissionTaskLog, ids)
+
+            archived += len(ids)
+            self.batches += 1
+            self.log(
+                f"Formulario {form.slug or form.id}: {archived} task logs "
+                f"{'por archivar' if self.dry_run else 'archivados'} (hasta ID {ids[-1]})"
+            )
+            self._sleep()
+
+        return archived
+
+    # --- Movimiento de un lote ---
+
+    def _move(self, model, ids: Sequence[int]) -> None:
+        table = model._meta.db_table
+        columns = model_columns(model)
+
+        if self.mode == "table":
+            self.repository.copy_rows(
+                table, ARCHIVE_TABLES[model], columns, ids, timezone.now()
+            )
+        else:
+            rows = self.repository.fetch_rows(table, columns, ids)
+            self._write_jsonl(model, ids, rows)
+
+        self.repository.delete_rows(table, ids)
+
+    def _write_jsonl(self, model, ids: Sequence[int], rows) -> str:
+        directory = os.path.join(self.config["ARCHIVE_DIR"], model._meta.model_name)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{ids[0]:010d}-{ids[-1]:010d}.jsonl.gz")
+        tmp_path = f"{path}.tmp"
+
+        with open(tmp_path, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as fh:
+                for row in rows:
+                    if row.get("data_blob") is not None:
+                        # El archivo JSONL guarda el JSON legible, no el BLOB
+                        row["data"] = unpack(None, row["data_blob"])
+                        row["data_blob"] = None
+                    line = json.dumps(row, cls=DjangoJSONEncoder, separators=(",", ":"))
+                    fh.write(line.encode("utf-8") + b"\n")
+            raw.flush()
+            os.fsync(raw.fileno())
+
+        # Rename atómico: el fichero existe completo o no existe
+        os.replace(tmp_path, path)
+        return path
+
+    def _sleep(self) -> None:
+        if self.pause and not self.dry_run:
+            time.sleep(self.pause)
@@ -0,0 +1,206 @@
+"""
+Circuit breaker por host de destino (webhooks, API de CME).
+
+Cada worker lleva, por host, los resultados de las llamadas de los últimos
+WINDOW segundos. Si hay al menos MIN_REQUESTS y la proporción de fallos
+(error de conexión, timeout o HTTP 5xx) llega a FAILURE_RATE, el circuito se
+abre: durante OPEN_SECONDS las llamadas a ese host fallan al instante con
+CircuitOpen en lugar de esperar el timeout. Después pasa a semiabierto y deja
+pasar HALF_OPEN_PROBES llamadas de prueba: si salen bien se cierra, si no
+se vuelve a abrir.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+
+DEFAULTS = {
+    "ENABLED": True,
+    "WINDOW": 60,
+    "MIN_REQUESTS": 5,
+    "FAILURE_RATE": 0.5,
+    "OPEN_SECONDS": 30,
+    "HALF_OPEN_PROBES": 1,
+    # Aplazamientos de un webhook con el circuito abierto antes de darlo por fallido
+    "MAX_DEFERRALS": 20,
+}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def get_breaker_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "CIRCUIT_BREAKER", {}) or {})
+    return config
+
+
+class CircuitOpen(Exception):
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"Circuito abierto para {host}; reintentar en {retry_after:.0f}s")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(self, host: str, config: Optional[Dict[str, Any]] = None, clock=time.monotonic):
+        self.host = host
+        self.config = config or get_breaker_config()
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._results: deque = deque()
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self._probes = 0
+        self.opened_count = 0
+        self.rejected = 0
+
+    def _prune(self, now: float) -> None:
+        limit = now - self.config["WINDOW"]
+        while self._results and self._results[0][0] < limit:
+            self._results.popleft()
+
+    def _open(self, now: float) -> None:
+        self.state = OPEN
+        self.opened_at = now
+        self._probes = 0
+        self.opened_count += 1
+
+    def retry_after(self) -> float:
+        if self.state != OPEN or self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.config["OPEN_SECONDS"] - self.clock())
+
+    def is_open(self) -> bool:
+        """Abierto y sin hueco para una prueba (no reserva la prueba)"""
+        with self._lock:
+            if self.state == OPEN:
+                return self.retry_after() > 0
+            if self.state == HALF_OPEN:
+                return self._probes >= self.config["HALF_OPEN_PROBES"]
+            return False
+
+    def allow(self) -> bool:
+        """True si se puede llamar; en semiabierto reserva una de las pruebas"""
+        with self._lock:
+            if self.state == OPEN and self.retry_after() <= 0:
+                self.state = HALF_OPEN
+                self._probes = 0
+            if self.state == HALF_OPEN:
+                if self._probes >= self.config["HALF_OPEN_PROBES"]:
+                    self.rejected += 1
+                    return False
+                self._probes += 1
+                return True
+            if self.state == OPEN:
+                self.rejected += 1
+                return False
+            return True
+
+    def record(self, success: bool) -> None:
+        now = self.clock()
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                if success:
+                    self.state = CLOSED
+                    self.opened_at = None
+                    self._results.clear()
+                else:
+                    self._open(now)
+                return
+            if self.state == OPEN:
+                return
+
+            self._results.append((now, success))
+            self._prune(now)
+            total = len(self._results)
+            failures = sum(1 for _, ok in self._results if not ok)
+            if total >= self.config["MIN_REQUESTS"] and failures / total >= self.config["FAILURE_RATE"]:
+                self._open(now)
+
+    def cancel(self) -> None:
+        """La llamada no llegó a un resultado (p.ej. URL inválida): libera la prueba"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._prune(self.clock())
+            total = len(self._results)
+            failures = sum(1 for _, ok in self._results if not ok)
+            return {
+                "host": self.host,
+                "state": self.state,
+                "retry_after": round(self.retry_after(), 1),
+                "requests": total,
+                "failures": failures,
+                "failure_rate": round(failures / total, 3) if total else 0.0,
+                "opened_count": self.opened_count,
+                "rejected": self.rejected,
+            }
+
+
+class CircuitBreakerRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    @staticmethod
+    def host_for(url: str) -> str:
+        return urlsplit(url).netloc.lower()
+
+    def get(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(host, CircuitBreaker(host))
+        return breaker
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        return self.get(self.host_for(url))
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return sorted((b.snapshot() for b in breakers), key=lambda s: s["host"])
+
+    def reset(self) -> None:
+        with self._lock:
+            self._breakers.clear()
+
+
+circuit_breakers = CircuitBreakerRegistry()
+
+
+def guarded_request(method: str, url: str, **kwargs) -> requests.Response:
+    """
+    requests.request pasando por el breaker del host: lanza CircuitOpen sin
+    llamar si el circuito está abierto, y cuenta como fallo los errores de
+    conexión, los timeouts y las respuestas 5xx.
+    """
+    if not get_breaker_config()["ENABLED"]:
+        return requests.request(method, url, **kwargs)
+
+    breaker = circuit_breakers.for_url(url)
+    if not breaker.allow():
+        raise CircuitOpen(breaker.host, breaker.retry_after())
+
+    try:
+        response = requests.request(method, url, **kwargs)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+        breaker.record(False)
+        raise
+    except BaseException:
+        breaker.cancel()
+        raise
+
+    breaker.record(response.status_code < 500)
+    return response
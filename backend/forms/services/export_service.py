@@ -0,0 +1,178 @@
+import csv
+import datetime
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from forms.models.forms import Form, FormFieldForm, FormSubmission
+from forms.utils.submission_codec import unpack
+
+DEFAULTS = {
+    # Filas por consulta: cada lote es un SELECT corto por keyset (ID > último)
+    "CHUNK_SIZE": 1000,
+}
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+}
+
+# Columna con las claves del payload que ya no son campos del formulario
+EXTRA_COLUMN = "otros_campos"
+
+
+def get_export_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "SUBMISSION_EXPORT", {}) or {})
+    return config
+
+
+def parse_since(raw_value: Optional[str]) -> Optional[Tuple[str, Any]]:
+    """
+    since= acepta el último ID ya exportado (entero) o una fecha / fecha-hora
+    ISO 8601. Devuelve ("id", int), ("created_at", datetime) o None.
+    """
+    if raw_value in (None, ""):
+        return None
+    raw_value = str(raw_value).strip()
+    if raw_value.isdigit():
+        return "id", int(raw_value)
+
+    value = parse_datetime(raw_value)
+    if value is None:
+        date_value = parse_date(raw_value)
+        if date_value is None:
+            raise ValueError("El parámetro since debe ser un ID o una fecha ISO 8601")
+        value = datetime.datetime.combine(date_value, datetime.time.min)
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, datetime.timezone.utc)
+    return "created_at", value
+
+
+class _Echo:
+    """Buffer de csv.writer que devuelve la línea en lugar de acumularla"""
+
+    def write(self, value):
+        return value
+
+
+class SubmissionExporter:
+    """
+    Exporta las submissions de un formulario en orden de ID, leyendo por
+    lotes de CHUNK_SIZE con keyset (memoria constante, sin un cursor abierto
+    mientras el cliente descarga) y aplanando DATA a una columna por campo
+    en el orden de FormFieldForm.field_order.
+
+    last_id queda con el ID de la última fila emitida (y exported con el
+    total), para que un export incremental continúe con since=<last_id>.
+    """
+
+    def __init__(
+        self,
+        form: Form,
+        since: Optional[Tuple[str, Any]] = None,
+        chunk_size: Optional[int] = None,
+    ):
+        self.form = form
+        self.since = since
+        self.chunk_size = chunk_size or get_export_config()["CHUNK_SIZE"]
+        self.last_id: Optional[int] = None
+        self.exported = 0
+        self._fields: Optional[List[str]] = None
+
+    @property
+    def fields(self) -> List[str]:
+        if self._fields is None:
+            self._fields = list(
+                FormFieldForm.objects.filter(form=self.form)
+                .order_by("field_order", "id")
+                .values_list("formfield__name", flat=True)
+            )
+        return self._fields
+
+    @property
+    def columns(self) -> List[str]:
+        return ["id", "created_at", *self.fields, EXTRA_COLUMN]
+
+    def _queryset(self):
+        queryset = FormSubmission.objects.filter(form=self.form)
+        if self.since is not None:
+            column, value = self.since
+            if column == "id":
+                queryset = queryset.filter(id__gt=value)
+            else:
+                queryset = queryset.filter(created_at__gte=value)
+        return queryset.order_by("id").values_list("id", "created_at", "data", "data_blob")
+
+    def iter_submissions(self) -> Iterator[Tuple[int, datetime.datetime, Dict[str, Any]]]:
+        queryset = self._queryset()
+        after_id = 0
+        while True:
+            chunk = list(queryset.filter(id__gt=after_id)[: self.chunk_size])
+            for submission_id, created_at, raw_data, data_blob in chunk:
+                self.last_id = submission_id
+                self.exported += 1
+                yield submission_id, created_at, self.decode(unpack(raw_data, data_blob))
+            if len(chunk) < self.chunk_size:
+                return
+            after_id = chunk[-1][0]
+
+    @staticmethod
+    def decode(raw_data: Optional[str]) -> Dict[str, Any]:
+        try:
+            data = json.loads(raw_data or "{}")
+        except ValueError:
+            return {EXTRA_COLUMN: raw_data}
+        return data if isinstance(data, dict) else {EXTRA_COLUMN: data}
+
+    def split(self, data: Dict[str, Any]) -> Tuple[List[Any], Dict[str, Any]]:
+        """(valores en el orden de los campos, claves que no son campos)"""
+        values = [data.get(name) for name in self.fields]
+        field_names = set(self.fields)
+        extra = {key: value for key, value in data.items() if key not in field_names}
+        return values, extra
+
+    # --- Formatos ---
+
+    @staticmethod
+    def _csv_value(value: Any) -> Any:
+        if value is None:
+            return ""
+        if isinstance(value, list):
+            return ", ".join(str(item) for item in value)
+        if isinstance(value, dict):
+            return json.dumps(value, ensure_ascii=False)
+        return value
+
+    def iter_csv(self) -> Iterator[str]:
+        writer = csv.writer(_Echo())
+        yield writer.writerow(self.columns)
+        for submission_id, created_at, data in self.iter_submissions():
+            values, extra = self.split(data)
+            yield writer.writerow(
+                [
+                    submission_id,
+                    created_at.isoformat() if created_at else "",
+                    *(self._csv_value(value) for value in values),
+                    json.dumps(extra, ensure_ascii=False) if extra else "",
+                ]
+            )
+
+    def iter_jsonl(self) -> Iterator[str]:
+        for submission_id, created_at, data in self.iter_submissions():
+            values, extra = self.split(data)
+            row = {"id": submission_id, "created_at": created_at.isoformat() if created_at else None}
+            row.update(zip(self.fields, values))
+            if extra:
+                row[EXTRA_COLUMN] = extra
+            yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+    def iter_format(self, export_format: str) -> Iterator[str]:
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Formato no válido: {export_format}. Disponibles: {EXPORT_FORMATS}")
+        return self.iter_csv() if export_format == "csv" else self.iter_jsonl()
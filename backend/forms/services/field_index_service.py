@@ -0,0 +1,115 @@
+import logging
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import QuerySet
+from forms.models.forms import Form, FormFieldForm, FormSubmission, SubmissionFieldIndex
+from forms.repositories.archive_repository import ArchiveRepository
+from forms.services.submission_service import SubmissionService
+from forms.utils.field_index import normalize_value
+from forms.utils.submission_codec import unpack
+
+logger = logging.getLogger("forms")
+
+
+class FieldNotIndexed(ValueError):
+    pass
+
+
+def search_submissions(service: SubmissionService, form: Form, filters: Dict[str, str]) -> QuerySet:
+    """
+    Submissions del formulario cuyos campos indexados tienen los valores
+    dados (AND entre campos). Cada filtro es un IN sobre el índice
+    (FORM_ID, FIELD_NAME, VALUE), sin leer DATA.
+    """
+    indexed = set(service.indexed_fields(form.id))
+    unknown = sorted(name for name in filters if name not in indexed)
+    if unknown:
+        raise FieldNotIndexed(
+            f"Campos sin índice: {unknown}. Indexados: {sorted(indexed)}"
+        )
+
+    queryset = FormSubmission.objects.filter(form=form)
+    for name, raw_value in filters.items():
+        value = normalize_value(raw_value)
+        if value is None:
+            raise ValueError(f"El filtro {name} no puede estar vacío")
+        queryset = queryset.filter(
+            id__in=SubmissionFieldIndex.objects.filter(
+                form=form, field_name=name, value=value
+            ).values("submission_id")
+        )
+    return queryset
+
+
+class FieldIndexBackfill:
+    """
+    Llena FORMSUBMISSION_FIELD_INDEX para submissions existentes, por lotes
+    de IDs y con una transacción por lote. Cada lote borra y vuelve a
+    insertar el índice de sus submissions, así que se puede repetir (p.ej.
+    tras marcar un campo nuevo como indexed) sin duplicar filas.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        service: Optional[SubmissionService] = None,
+        repository: Optional[ArchiveRepository] = None,
+        log: Optional[Callable[[str], None]] = None,
+    ):
+        self.batch_size = batch_size
+        self.service = service or SubmissionService()
+        self.repository = repository or ArchiveRepository()
+        self.log = log or logger.info
+
+    @staticmethod
+    def indexed_forms() -> List[Form]:
+        form_ids = (
+            FormFieldForm.objects.filter(formfield__indexed=1)
+            .values_list("form_id", flat=True)
+            .distinct()
+        )
+        return list(Form.objects.filter(id__in=form_ids).only("id", "slug", "name").order_by("id"))
+
+    def run(self, forms: Optional[Iterable[Form]] = None, after_id: int = 0) -> int:
+        total = 0
+        for form in forms if forms is not None else self.indexed_forms():
+            total += self.backfill_form(form, after_id)
+        return total
+
+    def backfill_form(self, form: Form, after_id: int = 0) -> int:
+        if not self.service.indexed_fields(form.id):
+            self.log(f"Formulario {form.slug or form.id}: sin campos indexados")
+            return 0
+
+        table = FormSubmission._meta.db_table
+        processed = 0
+        while True:
+            ids = self.repository.select_ids(
+                table, '"FORM_ID" = ?', [form.id], self.batch_size, after_id=after_id
+            )
+            if not ids:
+                break
+
+            data_by_id = {
+                submission_id: unpack(data, data_blob)
+                for submission_id, data, data_blob in FormSubmission.objects.filter(
+                    id__in=ids
+                ).values_list("id", "data", "data_blob")
+            }
+            rows = self.service.field_index_rows(
+                (submission_id, form.id, data_by_id.get(submission_id) or "{}")
+                for submission_id in ids
+            )
+            with transaction.atomic():
+                self.service.repository.delete_field_index(ids)
+                if rows:
+                    self.service.repository.insert_field_index(rows)
+
+            processed += len(ids)
+            after_id = ids[-1]
+            self.log(
+                f"Formulario {form.slug or form.id}: {processed} submissions indexadas "
+                f"(hasta ID {after_id})"
+            )
+        return processed
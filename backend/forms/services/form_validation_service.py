@@ -0,0 +1,85 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from forms.models.forms import Form, FormField, FormFieldForm, FormFieldOption
+from forms.utils.cache_versions import bump_version, get_version
+from forms.utils.form_validator import FieldSpec, FormValidator
+
+# Contador de versión de las definiciones de formularios: cualquier cambio
+# en Form / FormField / FormFieldForm / FormFieldOption lo incrementa.
+FORM_DEFINITIONS = "form_definitions"
+
+
+def load_field_specs(form_id: int) -> List[FieldSpec]:
+    links = (
+        FormFieldForm.objects.filter(form_id=form_id)
+        .select_related("formfield")
+        .prefetch_related("formfield__options")
+        .order_by("field_order", "id")
+    )
+    specs = []
+    for link in links:
+        field = link.formfield
+        options = frozenset(option.value for option in field.options.all())
+        specs.append(
+            FieldSpec(
+                name=field.name,
+                field_type=field.field_type,
+                required=bool(field.required),
+                options=options or None,
+                depends_on=field.depends_on or None,
+                depends_value=field.depends_value,
+                indexed=bool(field.indexed),
+            )
+        )
+    return specs
+
+
+class ValidatorCache:
+    """
+    Validadores compilados por formulario, guardados con la versión de
+    FORM_DEFINITIONS con la que se compilaron. Un cambio hecho en cualquier
+    worker sube la versión y el validador se recompila en la siguiente
+    submission.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._validators: Dict[Tuple[int, bool], Tuple[int, FormValidator]] = {}
+
+    def get(self, form_id: int, strip_unknown: bool = False) -> FormValidator:
+        version = get_version(FORM_DEFINITIONS)
+        key = (form_id, strip_unknown)
+        entry = self._validators.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        validator = FormValidator(load_field_specs(form_id), strip_unknown=strip_unknown)
+        with self._lock:
+            self._validators[key] = (version, validator)
+        return validator
+
+    def clear(self) -> None:
+        with self._lock:
+            self._validators.clear()
+
+
+validator_cache = ValidatorCache()
+
+
+def get_form_validator(form_id: int, strip_unknown: bool = False) -> FormValidator:
+    return validator_cache.get(form_id, strip_unknown)
+
+
+@receiver(post_save, sender=Form)
+@receiver(post_delete, sender=Form)
+@receiver(post_save, sender=FormField)
+@receiver(post_delete, sender=FormField)
+@receiver(post_save, sender=FormFieldForm)
+@receiver(post_delete, sender=FormFieldForm)
+@receiver(post_save, sender=FormFieldOption)
+@receiver(post_delete, sender=FormFieldOption)
+def form_definition_changed(sender, **kwargs):
+    bump_version(FORM_DEFINITIONS)
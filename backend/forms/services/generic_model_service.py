@@ -0,0 +1,37 @@
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import models, transaction
+from forms.repositories.generic_model_repository import GenericModelRepository
+
+DEFAULTS = {
+    # Máximo de objetos por petición a POST /api/<model_name>/ con una lista
+    "BULK_MAX_ITEMS": 500,
+    # Filas por INSERT multi-fila
+    "BULK_BATCH_SIZE": 100,
+}
+
+
+def get_generic_api_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "GENERIC_API", {}) or {})
+    return config
+
+
+class GenericModelService:
+    def __init__(self, repository=None):
+        self.repository = repository or GenericModelRepository()
+
+    def bulk_create(
+        self, model_class, rows: List[Dict[str, Any]], batch_size: Optional[int] = None
+    ) -> List[models.Model]:
+        """
+        Crea las filas ya validadas en una sola transacción, con INSERT
+        multi-fila por lotes de BULK_BATCH_SIZE. Si un lote falla no queda
+        ninguna fila. Las instancias no pasan por save() ni post_save.
+        """
+        batch_size = batch_size or get_generic_api_config()["BULK_BATCH_SIZE"]
+        objs = [model_class(**data) for data in rows]
+        with transaction.atomic(using=self.repository.conn.alias):
+            self.repository.bulk_insert(objs, batch_size)
+        return objs
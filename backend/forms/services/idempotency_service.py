@@ -0,0 +1,227 @@
+import datetime
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from forms.models.forms import IdempotencyKey
+from forms.utils.db_helpers import integrity_errors
+
+DEFAULTS = {
+    "HEADER": "Idempotency-Key",
+    # Ventana en la que un reintento con la misma clave devuelve la respuesta original
+    "TTL_SECONDS": 24 * 3600,
+    # Una reserva "processing" más vieja que esto se da por abandonada
+    # (worker reiniciado a mitad de petición)
+    "PROCESSING_TIMEOUT": 120,
+    "CACHE_SIZE": 2048,
+    "CACHE_TTL_SECONDS": 600,
+    "MAX_KEY_LENGTH": 255,
+}
+
+
+def get_idempotency_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "IDEMPOTENCY", {}) or {})
+    return config
+
+
+class StoredResponse(NamedTuple):
+    status: int
+    body: Any
+    request_hash: str
+
+
+class IdempotencyConflict(Exception):
+    """Otra petición con la misma clave sigue en proceso"""
+
+
+class IdempotencyKeyReused(Exception):
+    """La clave ya se usó con un cuerpo distinto"""
+
+
+class ResponseCache:
+    """LRU con TTL, por worker, de las respuestas ya completadas"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires_at, response = item
+            if expires_at < time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return response
+
+    def set(self, key: str, response: StoredResponse, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._items[key] = (time.monotonic() + ttl, response)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+def fingerprint_request(data, files=None) -> str:
+    """
+    Hash del cuerpo de la petición para detectar una clave reutilizada con
+    otro contenido. De los archivos se toma nombre y tamaño.
+    """
+    digest = hashlib.sha256()
+    if not hasattr(data, "keys"):
+        # Cuerpo JSON que no es un objeto (p.ej. la lista de un lote)
+        data = {"": data}
+    for key in sorted(data.keys()):
+        if files and key in files:
+            continue
+        values = data.getlist(key) if hasattr(data, "getlist") else [data[key]]
+        for value in values:
+            digest.update(key.encode())
+            digest.update(b"=")
+            digest.update(json.dumps(value, cls=DjangoJSONEncoder, sort_keys=True, default=str).encode())
+            digest.update(b"\n")
+    for key in sorted(files or {}):
+        for upload in files.getlist(key) if hasattr(files, "getlist") else [files[key]]:
+            digest.update(f"{key}@{upload.name}:{upload.size}\n".encode())
+    return digest.hexdigest()
+
+
+class IdempotencyService:
+    """
+    Reserva-primero: la clave se inserta como "processing" antes de hacer el
+    trabajo, y el índice único (SCOPE, IDEMPOTENCY_KEY) decide quién gana
+    entre reintentos concurrentes. Al terminar se guarda la respuesta, que los
+    reintentos reciben sin volver a tocar almacenamiento, DB2 ni webhooks.
+    """
+
+    def __init__(self, scope: str, cache: Optional[ResponseCache] = None):
+        self.scope = scope
+        self.config = get_idempotency_config()
+        self.cache = cache or response_cache
+
+    def _cache_key(self, key: str) -> str:
+        return f"{self.scope}:{key}"
+
+    def _stored(self, record: IdempotencyKey) -> StoredResponse:
+        return StoredResponse(
+            record.response_status, json.loads(record.response_body or "null"), record.request_hash
+        )
+
+    def _check_hash(self, stored: StoredResponse, request_hash: str) -> StoredResponse:
+        if stored.request_hash != request_hash:
+            raise IdempotencyKeyReused()
+        return stored
+
+    def lookup_cached(self, key: str, request_hash: str) -> Optional[StoredResponse]:
+        stored = self.cache.get(self._cache_key(key))
+        if stored is None:
+            return None
+        return self._check_hash(stored, request_hash)
+
+    def reserve(self, key: str, request_hash: str):
+        """
+        Devuelve (registro reservado, None) si esta petición debe hacer el
+        trabajo, o (None, respuesta guardada) si es un reintento.
+        """
+        now = timezone.now()
+        for _ in range(2):
+            try:
+                record = IdempotencyKey.objects.create(
+                    scope=self.scope,
+                    key=key,
+                    request_hash=request_hash,
+                    status="processing",
+                    expires_at=now + datetime.timedelta(seconds=self.config["TTL_SECONDS"]),
+                )
+                return record, None
+            except integrity_errors():
+                pass
+
+            existing = IdempotencyKey.objects.filter(scope=self.scope, key=key).first()
+            if existing is None:
+                continue
+            if existing.expires_at <= now or self._abandoned(existing, now):
+                existing.delete()
+                continue
+            if existing.status == "processing":
+                if existing.request_hash != request_hash:
+                    raise IdempotencyKeyReused()
+                raise IdempotencyConflict()
+
+            stored = self._check_hash(self._stored(existing), request_hash)
+            self._remember(key, stored, existing.expires_at)
+            return None, stored
+
+        raise IdempotencyConflict()
+
+    def _abandoned(self, record: IdempotencyKey, now) -> bool:
+        return (
+            record.status == "processing"
+            and (now - record.created_at).total_seconds() > self.config["PROCESSING_TIMEOUT"]
+        )
+
+    def complete(self, record: IdempotencyKey, status: int, body: Any, submission_id=None) -> bool:
+        """
+        Guarda la respuesta si la reserva sigue "processing". Devuelve False
+        si ya no existe: el drenador del spool la reemplazó por la respuesta
+        definitiva de la submission encolada, que es la que vale.
+        """
+        record.status = "completed"
+        record.response_status = status
+        record.response_body = json.dumps(body, cls=DjangoJSONEncoder)
+        record.submission_id = submission_id
+        updated = IdempotencyKey.objects.filter(pk=record.pk, status="processing").update(
+            status=record.status,
+            response_status=record.response_status,
+            response_body=record.response_body,
+            submission_id=record.submission_id,
+        )
+        if not updated:
+            return False
+        self._remember(record.key, self._stored(record), record.expires_at)
+        return True
+
+    def release(self, record: IdempotencyKey) -> None:
+        """Libera la clave (la petición falló y el cliente puede reintentar)"""
+        IdempotencyKey.objects.filter(pk=record.pk).delete()
+
+    def _remember(self, key: str, stored: StoredResponse, expires_at) -> None:
+        ttl = (expires_at - timezone.now()).total_seconds()
+        self.cache.set(self._cache_key(key), stored, ttl)
+
+    @staticmethod
+    def purge_expired(batch_size: int = 1000) -> int:
+        total = 0
+        while True:
+            ids = list(
+                IdempotencyKey.objects.filter(expires_at__lte=timezone.now())
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                return total
+            IdempotencyKey.objects.filter(id__in=ids).delete()
+            total += len(ids)
+
+
+_config = get_idempotency_config()
+response_cache = ResponseCache(_config["CACHE_SIZE"], _config["CACHE_TTL_SECONDS"])
@@ -0,0 +1,307 @@
+import json
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from dbal import deadline
+from forms.models.forms import Form, FormSubmission
+from forms.repositories.submission_repository import SubmissionRepository
+from forms.services.form_validation_service import FORM_DEFINITIONS, get_form_validator
+from forms.signals.webhook_signals import submission_created
+from forms.utils.cache_versions import get_version
+from forms.utils.db_helpers import integrity_errors
+from forms.utils.field_index import index_entries
+
+DEFAULTS = {
+    # Segundos que un worker confía en su mapa id -> nombre de formularios
+    "FORM_CACHE_TTL": 60,
+    # Validar el payload contra la definición del formulario
+    "VALIDATE": True,
+    # Quitar claves que no son campos del formulario
+    "STRIP_UNKNOWN_FIELDS": False,
+    # Máximo de submissions por petición a /api/submissions/batch/
+    "BATCH_MAX_ITEMS": 100,
+    # Ante un id desconocido se recarga el mapa como mucho una vez cada
+    # tantos segundos: ids inventados no pueden forzar una lectura de FORM
+    # por petición
+    "FORM_MISS_RELOAD_INTERVAL": 1.0,
+}
+
+RESERVED_KEYS = ("form_id", "form")
+
+
+def get_ingest_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "SUBMISSION_INGEST", {}) or {})
+    return config
+
+
+def encode_submission_data(data: Dict[str, Any]) -> str:
+    """
+    JSON compacto del payload, en una sola pasada. Se mantiene ASCII
+    (\\uXXXX), así el CLOB no depende del CCSID de la columna.
+    """
+    return json.dumps(data, separators=(",", ":"))
+
+
+class FormNotFound(Exception):
+    pass
+
+
+class SubmissionValidationError(Exception):
+    def __init__(self, errors: Dict[str, str]):
+        super().__init__("Datos del formulario inválidos")
+        self.errors = errors
+
+
+class BatchItem(NamedTuple):
+    form_id: Any
+    data: Dict[str, Any]
+    # campo -> lista de archivos subidos (UploadedFile de Django)
+    files: Dict[str, list]
+
+
+class FormCache:
+    """
+    Mapa id -> nombre de los formularios, cargado con una sola consulta y
+    compartido por los hilos del worker. Se recarga cuando cambia la versión
+    de FORM_DEFINITIONS (cambios hechos en cualquier worker), al vencer
+    FORM_CACHE_TTL o ante un id desconocido (como mucho una vez cada
+    FORM_MISS_RELOAD_INTERVAL segundos).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._forms: Dict[int, str] = {}
+        self._loaded_at: Optional[float] = None
+        self._version: Optional[int] = None
+
+    def _load(self) -> None:
+        version = get_version(FORM_DEFINITIONS)
+        forms = dict(Form.objects.values_list("id", "name"))
+        with self._lock:
+            self._forms = forms
+            self._loaded_at = time.monotonic()
+            self._version = version
+
+    def _expired(self) -> bool:
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > get_ingest_config()["FORM_CACHE_TTL"]
+            or self._version != get_version(FORM_DEFINITIONS)
+        )
+
+    def lookup(self, form_id: int) -> Tuple[int, str]:
+        if self._expired():
+            self._load()
+        name = self._forms.get(form_id)
+        if name is None:
+            if self._reload_on_miss():
+                self._load()
+                name = self._forms.get(form_id)
+            if name is None:
+                raise FormNotFound(form_id)
+        return form_id, name
+
+    def _reload_on_miss(self) -> bool:
+        interval = get_ingest_config()["FORM_MISS_RELOAD_INTERVAL"]
+        now = time.monotonic()
+        with self._lock:
+            if self._loaded_at is not None and now - self._loaded_at < interval:
+                return False
+            # Reserva la recarga: los demás hilos con ids desconocidos no la repiten
+            self._loaded_at = now
+            return True
+
+    def get_form(self, form_id: int) -> Form:
+        """Instancia con solo id y name cargados (el resto se difiere)"""
+        form_id, name = self.lookup(form_id)
+        return Form.from_db("default", ["id", "name"], [form_id, name])
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+
+form_cache = FormCache()
+
+
+class SubmissionService:
+    """
+    Ingesta de submissions: el formulario se resuelve contra el mapa en
+    memoria, el payload se valida con el validador compilado del formulario,
+    se codifica una vez y se guarda con un único INSERT ... FINAL TABLE.
+    La submission lleva el Form ya cargado, así el listener de webhooks no
+    vuelve a consultarlo.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[FormCache] = None,
+        repository: Optional[SubmissionRepository] = None,
+    ):
+        self.cache = cache or form_cache
+        self.repository = repository or SubmissionRepository()
+
+    def resolve_form(self, raw_form_id: Any) -> Form:
+        try:
+            form_id = int(raw_form_id)
+        except (TypeError, ValueError):
+            raise FormNotFound(raw_form_id)
+        return self.cache.get_form(form_id)
+
+    @staticmethod
+    def build_data(request_data, files: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        data = {
+            key: value for key, value in request_data.items() if key not in RESERVED_KEYS
+        }
+        if files:
+            data.update(files)
+        return data
+
+    def validate(self, form: Form, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Devuelve los datos sin campos inactivos o lanza SubmissionValidationError"""
+        config = get_ingest_config()
+        if not config["VALIDATE"]:
+            return data
+        validator = get_form_validator(form.id, config["STRIP_UNKNOWN_FIELDS"])
+        cleaned, errors = validator.validate(data)
+        if errors:
+            raise SubmissionValidationError(errors)
+        return cleaned
+
+    def create(
+        self, form: Form, data: Dict[str, Any], db_timeout: Optional[float] = None
+    ) -> FormSubmission:
+        """
+        Inserta la submission acotando la espera a DB2 a `db_timeout`
+        segundos. submission_created se envía después, fuera de ese límite:
+        los webhooks siguen usando el deadline de la petición.
+        """
+        encoded = encode_submission_data(data)
+        created_at = timezone.now()
+        try:
+            with deadline.deadline(db_timeout):
+                # Sin campos indexados basta el INSERT en autocommit
+                indexed = bool(self.indexed_fields(form.id))
+                with transaction.atomic() if indexed else nullcontext():
+                    [submission_id] = self.insert([(form.id, encoded, created_at)], [data])
+        except integrity_errors():
+            # El formulario se borró en otro worker después de cargar el mapa
+            self.cache.invalidate()
+            raise FormNotFound(form.id)
+
+        submission = self.build_submission(submission_id, form, encoded, created_at)
+        submission_created.send(sender=FormSubmission, submission=submission)
+        return submission
+
+    def indexed_fields(self, form_id: int) -> Tuple[str, ...]:
+        """Campos del formulario con índice de valores (FormField.indexed)"""
+        strip_unknown = get_ingest_config()["STRIP_UNKNOWN_FIELDS"]
+        return get_form_validator(form_id, strip_unknown).indexed_fields
+
+    def field_index_rows(self, inserted) -> List[Tuple[int, int, str, str]]:
+        """
+        Filas de FORMSUBMISSION_FIELD_INDEX para (submission_id, form_id, data);
+        data puede venir ya codificado como JSON.
+        """
+        rows = []
+        for submission_id, form_id, data in inserted:
+            fields = self.indexed_fields(form_id)
+            if not fields:
+                continue
+            if isinstance(data, str):
+                try:
+                    data = json.loads(data)
+                except ValueError:
+                    continue
+            if not isinstance(data, dict):
+                continue
+            rows.extend(
+                (submission_id, form_id, name, value) for name, value in index_entries(fields, data)
+            )
+        return rows
+
+    def insert(self, rows: List[Tuple[int, str, Any]], payloads: List[Any]) -> List[int]:
+        """
+        Inserta (form_id, data, created_at) y el índice de sus campos. Si hay
+        campos indexados el llamador debe abrir la transacción.
+        """
+        ids = self.repository.bulk_insert(rows)
+        index_rows = self.field_index_rows(
+            (submission_id, form_id, payload)
+            for submission_id, (form_id, _, _), payload in zip(ids, rows, payloads)
+        )
+        if index_rows:
+            self.repository.insert_field_index(index_rows)
+        return ids
+
+    @staticmethod
+    def build_submission(submission_id: int, form: Form, data: str, created_at) -> FormSubmission:
+        """Instancia de una fila ya insertada, con el Form cargado"""
+        submission = FormSubmission(id=submission_id, form=form, data=data, created_at=created_at)
+        submission._state.adding = False
+        submission._state.db = "default"
+        return submission
+
+    @staticmethod
+    def to_representation(submission: FormSubmission) -> Dict[str, Any]:
+        """Mismo cuerpo que devolvía FormSubmissionSerializer"""
+        return {"form": submission.form_id, "data": submission.data}
+
+    # --- Lotes ---
+
+    def create_batch(self, items: List[BatchItem], uploader) -> Tuple[List[Dict[str, Any]], List[FormSubmission]]:
+        """
+        Valida todos los ítems, sube los archivos de los válidos y los inserta
+        en una transacción con INSERT multi-fila. Devuelve el resultado de
+        cada ítem (en el orden recibido) y las submissions creadas, que no
+        pasan por post_save: el llamador encola sus webhooks.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        valid = []
+
+        for index, item in enumerate(items):
+            try:
+                form = self.resolve_form(item.form_id)
+                data = self.validate(form, {**item.data, **item.files})
+            except FormNotFound:
+                results[index] = {"index": index, "status": 404, "error": "Formulario no encontrado"}
+                continue
+            except SubmissionValidationError as e:
+                results[index] = {"index": index, "status": 400, "error": str(e), "fields": e.errors}
+                continue
+            valid.append((index, form, data, item.files))
+
+        if not valid:
+            return results, []
+
+        created_at = timezone.now()
+        rows = []
+        uploaded: List[str] = []
+        try:
+            for index, form, data, files in valid:
+                for key, uploads in files.items():
+                    if key in data:
+                        urls = uploader.handle_uploaded_files(uploads)
+                        uploaded.extend(urls)
+                        data[key] = urls[0] if len(urls) == 1 else urls
+                rows.append((form.id, encode_submission_data(data), created_at))
+
+            with transaction.atomic():
+                ids = self.insert(rows, [data for _, _, data, _ in valid])
+        except Exception:
+            # No se insertó ninguna: los archivos ya subidos quedarían huérfanos
+            uploader.delete_uploaded_files(uploaded)
+            raise
+
+        submissions = []
+        for (index, form, _, _), (_, encoded, _), submission_id in zip(valid, rows, ids):
+            submissions.append(self.build_submission(submission_id, form, encoded, created_at))
+            results[index] = {"index": index, "status": 201, "id": submission_id, "form": form.id}
+
+        return results, submissions
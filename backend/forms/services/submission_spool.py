@@ -0,0 +1,435 @@
+import datetime
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, connections, transaction
+from django.utils import timezone
+from dbal.exceptions import DeadlineExceeded, Db2ConnectionError
+from forms.models.forms import FormSubmission, IdempotencyKey
+from forms.services.idempotency_service import IdempotencyKeyReused, get_idempotency_config
+from forms.services.submission_service import (
+    FormNotFound,
+    SubmissionService,
+    SubmissionValidationError,
+    encode_submission_data,
+)
+from forms.services.webhook_delivery import enqueue_submissions
+from forms.utils.cache_versions import versions_snapshot
+
+logger = logging.getLogger("forms")
+
+DEFAULTS = {
+    "ENABLED": True,
+    # Dentro de MEDIA_ROOT (volumen persistente); nginx no sirve rutas con "/."
+    "PATH": os.path.join(settings.MEDIA_ROOT, ".spool", "submissions.sqlite3"),
+    # Segundos que la ingesta espera a DB2 antes de encolar en el spool
+    "DB_TIMEOUT": 5,
+    # Tras un fallo, segundos en los que el worker encola directo sin tocar DB2
+    "COOLDOWN": 15,
+    "DRAIN_BATCH_SIZE": 100,
+}
+
+# Scope de IDEMPOTENCY_KEY con el que el drenador marca lo ya insertado
+# cuando la petición original no traía Idempotency-Key
+SPOOL_SCOPE = "spool"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spooled_submission (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    request_hash TEXT,
+    form_id INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    validated INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    last_error TEXT,
+    UNIQUE (scope, key)
+);
+CREATE INDEX IF NOT EXISTS spooled_submission_status ON spooled_submission (status, seq);
+"""
+
+
+def get_spool_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "SUBMISSION_SPOOL", {}) or {})
+    return config
+
+
+def is_database_unavailable(error: BaseException) -> bool:
+    """
+    Errores que indican que DB2 no responde (conexión caída, timeout, deadline
+    agotado), a diferencia de errores de datos que reintentar no arregla.
+    """
+    database = connections["default"].Database
+    return isinstance(
+        error,
+        (
+            DeadlineExceeded,
+            Db2ConnectionError,
+            OperationalError,
+            InterfaceError,
+            database.OperationalError,
+            database.InterfaceError,
+        ),
+    )
+
+
+class DatabaseHealth:
+    """
+    Recuerda, por worker, el último fallo de DB2: durante COOLDOWN segundos
+    la ingesta encola directamente en lugar de esperar otro timeout.
+    """
+
+    def __init__(self):
+        self._unavailable_until = 0.0
+
+    def mark_unavailable(self) -> None:
+        self._unavailable_until = time.monotonic() + get_spool_config()["COOLDOWN"]
+
+    def mark_available(self) -> None:
+        self._unavailable_until = 0.0
+
+    def is_available(self) -> bool:
+        return time.monotonic() >= self._unavailable_until
+
+
+db_health = DatabaseHealth()
+
+
+class SpooledSubmission(NamedTuple):
+    seq: int
+    scope: str
+    key: str
+    request_hash: Optional[str]
+    form_id: int
+    data: str
+    validated: bool
+    created_at: datetime.datetime
+
+
+class SubmissionSpool:
+    """
+    Journal local (SQLite en modo WAL, synchronous=FULL) de submissions
+    aceptadas mientras DB2 no responde. Un append está en disco al volver,
+    así que un reinicio del worker no pierde nada; el drenador las pasa a
+    FORMSUBMISSION en orden de llegada.
+
+    Cada entrada lleva una clave (la Idempotency-Key del cliente o un uuid)
+    que el drenador registra en IDEMPOTENCY_KEY en la misma transacción que
+    el INSERT: si muere antes de borrar la entrada del spool, el siguiente
+    intento la reconoce como ya insertada.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or get_spool_config()["PATH"]
+        self._initialized = False
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Una conexión por operación: sqlite3 no comparte conexiones entre hilos
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA synchronous=FULL")
+        if not self._initialized:
+            with self._lock:
+                if not self._initialized:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(SCHEMA)
+                    self._initialized = True
+        return conn
+
+    def _ensure_directory(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+    def append(
+        self,
+        form_id: int,
+        data: Dict[str, Any],
+        validated: bool,
+        key: Optional[str] = None,
+        scope: str = SPOOL_SCOPE,
+        request_hash: Optional[str] = None,
+    ) -> Tuple[int, bool]:
+        """
+        Guarda la submission y devuelve (seq, creada). Un reintento con la
+        misma clave devuelve la entrada existente (creada=False), o lanza
+        IdempotencyKeyReused si el contenido es otro.
+        """
+        self._ensure_directory()
+        key = key or uuid.uuid4().hex
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                """INSERT INTO spooled_submission
+                (scope, key, request_hash, form_id, data, validated, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                [
+                    scope,
+                    key,
+                    request_hash,
+                    int(form_id),
+                    encode_submission_data(data),
+                    int(validated),
+                    timezone.now().isoformat(),
+                ],
+            )
+            return cursor.lastrowid, True
+        except sqlite3.IntegrityError:
+            pass
+        finally:
+            conn.close()
+        return self.find(scope, key, request_hash), False
+
+    def find(self, scope: str, key: str, request_hash: Optional[str] = None) -> Optional[int]:
+        """seq de la entrada con esa clave (IdempotencyKeyReused si el contenido es otro)"""
+        if not os.path.exists(self.path):
+            return None
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT seq, request_hash FROM spooled_submission WHERE scope = ? AND key = ?",
+                [scope, key],
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        if row[1] != request_hash:
+            raise IdempotencyKeyReused()
+        return row[0]
+
+    def pending(self, limit: int) -> List[SpooledSubmission]:
+        if not os.path.exists(self.path):
+            return []
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                """SELECT seq, scope, key, request_hash, form_id, data, validated, created_at
+                FROM spooled_submission WHERE status = 'pending'
+                ORDER BY seq LIMIT ?""",
+                [int(limit)],
+            ).fetchall()
+        finally:
+            conn.close()
+        return [
+            SpooledSubmission(
+                seq, scope, key, request_hash, form_id, data, bool(validated),
+                datetime.datetime.fromisoformat(created_at),
+            )
+            for seq, scope, key, request_hash, form_id, data, validated, created_at in rows
+        ]
+
+    def remove(self, seqs: Sequence[int]) -> None:
+        if not seqs:
+            return
+        conn = self._connect()
+        try:
+            conn.execute(
+                f"DELETE FROM spooled_submission WHERE seq IN ({', '.join('?' for _ in seqs)})",
+                list(seqs),
+            )
+        finally:
+            conn.close()
+
+    def reject(self, seq: int, error: str) -> None:
+        """Aparta una entrada que no se puede insertar (queda para revisión manual)"""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE spooled_submission SET status = 'rejected', last_error = ? WHERE seq = ?",
+                [error, seq],
+            )
+        finally:
+            conn.close()
+
+    def counts(self) -> Dict[str, int]:
+        if not os.path.exists(self.path):
+            return {}
+        conn = self._connect()
+        try:
+            return dict(
+                conn.execute(
+                    "SELECT status, COUNT(*) FROM spooled_submission GROUP BY status"
+                ).fetchall()
+            )
+        finally:
+            conn.close()
+
+
+submission_spool = SubmissionSpool()
+
+
+class DrainStats(NamedTuple):
+    inserted: int
+    duplicates: int
+    rejected: int
+
+
+class SpoolDrainer:
+    """
+    Pasa las entradas del spool a FORMSUBMISSION por lotes, en orden de
+    llegada. Las que se encolaron sin validar (DB2 caído al resolver el
+    formulario) se validan aquí; las inválidas se apartan como "rejected".
+    Los webhooks de las submissions insertadas se encolan al terminar cada lote.
+    """
+
+    def __init__(
+        self,
+        spool: Optional[SubmissionSpool] = None,
+        service: Optional[SubmissionService] = None,
+        batch_size: Optional[int] = None,
+        log: Optional[Callable[[str], None]] = None,
+    ):
+        self.spool = spool or submission_spool
+        self.service = service or SubmissionService()
+        self.batch_size = batch_size or get_spool_config()["DRAIN_BATCH_SIZE"]
+        self.log = log or logger.info
+
+    def drain(self, max_batches: Optional[int] = None) -> DrainStats:
+        inserted = duplicates = rejected = batches = 0
+        while max_batches is None or batches < max_batches:
+            entries = self.spool.pending(self.batch_size)
+            if not entries:
+                break
+            with versions_snapshot():
+                stats = self.drain_batch(entries)
+            inserted += stats.inserted
+            duplicates += stats.duplicates
+            rejected += stats.rejected
+            batches += 1
+            self.log(
+                f"Spool: {inserted} insertadas, {duplicates} duplicadas, "
+                f"{rejected} rechazadas (hasta seq {entries[-1].seq})"
+            )
+        return DrainStats(inserted, duplicates, rejected)
+
+    def drain_batch(self, entries: List[SpooledSubmission]) -> DrainStats:
+        ready = []
+        rejected = 0
+        for entry in entries:
+            try:
+                form = self.service.resolve_form(entry.form_id)
+                data = entry.data
+                if not entry.validated:
+                    data = encode_submission_data(
+                        self.service.validate(form, json.loads(entry.data))
+                    )
+            except FormNotFound:
+                self.spool.reject(entry.seq, "Formulario no encontrado")
+                rejected += 1
+                continue
+            except SubmissionValidationError as e:
+                self.spool.reject(entry.seq, json.dumps(e.errors))
+                rejected += 1
+                continue
+            ready.append((entry, form, data))
+
+        if not ready:
+            return DrainStats(0, 0, rejected)
+
+        try:
+            fresh, submissions = self._insert(ready)
+        except Exception as e:
+            if is_database_unavailable(e):
+                raise
+            # Un error de datos (p.ej. un formulario borrado después de
+            # resolve_form) no debe bloquear el spool: el lote se reintenta
+            # entrada por entrada y se aparta la que falle
+            self.log(f"Spool: el lote falló ({e}); se reintenta entrada por entrada")
+            fresh, submissions, ready, failed = self._insert_each(ready)
+            rejected += failed
+
+        self._finish(ready, submissions)
+        return DrainStats(len(fresh), len(ready) - len(fresh), rejected)
+
+    def _insert(self, ready) -> Tuple[list, List[FormSubmission]]:
+        """
+        Inserta las entradas (entry, form, data) en una transacción; devuelve
+        las que no estaban ya insertadas y sus submissions.
+        """
+        expires_at = timezone.now() + datetime.timedelta(seconds=get_idempotency_config()["TTL_SECONDS"])
+        with transaction.atomic():
+            # Con submission_id = ya insertada por un intento anterior; sin él es
+            # la reserva de la petición original (en proceso o con la respuesta
+            # 202 del spool), que se reemplaza por la definitiva
+            existing = {
+                (scope, key): (pk, submission_id)
+                for pk, scope, key, submission_id in IdempotencyKey.objects.filter(
+                    scope__in={entry.scope for entry, _, _ in ready},
+                    key__in=[entry.key for entry, _, _ in ready],
+                ).values_list("id", "scope", "key", "submission_id")
+            }
+            fresh = []
+            stale_ids = []
+            for item in ready:
+                record = existing.get((item[0].scope, item[0].key))
+                if record is None or record[1] is None:
+                    fresh.append(item)
+                    if record is not None:
+                        stale_ids.append(record[0])
+            if stale_ids:
+                IdempotencyKey.objects.filter(id__in=stale_ids).delete()
+
+            ids = self.service.insert(
+                [(form.id, data, entry.created_at) for entry, form, data in fresh],
+                [data for _, _, data in fresh],
+            )
+            submissions = [
+                SubmissionService.build_submission(submission_id, form, data, entry.created_at)
+                for (entry, form, data), submission_id in zip(fresh, ids)
+            ]
+            IdempotencyKey.objects.bulk_create(
+                [
+                    IdempotencyKey(
+                        scope=entry.scope,
+                        key=entry.key,
+                        request_hash=entry.request_hash or "",
+                        status="completed",
+                        response_status=201,
+                        response_body=json.dumps(SubmissionService.to_representation(submission)),
+                        submission_id=submission.id,
+                        expires_at=expires_at,
+                    )
+                    for (entry, _, _), submission in zip(fresh, submissions)
+                ]
+            )
+
+        return fresh, submissions
+
+    def _insert_each(self, ready):
+        """
+        Inserta cada entrada en su propia transacción y aparta (reject) las
+        que fallan; devuelve (nuevas, submissions, insertadas, rechazadas).
+        """
+        fresh, submissions, done = [], [], []
+        failed = 0
+        try:
+            for item in ready:
+                try:
+                    item_fresh, item_submissions = self._insert([item])
+                except Exception as e:
+                    if is_database_unavailable(e):
+                        raise
+                    self.spool.reject(item[0].seq, f"Error al insertar: {e}")
+                    failed += 1
+                    continue
+                fresh.extend(item_fresh)
+                submissions.extend(item_submissions)
+                done.append(item)
+        except Exception:
+            # DB2 dejó de responder a mitad: las ya insertadas salen del spool
+            self._finish(done, submissions)
+            raise
+        return fresh, submissions, done, failed
+
+    def _finish(self, done, submissions: List[FormSubmission]) -> None:
+        self.spool.remove([entry.seq for entry, _, _ in done])
+        enqueue_submissions(submissions)
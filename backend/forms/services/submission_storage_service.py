@@ -0,0 +1,106 @@
+import logging
+import time
+from typing import Callable, Optional
+
+from django.db import transaction
+from forms.models.forms import FormSubmission
+from forms.repositories.archive_repository import ArchiveRepository
+from forms.repositories.submission_repository import SubmissionRepository
+from forms.utils.submission_codec import CODECS, get_storage_config, pack, unpack
+
+logger = logging.getLogger("forms")
+
+
+class SubmissionStorageMigrator:
+    """
+    Pasa submissions existentes entre DATA (texto) y DATA_BLOB (comprimido)
+    por lotes de IDs, con una transacción por lote. Solo toma las filas que
+    aún están en el formato de origen, así que se puede interrumpir y volver
+    a lanzar sin reprocesar lo ya migrado.
+    """
+
+    def __init__(
+        self,
+        codec: Optional[str] = None,
+        decompress: bool = False,
+        batch_size: int = 500,
+        pause: float = 0.0,
+        repository: Optional[SubmissionRepository] = None,
+        id_repository: Optional[ArchiveRepository] = None,
+        log: Optional[Callable[[str], None]] = None,
+    ):
+        self.config = get_storage_config()
+        if codec:
+            self.config["CODEC"] = codec
+        if self.config["CODEC"] not in CODECS:
+            raise ValueError(f"Códec no válido: {self.config['CODEC']}. Disponibles: {CODECS}")
+        if not decompress and self.config["CODEC"] == "json":
+            raise ValueError("Para comprimir hace falta un códec zlib o zstd")
+
+        self.decompress = decompress
+        self.batch_size = batch_size
+        self.pause = pause
+        self.repository = repository or SubmissionRepository()
+        self.id_repository = id_repository or ArchiveRepository()
+        self.log = log or logger.info
+
+    def _where(self, form_id: Optional[int]):
+        if self.decompress:
+            where_sql, params = '"DATA_BLOB" IS NOT NULL', []
+        else:
+            where_sql = '"DATA_BLOB" IS NULL AND LENGTH("DATA") >= ?'
+            params = [self.config["MIN_BYTES"]]
+        if form_id is not None:
+            where_sql += ' AND "FORM_ID" = ?'
+            params.append(form_id)
+        return where_sql, params
+
+    def _convert(self, data, data_blob):
+        if self.decompress:
+            return unpack(data, data_blob), None
+        return pack(data, self.config)
+
+    def run(
+        self,
+        form_id: Optional[int] = None,
+        after_id: int = 0,
+        max_batches: Optional[int] = None,
+    ) -> int:
+        table = FormSubmission._meta.db_table
+        where_sql, params = self._where(form_id)
+        processed = batches = 0
+        bytes_before = bytes_after = 0
+
+        while max_batches is None or batches < max_batches:
+            ids = self.id_repository.select_ids(
+                table, where_sql, params, self.batch_size, after_id=after_id
+            )
+            if not ids:
+                break
+
+            rows = []
+            for submission_id, data, data_blob in self.repository.fetch_storage(ids):
+                new_data, new_blob = self._convert(data, data_blob)
+                bytes_before += _size(data, data_blob)
+                bytes_after += _size(new_data, new_blob)
+                rows.append((submission_id, new_data, new_blob))
+
+            with transaction.atomic():
+                self.repository.update_storage(rows)
+
+            processed += len(ids)
+            batches += 1
+            after_id = ids[-1]
+            self.log(
+                f"{processed} submissions migradas (hasta ID {after_id}); "
+                f"{bytes_before} → {bytes_after} bytes"
+            )
+            if self.pause:
+                time.sleep(self.pause)
+        return processed
+
+
+def _size(data, data_blob) -> int:
+    if data_blob is not None:
+        return len(data_blob)
+    return len(data.encode("utf-8")) if data else 0
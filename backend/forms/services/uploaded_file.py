@@ -25,6 +25,16 @@ class UploadedFile:
 
         return file_urls
 
+    def delete_uploaded_files(self, file_urls):
+        """
+        Borra archivos subidos con handle_uploaded_files a partir de sus URLs
+        (p.ej. si la submission no se llegó a guardar).
+        """
+        for url in file_urls:
+            name = url.rsplit(settings.MEDIA_URL, 1)[-1]
+            if name and default_storage.exists(name):
+                default_storage.delete(name)
+
     def build_absolute_url(self, file_path, request=None):
         """
         Construye la URL absoluta con HTTPS para el archivo.
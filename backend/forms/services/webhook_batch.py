@@ -0,0 +1,170 @@
+"""
+Entrega en batch para webhooks que aceptan arrays. Con
+WebhookConfig.config["batch"] = {"max_items": 50, "max_wait_ms": 1000} las
+submissions del webhook se acumulan y se envían en un solo POST con un
+array JSON (un elemento por submission, con el mismo cuerpo que tendría la
+entrega individual) cuando se juntan max_items o pasan max_wait_ms desde la
+primera. "batch": true usa los valores por defecto.
+
+El buffer es por proceso (worker), pero cada submission entra con su task
+log ya creado en "pending": si el worker muere antes de enviar el batch la
+entrega queda visible en SUBMISSION_TASK_LOG y se puede reintentar. Al
+apagar el worker (gunicorn.conf.py) o el drenador del spool se envía lo
+acumulado con drain_deliveries().
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from forms.models.forms import FormSubmission, WebhookConfig
+from forms.services.webhook_delivery import delivery_queue
+from forms.services.webhook_payload import SubmissionPayload
+
+DEFAULT_MAX_ITEMS = 50
+DEFAULT_MAX_WAIT_MS = 1000
+# Tope de max_items: el INSERT de task logs y el cuerpo del POST crecen con él
+MAX_ITEMS_LIMIT = 1000
+
+# (submission, payload, id del task log "pending")
+BatchEntry = Tuple[FormSubmission, SubmissionPayload, int]
+
+
+class BatchConfig:
+    """Config de batch compilada desde WebhookConfig.config"""
+
+    def __init__(self, config: Dict[str, Any]):
+        batch = config.get("batch")
+        self.enabled = bool(batch)
+        self.max_items = DEFAULT_MAX_ITEMS
+        self.max_wait_ms = DEFAULT_MAX_WAIT_MS
+        if not batch or batch is True:
+            return
+        if not isinstance(batch, dict):
+            raise ValueError('batch debe ser true o un objeto {"max_items": n, "max_wait_ms": n}')
+
+        for key, minimum in (("max_items", 1), ("max_wait_ms", 0)):
+            value = batch.get(key, getattr(self, key))
+            if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+                raise ValueError(f"batch.{key} debe ser un entero mayor o igual que {minimum}")
+            setattr(self, key, value)
+        if self.max_items > MAX_ITEMS_LIMIT:
+            raise ValueError(f"batch.max_items no puede pasar de {MAX_ITEMS_LIMIT}")
+
+
+class WebhookBatcher:
+    """
+    Buffer de un webhook. El batch sale a delivery_queue al llegar a
+    max_items o cuando vence el temporizador que arranca con su primera
+    submission; cada batch lleva un número para que un temporizador viejo no
+    envíe el siguiente antes de tiempo.
+    """
+
+    def __init__(self, webhook_id: int, config: BatchConfig, queue=None):
+        self.webhook_id = webhook_id
+        self.config = config
+        self.queue = queue or delivery_queue
+        self._lock = threading.Lock()
+        self._webhook: Optional[WebhookConfig] = None
+        self._entries: List[BatchEntry] = []
+        self._generation = 0
+        # Batch para el que ya corre un temporizador
+        self._timer_generation = -1
+
+    def add(self, webhook: WebhookConfig, entries: List[BatchEntry]) -> None:
+        ready = []
+        start_timer = False
+        with self._lock:
+            self._webhook = webhook
+            for entry in entries:
+                self._entries.append(entry)
+                if len(self._entries) >= self.config.max_items:
+                    ready.append(self._take())
+            if self._entries and self._timer_generation != self._generation:
+                self._timer_generation = self._generation
+                start_timer = True
+            generation = self._generation
+
+        for batch in ready:
+            self.queue.submit(self.deliver, *batch)
+        if start_timer:
+            self.queue.schedule(self.config.max_wait_ms / 1000, self._flush_expired, generation)
+
+    def _take(self) -> Tuple[WebhookConfig, List[BatchEntry]]:
+        entries, self._entries = self._entries, []
+        self._generation += 1
+        return self._webhook, entries
+
+    def _flush_expired(self, generation: int) -> None:
+        # Corre ya en un hilo de delivery_queue: entrega aquí mismo
+        with self._lock:
+            if generation != self._generation or not self._entries:
+                return
+            ready = self._take()
+        self.deliver(*ready)
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._entries:
+                return
+            ready = self._take()
+        self.queue.submit(self.deliver, *ready)
+
+    @property
+    def buffered(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def deliver(webhook: WebhookConfig, entries: List[BatchEntry]):
+        from forms.listeners.webhook_listeners import process_webhook_batch
+
+        return process_webhook_batch(webhook, entries)
+
+
+class WebhookBatcherRegistry:
+    """Batcher por webhook, guardado junto con el texto de config (como TransformCache)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._batchers: Dict[int, Tuple[str, Optional[WebhookBatcher]]] = {}
+
+    def get(self, webhook: WebhookConfig) -> Optional[WebhookBatcher]:
+        """None si el webhook no entrega en batch"""
+        entry = self._batchers.get(webhook.id)
+        if entry is not None and entry[0] == webhook.config:
+            return entry[1]
+
+        config = BatchConfig(webhook.config_dict)
+        batcher = WebhookBatcher(webhook.id, config) if config.enabled else None
+        with self._lock:
+            entry = self._batchers.get(webhook.id)
+            if entry is not None and entry[0] == webhook.config:
+                return entry[1]
+            previous = entry[1] if entry is not None else None
+            self._batchers[webhook.id] = (webhook.config, batcher)
+        if previous is not None:
+            # Lo acumulado con la config anterior sale ya
+            previous.flush()
+        return batcher
+
+    def flush(self) -> None:
+        """Envía todos los buffers (p.ej. antes de apagar el worker)"""
+        with self._lock:
+            batchers = [b for _, b in self._batchers.values() if b is not None]
+        for batcher in batchers:
+            batcher.flush()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._batchers.clear()
+
+
+webhook_batchers = WebhookBatcherRegistry()
+
+
+def drain_deliveries() -> None:
+    """
+    Envía los batches a medio juntar y espera a las entregas encoladas;
+    se llama al apagar el worker o el drenador del spool.
+    """
+    webhook_batchers.flush()
+    delivery_queue.shutdown(wait=True)
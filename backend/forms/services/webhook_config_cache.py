@@ -0,0 +1,78 @@
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from forms.models.forms import WebhookConfig
+from forms.utils.cache_versions import bump_version, get_version
+
+# Contador de versión de las configuraciones de webhooks: cualquier alta,
+# cambio o baja de un WebhookConfig lo incrementa.
+WEBHOOK_CONFIGS = "webhook_configs"
+
+
+class WebhookConfigCache:
+    """
+    Webhooks activos por formulario, guardados con la versión de
+    WEBHOOK_CONFIGS con la que se leyeron. Las instancias se comparten entre
+    submissions (y hilos de delivery_queue) y se tratan como de solo
+    lectura; headers_dict / config_dict se decodifican una vez por instancia.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._webhooks: Dict[int, Tuple[WebhookConfig, ...]] = {}
+
+    def get(self, form_id: int) -> List[WebhookConfig]:
+        return self.get_many([form_id]).get(form_id, [])
+
+    def get_many(self, form_ids: Iterable[int]) -> Dict[int, List[WebhookConfig]]:
+        form_ids = set(form_ids)
+        version = get_version(WEBHOOK_CONFIGS)
+        with self._lock:
+            if self._version != version:
+                self._webhooks = {}
+                self._version = version
+            cached = {form_id: self._webhooks[form_id] for form_id in form_ids if form_id in self._webhooks}
+
+        missing = form_ids - set(cached)
+        if missing:
+            loaded: Dict[int, List[WebhookConfig]] = {form_id: [] for form_id in missing}
+            for webhook in WebhookConfig.objects.filter(form_id__in=missing, is_active=True).order_by("id"):
+                # Decodificar headers/config aquí y no en cada entrega
+                webhook.headers_dict
+                webhook.config_dict
+                loaded[webhook.form_id].append(webhook)
+            with self._lock:
+                # Si la versión cambió mientras se leía, no guardar lo leído
+                if self._version == version:
+                    for form_id, webhooks in loaded.items():
+                        self._webhooks[form_id] = tuple(webhooks)
+            cached.update({form_id: tuple(webhooks) for form_id, webhooks in loaded.items()})
+
+        return {form_id: list(webhooks) for form_id, webhooks in cached.items() if webhooks}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._webhooks = {}
+            self._version = None
+
+
+webhook_config_cache = WebhookConfigCache()
+
+
+def invalidate_webhook_configs() -> None:
+    """
+    Sube la versión al confirmar la transacción: si se subiera antes, otro
+    worker podría volver a leer y cachear la configuración anterior con la
+    versión nueva.
+    """
+    transaction.on_commit(lambda: bump_version(WEBHOOK_CONFIGS))
+
+
+@receiver(post_save, sender=WebhookConfig)
+@receiver(post_delete, sender=WebhookConfig)
+def webhook_config_changed(sender, **kwargs):
+    invalidate_webhook_configs()
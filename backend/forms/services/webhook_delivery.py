@@ -0,0 +1,163 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+from forms.models.forms import FormSubmission, WebhookConfig
+from forms.services.webhook_config_cache import webhook_config_cache
+from forms.services.webhook_payload import SubmissionPayload
+
+logger = logging.getLogger("forms")
+
+DEFAULTS = {
+    "MAX_WORKERS": 4,
+}
+
+
+def get_delivery_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "WEBHOOK_DELIVERY", {}) or {})
+    return config
+
+
+class WebhookDeliveryQueue:
+    """
+    Cola en segundo plano (hilos del propio worker) para entregar webhooks
+    sin bloquear la petición que creó las submissions. Cada tarea usa su
+    propia conexión a DB2 y la cierra al terminar.
+
+    Al reciclar o apagar el worker se espera a las tareas encoladas
+    (drain_deliveries en gunicorn.conf.py); si muere sin apagarse se
+    pierden y el task log queda en "running" (o "pending" si estaba
+    aplazada con schedule o en un batch) y se puede reintentar desde ahí.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        # Tareas aplazadas: un solo hilo las pasa al executor cuando vencen
+        self._delayed: List[Tuple[float, int, Callable, tuple, dict]] = []
+        self._delayed_seq = itertools.count()
+        self._delayed_cond = threading.Condition()
+        self._scheduler: Optional[threading.Thread] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers or get_delivery_config()["MAX_WORKERS"],
+                        thread_name_prefix="webhook-delivery",
+                    )
+        return self._executor
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        return self._get_executor().submit(self._run, fn, *args, **kwargs)
+
+    def schedule(self, delay: float, fn: Callable, *args, **kwargs) -> None:
+        """Encola fn dentro de delay segundos (p.ej. con el circuito abierto)"""
+        with self._delayed_cond:
+            heapq.heappush(
+                self._delayed,
+                (time.monotonic() + delay, next(self._delayed_seq), fn, args, kwargs),
+            )
+            if self._scheduler is None:
+                self._scheduler = threading.Thread(
+                    target=self._run_scheduler, name="webhook-delivery-scheduler", daemon=True
+                )
+                self._scheduler.start()
+            self._delayed_cond.notify()
+
+    @property
+    def delayed_count(self) -> int:
+        return len(self._delayed)
+
+    def _run_scheduler(self) -> None:
+        current = threading.current_thread()
+        while True:
+            with self._delayed_cond:
+                if self._scheduler is not current:
+                    return
+                if not self._delayed:
+                    self._delayed_cond.wait()
+                    continue
+                wait = self._delayed[0][0] - time.monotonic()
+                if wait > 0:
+                    self._delayed_cond.wait(wait)
+                    continue
+                _, _, fn, args, kwargs = heapq.heappop(self._delayed)
+            self.submit(fn, *args, **kwargs)
+
+    @staticmethod
+    def _run(fn: Callable, *args, **kwargs):
+        close_old_connections()
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            logger.exception("Error entregando webhook en segundo plano")
+        finally:
+            connections.close_all()
+
+    def shutdown(self, wait: bool = True) -> None:
+        # Las tareas aplazadas que no vencieron se descartan
+        with self._delayed_cond:
+            self._scheduler = None
+            self._delayed.clear()
+            self._delayed_cond.notify_all()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+delivery_queue = WebhookDeliveryQueue()
+
+
+def active_webhooks_by_form(form_ids: Iterable[int]) -> Dict[int, List[WebhookConfig]]:
+    return webhook_config_cache.get_many(form_ids)
+
+
+def enqueue_submissions(submissions: List[FormSubmission]) -> List[Future]:
+    """
+    Encola las entregas de todas las submissions con una sola consulta de
+    webhooks. Las de webhooks con "batch" se juntan por webhook para crear
+    sus task logs con un solo INSERT.
+    """
+    from forms.listeners.webhook_listeners import buffer_for_batch, process_webhook_sync
+    from forms.services.webhook_batch import webhook_batchers
+
+    if not submissions:
+        return []
+
+    webhooks = active_webhooks_by_form(s.form_id for s in submissions)
+    futures = []
+    batched = {}
+    for submission in submissions:
+        form_webhooks = webhooks.get(submission.form_id, ())
+        if not form_webhooks:
+            continue
+        # Un cuerpo por submission, compartido por las entregas de sus webhooks
+        payload = SubmissionPayload(submission)
+        for webhook in form_webhooks:
+            try:
+                batcher = webhook_batchers.get(webhook)
+            except ValueError:
+                # process_webhook_sync registra el error de config en el task log
+                batcher = None
+            if batcher is None:
+                futures.append(
+                    delivery_queue.submit(process_webhook_sync, webhook, submission, payload)
+                )
+            else:
+                entries = batched.setdefault(webhook.id, (batcher, webhook, []))[2]
+                entries.append((submission, payload))
+
+    for batcher, webhook, entries in batched.values():
+        futures.append(delivery_queue.submit(buffer_for_batch, batcher, webhook, entries))
+    return futures
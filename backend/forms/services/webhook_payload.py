@@ -0,0 +1,154 @@
+"""
+Cuerpo de las llamadas a webhooks. El JSON de una submission se decodifica
+y codifica una sola vez y los bytes resultantes se comparten entre todos los
+webhooks que piden el mismo cuerpo.
+
+WebhookConfig.config admite:
+- "payload": "raw" (por defecto, solo los datos del formulario) o "envelope"
+  ({"event_type", "submission_id", "form_id", "form_name", "submitted_at",
+  "data"})
+- "field_map": {"campo_del_formulario": "campo_destino", ...}
+- "include_unmapped": si los campos sin entrada en field_map se envían
+  (por defecto true)
+"""
+
+import json
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from forms.models.forms import FormSubmission, WebhookConfig
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+PAYLOAD_MODES = ("raw", "envelope")
+
+
+def dumps(value: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(value)
+        except TypeError:
+            pass
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class WebhookTransform:
+    """Transformación compilada desde WebhookConfig.config"""
+
+    def __init__(self, config: Dict[str, Any]):
+        mode = config.get("payload") or "raw"
+        if mode not in PAYLOAD_MODES:
+            raise ValueError(f"payload no válido: {mode}. Disponibles: {PAYLOAD_MODES}")
+
+        field_map = config.get("field_map") or {}
+        if not isinstance(field_map, dict):
+            raise ValueError("field_map debe ser un objeto {campo: destino}")
+
+        self.mode = mode
+        self.field_map: Tuple[Tuple[str, str], ...] = tuple(
+            (str(source), str(target)) for source, target in field_map.items()
+        )
+        self.include_unmapped = bool(config.get("include_unmapped", True))
+        # Webhooks con la misma clave reciben los mismos bytes
+        self.key = (self.mode, self.field_map, self.include_unmapped)
+
+    @property
+    def is_identity(self) -> bool:
+        """Envía DATA tal cual está guardado, sin decodificarlo"""
+        return self.mode == "raw" and not self.field_map
+
+    def map_fields(self, data: Any) -> Any:
+        if not self.field_map or not isinstance(data, dict):
+            return data
+        mapped = dict(self.field_map)
+        result = {}
+        for name, value in data.items():
+            target = mapped.get(name)
+            if target is not None:
+                result[target] = value
+            elif self.include_unmapped:
+                result[name] = value
+        return result
+
+    def apply(self, submission: FormSubmission, data: Any) -> Any:
+        data = self.map_fields(data)
+        if self.mode == "raw":
+            return data
+        return {
+            "event_type": "form_submission",
+            "submission_id": submission.id,
+            "form_id": submission.form_id,
+            "form_name": submission.form.name,
+            "submitted_at": submission.created_at.isoformat() if submission.created_at else None,
+            "data": data,
+        }
+
+
+IDENTITY = WebhookTransform({})
+
+
+class TransformCache:
+    """
+    Transformaciones compiladas por webhook, guardadas junto con el texto de
+    config del que salieron: si la config cambia se vuelve a compilar.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._transforms: Dict[int, Tuple[str, WebhookTransform]] = {}
+
+    def get(self, webhook: WebhookConfig) -> WebhookTransform:
+        entry = self._transforms.get(webhook.id)
+        if entry is not None and entry[0] == webhook.config:
+            return entry[1]
+
+        transform = WebhookTransform(webhook.config_dict)
+        with self._lock:
+            self._transforms[webhook.id] = (webhook.config, transform)
+        return transform
+
+    def clear(self) -> None:
+        with self._lock:
+            self._transforms.clear()
+
+
+transform_cache = TransformCache()
+
+
+class SubmissionPayload:
+    """
+    Cuerpos de una submission para sus webhooks. DATA se decodifica como
+    mucho una vez y cada cuerpo distinto se codifica una vez; las entregas
+    en paralelo (delivery_queue) comparten la misma instancia.
+    """
+
+    def __init__(self, submission: FormSubmission):
+        self.submission = submission
+        self._lock = threading.Lock()
+        self._data: Optional[Any] = None
+        self._bodies: Dict[tuple, bytes] = {}
+
+    @property
+    def data(self) -> Any:
+        if self._data is None:
+            self._data = json.loads(self.submission.data or "{}")
+        return self._data
+
+    def body_for(self, transform: WebhookTransform) -> bytes:
+        body = self._bodies.get(transform.key)
+        if body is not None:
+            return body
+
+        with self._lock:
+            body = self._bodies.get(transform.key)
+            if body is None:
+                if transform.is_identity:
+                    # DATA ya es JSON compacto: se envía sin volver a codificarlo
+                    body = (self.submission.data or "{}").encode("utf-8")
+                else:
+                    body = dumps(transform.apply(self.submission, self.data))
+                self._bodies[transform.key] = body
+        return body
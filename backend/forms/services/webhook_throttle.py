@@ -0,0 +1,210 @@
+"""
+Límites de entrega por webhook, configurados en WebhookConfig.config:
+- "rate_limit": {"rate": 5, "burst": 10}: token bucket de `rate` llamadas
+  por segundo con ráfagas de hasta `burst` (por defecto ceil(rate))
+- "max_in_flight": llamadas simultáneas como máximo al webhook
+
+Las entregas que superan algún límite no se descartan: quedan en una cola
+FIFO por webhook y se pasan a delivery_queue cuando hay un token y un hueco
+libre. Los límites y la cola son por proceso (worker).
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from forms.models.forms import WebhookConfig
+from forms.services.webhook_delivery import delivery_queue
+
+
+class WebhookLimits:
+    """Límites compilados desde WebhookConfig.config"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.rate: Optional[float] = None
+        self.burst: Optional[int] = None
+        self.max_in_flight: Optional[int] = None
+
+        rate_limit = config.get("rate_limit")
+        if rate_limit is not None:
+            if not isinstance(rate_limit, dict):
+                raise ValueError('rate_limit debe ser un objeto {"rate": n, "burst": n}')
+            try:
+                self.rate = float(rate_limit["rate"])
+                self.burst = int(rate_limit.get("burst") or math.ceil(self.rate))
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("rate_limit.rate y rate_limit.burst deben ser números")
+            if self.rate <= 0 or self.burst < 1:
+                raise ValueError("rate_limit.rate debe ser mayor que 0 y burst al menos 1")
+
+        max_in_flight = config.get("max_in_flight")
+        if max_in_flight is not None:
+            if isinstance(max_in_flight, bool) or not isinstance(max_in_flight, int) or max_in_flight < 1:
+                raise ValueError("max_in_flight debe ser un entero mayor que 0")
+            self.max_in_flight = max_in_flight
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate is not None or self.max_in_flight is not None
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self) -> float:
+        """Segundos hasta que haya un token (0 si ya hay)"""
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> bool:
+        if self.wait_time() > 0:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class WebhookThrottle:
+    """
+    Token bucket, llamadas en curso y cola de entregas en espera de un
+    webhook. acquire() reserva token y hueco para llamar ya; si no se puede,
+    enqueue() deja la entrega en la cola y la cola se vacía sola al liberar
+    huecos (release) o al reponerse los tokens.
+    """
+
+    def __init__(self, webhook_id: int, limits: WebhookLimits, clock=time.monotonic, queue=None):
+        self.webhook_id = webhook_id
+        self.limits = limits
+        self.bucket = TokenBucket(limits.rate, limits.burst, clock) if limits.rate else None
+        self.queue = queue or delivery_queue
+        self._lock = threading.Lock()
+        self._pending: Deque[Tuple[Callable, tuple]] = deque()
+        self._drain_scheduled = False
+        self.in_flight = 0
+        self.throttled = 0
+        self.delivered = 0
+
+    def _can_start(self) -> float:
+        """0 si hay hueco y token; si no, segundos de espera (inf: sin hueco)"""
+        if self.limits.max_in_flight is not None and self.in_flight >= self.limits.max_in_flight:
+            return math.inf
+        return self.bucket.wait_time() if self.bucket is not None else 0.0
+
+    def _start(self) -> None:
+        if self.bucket is not None:
+            self.bucket.take()
+        self.in_flight += 1
+
+    def acquire(self) -> bool:
+        with self._lock:
+            # Con entregas ya en cola, las nuevas esperan su turno
+            if self._pending or self._can_start() > 0:
+                return False
+            self._start()
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            self.delivered += 1
+        self._drain()
+
+    def enqueue(self, fn: Callable, *args) -> None:
+        with self._lock:
+            self._pending.append((fn, args))
+            self.throttled += 1
+        self._drain()
+
+    def _drain(self) -> None:
+        ready: List[Tuple[Callable, tuple]] = []
+        delay = None
+        with self._lock:
+            while self._pending:
+                wait = self._can_start()
+                if wait > 0:
+                    # Sin hueco: lo reanuda release(); sin token: un temporizador
+                    if wait != math.inf and not self._drain_scheduled:
+                        self._drain_scheduled = True
+                        delay = wait
+                    break
+                self._start()
+                ready.append(self._pending.popleft())
+
+        for fn, args in ready:
+            self.queue.submit(self._run_reserved, fn, args)
+        if delay is not None:
+            self.queue.schedule(delay, self._scheduled_drain)
+
+    def _scheduled_drain(self) -> None:
+        with self._lock:
+            self._drain_scheduled = False
+        self._drain()
+
+    def _run_reserved(self, fn: Callable, args: tuple):
+        try:
+            return fn(*args)
+        finally:
+            self.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "webhook_id": self.webhook_id,
+                "rate": self.limits.rate,
+                "burst": self.limits.burst,
+                "max_in_flight": self.limits.max_in_flight,
+                "in_flight": self.in_flight,
+                "queued": len(self._pending),
+                "throttled": self.throttled,
+                "delivered": self.delivered,
+            }
+
+
+class WebhookThrottleRegistry:
+    """
+    Throttle por webhook, guardado junto con el texto de config del que
+    salió (como TransformCache). Si cambian los límites se crea uno nuevo; el
+    anterior termina de vaciar su propia cola.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._throttles: Dict[int, Tuple[str, Optional[WebhookThrottle]]] = {}
+
+    def get(self, webhook: WebhookConfig) -> Optional[WebhookThrottle]:
+        """None si el webhook no tiene límites"""
+        entry = self._throttles.get(webhook.id)
+        if entry is not None and entry[0] == webhook.config:
+            return entry[1]
+
+        limits = WebhookLimits(webhook.config_dict)
+        throttle = WebhookThrottle(webhook.id, limits) if limits.enabled else None
+        with self._lock:
+            entry = self._throttles.get(webhook.id)
+            if entry is not None and entry[0] == webhook.config:
+                return entry[1]
+            self._throttles[webhook.id] = (webhook.config, throttle)
+        return throttle
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            throttles = [t for _, t in self._throttles.values() if t is not None]
+        return sorted((t.snapshot() for t in throttles), key=lambda s: s["webhook_id"])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._throttles.clear()
+
+
+webhook_throttles = WebhookThrottleRegistry()
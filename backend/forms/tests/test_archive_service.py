@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+from forms.models.forms import Form
+from forms.services.archive_service import SubmissionArchiver
+
+
+class FakeRepository:
+    def __init__(self):
+        self.queries = []
+
+    def select_ids(self, table, where_sql, params, limit, after_id=0):
+        self.queries.append((where_sql, params))
+        return []
+
+
+class _Forms(list):
+    def only(self, *fields):
+        return self
+
+    def order_by(self, *fields):
+        return self
+
+
+@override_settings(
+    SUBMISSION_RETENTION={
+        "DEFAULT_DAYS": 365,
+        "TASK_LOG_DAYS": 90,
+        "FORMS": {"conservar": None, "corto": 30},
+    }
+)
+class ArchiveTaskLogsTest(SimpleTestCase):
+    """Tests UNITARIOS de la retención de task logs por formulario - SIN base de datos"""
+
+    def setUp(self):
+        forms = _Forms(
+            [Form(id=1, slug="conservar"), Form(id=2, slug="corto"), Form(id=3, slug="normal")]
+        )
+        patcher = patch("forms.services.archive_service.Form.objects", forms)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.repository = FakeRepository()
+        self.archiver = SubmissionArchiver(repository=self.repository, log=lambda message: None)
+        self.cutoffs = []
+        patcher = patch.object(self.archiver, "_cutoff", side_effect=lambda days: self.cutoffs.append(days))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_politica_por_formulario(self):
+        self.archiver.archive_task_logs()
+
+        self.assertEqual([params[1] for _, params in self.repository.queries], [2, 3])
+        self.assertEqual(self.cutoffs, [30, 90])
+        self.assertIn('"FORM_ID" = ?', self.repository.queries[0][0])
+
+    def test_older_than_days_ignora_las_politicas(self):
+        self.archiver.archive_task_logs(older_than_days=10)
+
+        self.assertEqual([params[1] for _, params in self.repository.queries], [1, 2, 3])
+        self.assertEqual(self.cutoffs, [10, 10, 10])
@@ -0,0 +1,60 @@
+import shutil
+import tempfile
+import threading
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+from forms.utils.cache_versions import bump_version, get_version, versions_snapshot
+
+
+class CacheVersionsTest(SimpleTestCase):
+    """Tests UNITARIOS de los contadores de versión compartidos - SIN base de datos"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        settings = override_settings(
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+                "shared": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": self.directory,
+                    "TIMEOUT": None,
+                },
+            }
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_incrementos_concurrentes_no_se_pierden(self):
+        def bump():
+            for _ in range(25):
+                bump_version("test")
+
+        threads = [threading.Thread(target=bump) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(get_version("test"), 200)
+
+    def test_snapshot_lee_cada_contador_una_vez(self):
+        with versions_snapshot():
+            self.assertEqual(get_version("test"), 0)
+            # Otro worker sube la versión: esta petición sigue con la que leyó
+            caches["shared"].set("version:test", 5, timeout=None)
+            self.assertEqual(get_version("test"), 0)
+            # Salvo que la suba ella misma
+            self.assertEqual(bump_version("test"), 6)
+            self.assertEqual(get_version("test"), 6)
+        caches["shared"].set("version:test", 9, timeout=None)
+        self.assertEqual(get_version("test"), 9)
+
+    def test_sin_cache_shared_falla(self):
+        with override_settings(
+            CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+        ):
+            with self.assertRaises(ImproperlyConfigured):
+                get_version("test")
@@ -0,0 +1,182 @@
+from unittest.mock import patch
+
+import requests
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+from forms.services.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpen,
+    circuit_breakers,
+    guarded_request,
+)
+from forms.views.metrics import CircuitBreakerView
+
+CONFIG = {
+    "ENABLED": True,
+    "WINDOW": 60,
+    "MIN_REQUESTS": 4,
+    "FAILURE_RATE": 0.5,
+    "OPEN_SECONDS": 30,
+    "HALF_OPEN_PROBES": 1,
+    "MAX_DEFERRALS": 3,
+}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CircuitBreakerTest(SimpleTestCase):
+    """Tests UNITARIOS del circuit breaker por host - SIN base de datos"""
+
+    def setUp(self):
+        self.clock = _Clock()
+        self.breaker = CircuitBreaker("hooks.example.com", dict(CONFIG), clock=self.clock)
+
+    def fail(self, times):
+        for _ in range(times):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record(False)
+
+    def test_no_abre_sin_minimo_de_llamadas(self):
+        self.fail(3)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_abre_al_llegar_a_la_tasa_de_fallos(self):
+        self.breaker.record(True)
+        self.breaker.record(True)
+        self.fail(2)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertTrue(self.breaker.is_open())
+        self.assertEqual(self.breaker.retry_after(), 30)
+
+    def test_fallos_viejos_salen_de_la_ventana(self):
+        self.fail(3)
+        self.clock.now += 61
+        self.fail(1)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_semiabierto_deja_una_prueba_y_cierra_si_sale_bien(self):
+        self.fail(4)
+        self.clock.now += 30
+        self.assertFalse(self.breaker.is_open())
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertFalse(self.breaker.allow())
+
+        self.breaker.record(True)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.snapshot()["requests"], 0)
+
+    def test_semiabierto_vuelve_a_abrir_si_la_prueba_falla(self):
+        self.fail(4)
+        self.clock.now += 30
+        self.fail(1)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertEqual(self.breaker.opened_count, 2)
+        self.assertEqual(self.breaker.retry_after(), 30)
+
+    def test_cancel_libera_la_prueba(self):
+        self.fail(4)
+        self.clock.now += 30
+        self.assertTrue(self.breaker.allow())
+        self.breaker.cancel()
+        self.assertTrue(self.breaker.allow())
+
+
+class _Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class GuardedRequestTest(SimpleTestCase):
+    """Tests UNITARIOS de guarded_request - SIN red"""
+
+    def setUp(self):
+        self.registry = CircuitBreakerRegistry()
+        for target, value in (
+            ("circuit_breakers", self.registry),
+            ("get_breaker_config", lambda: dict(CONFIG)),
+        ):
+            patcher = patch(f"forms.services.circuit_breaker.{target}", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_breaker_por_host(self):
+        self.assertIs(
+            self.registry.for_url("https://Hooks.example.com/a"),
+            self.registry.for_url("https://hooks.example.com/b?x=1"),
+        )
+        self.assertIsNot(
+            self.registry.for_url("https://hooks.example.com/a"),
+            self.registry.for_url("https://otro.example.com/a"),
+        )
+
+    @patch("forms.services.circuit_breaker.requests.request")
+    def test_5xx_y_errores_de_conexion_abren_el_circuito(self, request):
+        request.side_effect = [
+            _Response(503),
+            _Response(500),
+            requests.exceptions.ConnectionError(),
+            requests.exceptions.Timeout(),
+        ]
+        url = "https://hooks.example.com/x"
+        guarded_request("POST", url)
+        guarded_request("POST", url)
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.RequestException):
+                guarded_request("POST", url)
+
+        with self.assertRaises(CircuitOpen):
+            guarded_request("POST", url)
+        self.assertEqual(request.call_count, 4)
+        self.assertEqual(self.registry.snapshot()[0]["rejected"], 1)
+
+    @patch("forms.services.circuit_breaker.requests.request")
+    def test_4xx_cuenta_como_exito(self, request):
+        request.return_value = _Response(404)
+        for _ in range(6):
+            guarded_request("GET", "https://hooks.example.com/x")
+        self.assertEqual(self.registry.snapshot()[0]["state"], CLOSED)
+
+
+class CircuitBreakerViewTest(SimpleTestCase):
+    """Tests UNITARIOS del endpoint de estado de los circuitos - SIN base de datos"""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.view = CircuitBreakerView.as_view()
+        circuit_breakers.get("api.example.com")
+        self.addCleanup(circuit_breakers.reset)
+
+    def request(self, method, user=None):
+        request = getattr(self.factory, method)("/api/metrics/circuit-breakers/?reset=1")
+        if user is not None:
+            force_authenticate(request, user=user)
+        return self.view(request)
+
+    def test_solo_staff(self):
+        self.assertEqual(self.request("get").status_code, 403)
+        self.assertEqual(self.request("get", User(username="ana")).status_code, 403)
+        self.assertEqual(self.request("post", User(username="ana")).status_code, 403)
+
+    def test_get_no_reinicia_y_post_si(self):
+        staff = User(username="admin", is_staff=True)
+
+        response = self.request("get", staff)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["data"]), 1)
+        self.assertEqual(len(self.request("get", staff).data["data"]), 1)
+
+        self.assertEqual(len(self.request("post", staff).data["data"]), 1)
+        self.assertEqual(self.request("get", staff).data["data"], [])
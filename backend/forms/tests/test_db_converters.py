@@ -0,0 +1,174 @@
+import datetime
+import decimal
+import os
+import struct
+import unittest
+
+from django.db import connection
+from django.test import SimpleTestCase
+from dbal.ibmi import converters
+from forms.utils.db_helpers import rows_to_dict
+
+
+class FakeCursor:
+    def __init__(self, columns, rows):
+        self.description = [(column,) for column in columns]
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeRawConnection:
+    def __init__(self):
+        self.installed = {}
+
+    def add_output_converter(self, sql_type, func):
+        self.installed[sql_type] = func
+
+    def remove_output_converter(self, sql_type):
+        del self.installed[sql_type]
+
+
+class OutputConvertersTest(SimpleTestCase):
+    """Tests UNITARIOS de los output converters de dbal - SIN base de datos"""
+
+    def test_char_y_graphic_recortan_a_la_derecha(self):
+        self.assertEqual(converters.rtrim_char(b" 1234   "), " 1234")
+        self.assertEqual(converters.rtrim_graphic("ÑANDÚ  ".encode("utf-16-le")), "ÑANDÚ")
+        self.assertIsNone(converters.rtrim_char(None))
+
+    def test_decimal_escala_cero_es_int(self):
+        self.assertEqual(converters.decimal_to_python(b"123456"), 123456)
+        self.assertIsInstance(converters.decimal_to_python(b"-42"), int)
+        self.assertEqual(converters.decimal_to_python(b"10.50"), decimal.Decimal("10.50"))
+        self.assertEqual(converters.decimal_to_python(b"10,50"), decimal.Decimal("10.50"))
+        self.assertIsNone(converters.decimal_to_python(None))
+
+    def test_decimal_numeric_struct(self):
+        entero = struct.pack("<BbB", 10, 0, 1) + (987).to_bytes(16, "little")
+        negativo = struct.pack("<BbB", 10, 2, 0) + (1050).to_bytes(16, "little")
+        self.assertEqual(converters.decimal_to_python(entero), 987)
+        self.assertEqual(converters.decimal_to_python(negativo), decimal.Decimal("-10.50"))
+
+    def test_bytes_no_reconocidos(self):
+        with self.assertRaises(converters.UnrecognizedValue):
+            converters.decimal_to_python(b"\x12\x3c")  # DECIMAL empaquetado (BCD)
+        with self.assertRaises(converters.UnrecognizedValue):
+            converters.rtrim_char("ÑA".encode("cp500"))  # EBCDIC
+
+    def test_fecha_numerica(self):
+        self.assertEqual(converters.numeric_date(20250131), datetime.date(2025, 1, 31))
+        self.assertEqual(converters.numeric_date("20250131 "), datetime.date(2025, 1, 31))
+        self.assertEqual(converters.numeric_date(decimal.Decimal("1250131")), datetime.date(2025, 1, 31))
+        self.assertEqual(converters.numeric_date(991231), datetime.date(1999, 12, 31))
+        self.assertIsNone(converters.numeric_date(0))
+
+    def test_registry_instala_en_la_conexion(self):
+        raw = FakeRawConnection()
+        converters.registry.install(raw)
+        self.assertIs(raw.installed[converters.SQL_CHAR].__wrapped__, converters.rtrim_char)
+        self.assertIs(raw.installed[converters.SQL_DECIMAL].__wrapped__, converters.decimal_to_python)
+
+    def test_formato_desconocido_usa_la_conversion_de_pyodbc(self):
+        raw = FakeRawConnection()
+        converters.registry.install(raw)
+        convert = raw.installed[converters.SQL_DECIMAL]
+
+        with self.assertLogs("dbal", "WARNING"):
+            self.assertEqual(convert(b"1E+2"), decimal.Decimal("1E+2"))
+        self.assertNotIn(converters.SQL_DECIMAL, raw.installed)
+        self.assertIn(converters.SQL_CHAR, raw.installed)
+
+        convert = raw.installed[converters.SQL_CHAR]
+        with self.assertLogs("dbal", "WARNING"):
+            self.assertIsInstance(convert("ÑA  ".encode("cp500")), str)
+
+    def test_decimal_sin_equivalente_falla(self):
+        raw = FakeRawConnection()
+        converters.registry.install(raw)
+        with self.assertLogs("dbal", "WARNING"), self.assertRaises(converters.UnrecognizedValue):
+            raw.installed[converters.SQL_NUMERIC](b"\x12\x3c")  # DECIMAL empaquetado (BCD)
+        self.assertNotIn(converters.SQL_NUMERIC, raw.installed)
+
+    def test_rows_to_dict_con_conversion_por_columna(self):
+        cursor = FakeCursor(["MRCODCONS", "MRFECATE"], [(1, 20250131), (2, 0)])
+        data = rows_to_dict(cursor, column_converters={"mrfecate": converters.numeric_date})
+        self.assertEqual(
+            data,
+            [
+                {"mrcodcons": 1, "mrfecate": datetime.date(2025, 1, 31)},
+                {"mrcodcons": 2, "mrfecate": None},
+            ],
+        )
+
+    def test_rows_to_dict_strip(self):
+        cursor = FakeCursor(["BENOMBENE", "BECODBENE"], [("  ANA  ", decimal.Decimal("7"))])
+        self.assertEqual(rows_to_dict(cursor, single=True), {"benombene": "ANA", "becodbene": 7})
+        cursor = FakeCursor(["BENOMBENE"], [("  ANA  ",)])
+        self.assertEqual(rows_to_dict(cursor, strip=False, single=True), {"benombene": "  ANA  "})
+
+
+CHECK_DRIVER = os.environ.get("DB2_CHECK_CONVERTERS") == "1"
+
+
+@unittest.skipUnless(CHECK_DRIVER, "Requiere DB2_CHECK_CONVERTERS=1 y conexión a DB2")
+class DriverByteFormatsTest(SimpleTestCase):
+    """
+    Tests de INTEGRACIÓN contra el IBM i Access ODBC Driver: registran los
+    bytes que pyodbc entrega a los output converters para CHAR, GRAPHIC y
+    DECIMAL y comprueban que los converters los entienden. Deben pasar antes
+    de activar OPTIONS "output_converters".
+    """
+
+    # Solo pide base de datos si se va a ejecutar
+    databases = {"default"} if CHECK_DRIVER else set()
+
+    SQL = """SELECT
+        CAST('AÑO' AS CHAR(6)),
+        CAST('AÑO' AS GRAPHIC(6) CCSID 1200),
+        CAST(123456 AS DECIMAL(9, 0)),
+        CAST(-10.5 AS DECIMAL(9, 2)),
+        CAST(20250131 AS NUMERIC(8, 0))
+        FROM SYSIBM.SYSDUMMY1"""
+
+    EXPECTED = ["AÑO", "AÑO", 123456, decimal.Decimal("-10.50"), 20250131]
+
+    def test_formatos_del_driver(self):
+        connection.ensure_connection()
+        raw = connection.connection._conn
+        sql_types = [
+            converters.SQL_CHAR,
+            converters.SQL_WCHAR,
+            converters.SQL_DECIMAL,
+            converters.SQL_NUMERIC,
+        ]
+        recorded = []
+        previous = {sql_type: raw.get_output_converter(sql_type) for sql_type in sql_types}
+        for sql_type in sql_types:
+            raw.add_output_converter(
+                sql_type, lambda value, sql_type=sql_type: recorded.append((sql_type, value)) or value
+            )
+        try:
+            cursor = raw.cursor()
+            cursor.execute(self.SQL)
+            cursor.fetchone()
+            cursor.close()
+        finally:
+            for sql_type, func in previous.items():
+                if func is None:
+                    raw.remove_output_converter(sql_type)
+                else:
+                    raw.add_output_converter(sql_type, func)
+
+        print(f"Bytes del driver: {recorded!r}")
+        functions = {
+            converters.SQL_CHAR: converters.rtrim_char,
+            converters.SQL_WCHAR: converters.rtrim_graphic,
+            converters.SQL_DECIMAL: converters.decimal_to_python,
+            converters.SQL_NUMERIC: converters.decimal_to_python,
+        }
+        self.assertEqual(len(recorded), len(self.EXPECTED), recorded)
+        for (sql_type, value), expected in zip(recorded, self.EXPECTED):
+            with self.subTest(sql_type=sql_type, value=value):
+                self.assertEqual(functions[sql_type](value), expected)
@@ -0,0 +1,54 @@
+import time
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from dbal import deadline
+from dbal.exceptions import DeadlineExceeded
+from forms.middleware.deadline import DeadlineMiddleware
+
+
+class DeadlineTest(SimpleTestCase):
+    """Tests UNITARIOS del deadline de petición - SIN base de datos"""
+
+    def test_sin_deadline_usa_el_default(self):
+        self.assertIsNone(deadline.remaining())
+        self.assertEqual(deadline.timeout_for(30), 30)
+        self.assertEqual(deadline.statement_timeout(0), 0)
+
+    def test_timeout_es_el_menor(self):
+        with deadline.deadline(5):
+            self.assertLessEqual(deadline.timeout_for(30), 5)
+            self.assertEqual(deadline.timeout_for(2), 2)
+            self.assertEqual(deadline.statement_timeout(0), 5)
+
+    def test_deadline_anidado_no_se_amplia(self):
+        with deadline.deadline(1):
+            with deadline.deadline(60):
+                self.assertLessEqual(deadline.remaining(), 1)
+
+    def test_deadline_vencido_falla_rapido(self):
+        with deadline.deadline(0.01):
+            time.sleep(0.02)
+            with self.assertRaises(DeadlineExceeded):
+                deadline.timeout_for(30)
+            with deadline.suspended():
+                deadline.check()
+        deadline.check()
+
+    @override_settings(REQUEST_DEADLINES={"DEFAULT": 0, "RETRY_AFTER": 3})
+    def test_middleware_responde_503(self):
+        def view(request):
+            deadline.check()
+
+        request = RequestFactory().get("/api/beneficiarios/")
+        middleware = DeadlineMiddleware(lambda req: None)
+        request._deadline_start = time.monotonic()
+        middleware.process_view(request, view, (), {})
+        try:
+            with self.assertRaises(DeadlineExceeded) as ctx:
+                view(request)
+        finally:
+            deadline.reset_deadline(request._deadline_token)
+
+        response = middleware.process_exception(request, ctx.exception)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "3")
@@ -0,0 +1,54 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.test import SimpleTestCase
+from forms.decorators import get_model_filter_fields, register_model_for_api
+from forms.models.soporte_fomag import SoporteFomag
+from forms.views.mixins import DynamicSerializerCache
+
+
+class DynamicSerializerCacheTest(SimpleTestCase):
+    """Tests UNITARIOS del serializer dinámico de la API genérica - SIN base de datos"""
+
+    def setUp(self):
+        self.cache = DynamicSerializerCache()
+
+    def test_un_serializer_por_modelo(self):
+        serializer_class = self.cache.get(SoporteFomag)
+
+        self.assertIs(self.cache.get(SoporteFomag), serializer_class)
+        self.assertEqual(serializer_class.__name__, "DynamicSoporteFomagSerializer")
+
+    def test_campos_reutilizados_sin_compartir_instancias(self):
+        serializer_class = self.cache.get(SoporteFomag)
+        first = serializer_class(data={"benumdocbe": "123"})
+        second = serializer_class(data={"benumdocbe": "x" * 20})
+
+        self.assertEqual(list(first.fields), list(second.fields))
+        self.assertIsNot(first.fields["benumdocbe"], second.fields["benumdocbe"])
+        self.assertIs(first.fields["benumdocbe"].parent, first)
+        self.assertTrue(first.is_valid())
+        self.assertFalse(second.is_valid())
+        self.assertIn("benumdocbe", second.errors)
+
+    def test_validacion_por_fila(self):
+        serializer = self.cache.get(SoporteFomag)(
+            data=[{"benumdocbe": "1"}, {"benumdocbe": "x" * 20}, "no"], many=True
+        )
+
+        valid, errors = serializer.validate_rows()
+
+        self.assertEqual([index for index, _ in valid], [0])
+        self.assertEqual(valid[0][1]["benumdocbe"], "1")
+        self.assertEqual([index for index, _ in errors], [1, 2])
+        self.assertIn("benumdocbe", errors[0][1])
+
+
+class GenericModelRegistryTest(SimpleTestCase):
+    """Tests UNITARIOS del registro de modelos de la API genérica - SIN base de datos"""
+
+    def test_campos_filtrables(self):
+        self.assertEqual(get_model_filter_fields("soporte_fomag"), ("benumdocbe", "mrcodcons"))
+        self.assertEqual(get_model_filter_fields("no_registrado"), ())
+
+    def test_campo_filtrable_inexistente(self):
+        with self.assertRaises(FieldDoesNotExist):
+            register_model_for_api("soporte_fomag_tmp", filter_fields=("no_existe",))(SoporteFomag)
@@ -0,0 +1,48 @@
+import datetime
+
+from django.test import SimpleTestCase
+from forms.models.forms import Form
+from forms.services.export_service import EXTRA_COLUMN, SubmissionExporter, parse_since
+
+
+class SubmissionExporterTest(SimpleTestCase):
+    """Tests UNITARIOS de la exportación de submissions - SIN base de datos"""
+
+    def setUp(self):
+        self.exporter = SubmissionExporter(Form(id=1, slug="afiliacion"))
+        self.exporter._fields = ["nombre", "documentos", "fecha"]
+
+    def test_since_id_o_fecha(self):
+        self.assertIsNone(parse_since(""))
+        self.assertEqual(parse_since("120"), ("id", 120))
+
+        column, value = parse_since("2025-03-01")
+        self.assertEqual(column, "created_at")
+        self.assertEqual(value, datetime.datetime(2025, 3, 1, tzinfo=datetime.timezone.utc))
+
+        with self.assertRaises(ValueError):
+            parse_since("ayer")
+
+    def test_aplana_en_el_orden_de_los_campos(self):
+        values, extra = self.exporter.split({"fecha": "2025-01-02", "nombre": "Ana", "viejo": 1})
+
+        self.assertEqual(values, ["Ana", None, "2025-01-02"])
+        self.assertEqual(extra, {"viejo": 1})
+
+    def test_csv(self):
+        created_at = datetime.datetime(2025, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+        self.exporter.iter_submissions = lambda: iter(
+            [(7, created_at, {"nombre": "Ana", "documentos": ["a.pdf", "b.pdf"]})]
+        )
+
+        lines = list(self.exporter.iter_csv())
+
+        self.assertEqual(lines[0], f"id,created_at,nombre,documentos,fecha,{EXTRA_COLUMN}\r\n")
+        self.assertEqual(lines[1], '7,2025-01-02T03:04:05+00:00,Ana,"a.pdf, b.pdf",,\r\n')
+
+    def test_data_invalida(self):
+        self.assertEqual(SubmissionExporter.decode("no-json"), {EXTRA_COLUMN: "no-json"})
+
+    def test_formato_no_valido(self):
+        with self.assertRaises(ValueError):
+            self.exporter.iter_format("xlsx")
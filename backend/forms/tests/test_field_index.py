@@ -0,0 +1,34 @@
+from django.test import SimpleTestCase
+from forms.utils.field_index import MAX_VALUE_LENGTH, index_entries, normalize_value
+from forms.utils.form_validator import FieldSpec, FormValidator
+
+
+class FieldIndexTest(SimpleTestCase):
+    """Tests UNITARIOS del índice de valores de campos - SIN base de datos"""
+
+    def test_normalizacion(self):
+        self.assertEqual(normalize_value("  José   PÉREZ "), "jose perez")
+        self.assertEqual(normalize_value(1234), "1234")
+        self.assertEqual(normalize_value(True), "1")
+        self.assertIsNone(normalize_value("   "))
+        self.assertIsNone(normalize_value(None))
+        self.assertEqual(len(normalize_value("x" * 400)), MAX_VALUE_LENGTH)
+
+    def test_entradas_de_campos_indexados(self):
+        data = {"benumdocbe": " 1.094 ", "servicios": ["A", "a", "B"], "nombre": "Ana"}
+
+        entries = index_entries(["benumdocbe", "servicios", "vacio"], data)
+
+        self.assertEqual(
+            entries,
+            [("benumdocbe", "1.094"), ("servicios", "a"), ("servicios", "b")],
+        )
+
+    def test_validador_expone_campos_indexados(self):
+        validator = FormValidator(
+            [
+                FieldSpec("nombre", "text"),
+                FieldSpec("benumdocbe", "text", indexed=True),
+            ]
+        )
+        self.assertEqual(validator.indexed_fields, ("benumdocbe",))
@@ -0,0 +1,61 @@
+from django.test import SimpleTestCase
+from forms.utils.form_validator import FieldSpec, FormValidator, topological_order
+
+SI_NO = frozenset({"si", "no"})
+
+
+class FormValidatorTest(SimpleTestCase):
+    """Tests UNITARIOS del validador compilado de formularios - SIN base de datos"""
+
+    def setUp(self):
+        # Orden de presentación con hijos antes que sus padres
+        self.specs = [
+            FieldSpec("detalle", "text", True, None, "motivo", "otro"),
+            FieldSpec("motivo", "select", True, frozenset({"cita", "otro"}), "tiene_motivo", "si"),
+            FieldSpec("tiene_motivo", "radio", True, SI_NO),
+            FieldSpec("fecha", "date", False),
+        ]
+        self.validator = FormValidator(self.specs)
+
+    def test_orden_topologico(self):
+        ordered, cyclic = topological_order(self.specs)
+        names = [spec.name for spec in ordered]
+        self.assertLess(names.index("tiene_motivo"), names.index("motivo"))
+        self.assertLess(names.index("motivo"), names.index("detalle"))
+        self.assertEqual(cyclic, frozenset())
+
+    def test_quita_campos_inactivos_en_cadena(self):
+        cleaned, errors = self.validator.validate(
+            {"tiene_motivo": "no", "motivo": "otro", "detalle": "x", "extra": "1"}
+        )
+        self.assertEqual(errors, {})
+        self.assertEqual(cleaned, {"tiene_motivo": "no", "extra": "1"})
+
+    def test_requeridos_y_opciones_de_campos_activos(self):
+        cleaned, errors = self.validator.validate(
+            {"tiene_motivo": "si", "motivo": "otro", "detalle": "", "fecha": "01/02/2025"}
+        )
+        self.assertEqual(
+            errors,
+            {
+                "detalle": "Este campo es obligatorio",
+                "fecha": "Fecha no válida, se espera AAAA-MM-DD",
+            },
+        )
+        _, errors = self.validator.validate({"tiene_motivo": "tal vez"})
+        self.assertEqual(errors, {"tiene_motivo": "Opción no válida"})
+
+    def test_ciclos_se_evaluan_contra_el_dato_recibido(self):
+        validator = FormValidator(
+            [
+                FieldSpec("a", "text", False, None, "b", "1"),
+                FieldSpec("b", "text", False, None, "a", "1"),
+            ]
+        )
+        cleaned, _ = validator.validate({"a": "1", "b": "1"})
+        self.assertEqual(cleaned, {"a": "1", "b": "1"})
+
+    def test_strip_unknown(self):
+        validator = FormValidator(self.specs, strip_unknown=True)
+        cleaned, _ = validator.validate({"tiene_motivo": "no", "extra": "1"})
+        self.assertEqual(cleaned, {"tiene_motivo": "no"})
@@ -0,0 +1,114 @@
+import datetime
+import time
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import QueryDict
+from django.db import connections
+from django.test import SimpleTestCase
+from forms.models.forms import IdempotencyKey
+from forms.services.idempotency_service import (
+    IdempotencyService,
+    ResponseCache,
+    StoredResponse,
+    fingerprint_request,
+)
+
+
+class IdempotencyTest(SimpleTestCase):
+    """Tests UNITARIOS de la caché y el fingerprint de idempotencia - SIN base de datos"""
+
+    def test_fingerprint_estable_y_sensible_al_contenido(self):
+        a = fingerprint_request({"form_id": 1, "nombre": "Ana"})
+        b = fingerprint_request({"nombre": "Ana", "form_id": 1})
+        c = fingerprint_request({"form_id": 1, "nombre": "Ana María"})
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+    def test_fingerprint_usa_nombre_y_tamano_de_archivos(self):
+        files = QueryDict(mutable=True)
+        files.setlist("soporte", [SimpleUploadedFile("a.pdf", b"12345")])
+        data = QueryDict("form_id=1", mutable=True)
+        data.update(files)
+        otro = QueryDict(mutable=True)
+        otro.setlist("soporte", [SimpleUploadedFile("a.pdf", b"123")])
+        self.assertNotEqual(
+            fingerprint_request(data, files), fingerprint_request(data, otro)
+        )
+
+    def test_cache_lru_con_ttl(self):
+        cache = ResponseCache(max_size=2, ttl=60)
+        response = StoredResponse(201, {"form": 1}, "h")
+        cache.set("a", response)
+        cache.set("b", response)
+        cache.get("a")
+        cache.set("c", response)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), response)
+
+        cache.set("d", response, ttl=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("d"))
+
+
+class IdempotencyCompleteTest(SimpleTestCase):
+    """Tests UNITARIOS de complete() frente al drenador del spool - SIN base de datos"""
+
+    def setUp(self):
+        patcher = patch("forms.services.idempotency_service.IdempotencyKey.objects")
+        self.objects = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = ResponseCache(max_size=10, ttl=60)
+        self.service = IdempotencyService("submissions", cache=self.cache)
+        self.record = IdempotencyKey(
+            pk=5,
+            scope="submissions",
+            key="k",
+            request_hash="h",
+            status="processing",
+            expires_at=datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1),
+        )
+
+    def test_update_condicionado_a_processing(self):
+        self.objects.filter.return_value.update.return_value = 1
+
+        self.assertTrue(self.service.complete(self.record, 202, {"status": "queued"}))
+        self.objects.filter.assert_called_once_with(pk=5, status="processing")
+        self.assertEqual(self.cache.get("submissions:k").status, 202)
+
+    def test_reserva_reemplazada_por_el_drenador(self):
+        self.objects.filter.return_value.update.return_value = 0
+
+        self.assertFalse(self.service.complete(self.record, 202, {"status": "queued"}))
+        self.assertIsNone(self.cache.get("submissions:k"))
+
+
+
+class IdempotencyReserveTest(SimpleTestCase):
+    """Tests UNITARIOS de reserve() con claves repetidas - SIN base de datos"""
+
+    def setUp(self):
+        patcher = patch("forms.services.idempotency_service.IdempotencyKey.objects")
+        self.objects = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = IdempotencyService("submissions", cache=ResponseCache(max_size=10, ttl=60))
+
+    def test_reintento_con_integrity_error_del_driver(self):
+        # En DB2 la clave duplicada puede llegar como pyodbc.IntegrityError
+        self.objects.create.side_effect = connections["default"].Database.IntegrityError("duplicate")
+        now = datetime.datetime.now(datetime.timezone.utc)
+        self.objects.filter.return_value.first.return_value = IdempotencyKey(
+            scope="submissions",
+            key="k",
+            request_hash="h",
+            status="completed",
+            response_status=201,
+            response_body='{"id": 1}',
+            created_at=now,
+            expires_at=now + datetime.timedelta(hours=1),
+        )
+
+        record, stored = self.service.reserve("k", "h")
+
+        self.assertIsNone(record)
+        self.assertEqual((stored.status, stored.body), (201, {"id": 1}))
@@ -0,0 +1,72 @@
+import datetime
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+from dbal.ibmi.operations import DatabaseOperations
+from forms.models.forms import SubmissionTaskLog
+from forms.utils.pagination import InvalidCursor, KeysetPaginator
+from forms.views.submission_task_log import parse_time_bound
+
+
+class KeysetPaginatorTest(SimpleTestCase):
+    """Tests UNITARIOS de la paginación por keyset - SIN base de datos"""
+
+    def setUp(self):
+        self.paginator = KeysetPaginator(ordering=("-started_at", "-id"), max_limit=100)
+
+    def test_cursor_ida_y_vuelta(self):
+        started_at = datetime.datetime(2025, 3, 1, 10, 30, 5, 123456)
+        row = SubmissionTaskLog(id=42, started_at=started_at)
+
+        cursor = self.paginator.encode_cursor(row)
+        values = self.paginator.decode_cursor(SubmissionTaskLog.objects.all(), cursor)
+
+        self.assertEqual(values[0], timezone.make_aware(started_at, datetime.timezone.utc))
+        self.assertEqual(values[1], 42)
+
+    def test_cursor_con_otra_zona_horaria_pasa_a_utc(self):
+        bogota = datetime.timezone(datetime.timedelta(hours=-5))
+        row = SubmissionTaskLog(id=7, started_at=datetime.datetime(2026, 1, 1, 10, tzinfo=bogota))
+
+        cursor = self.paginator.encode_cursor(row)
+        values = self.paginator.decode_cursor(SubmissionTaskLog.objects.all(), cursor)
+
+        self.assertEqual(values[0].utcoffset(), datetime.timedelta(0))
+        self.assertEqual(values[0].hour, 15)
+
+    def test_cursor_invalido(self):
+        with self.assertRaises(InvalidCursor):
+            self.paginator.decode_cursor(SubmissionTaskLog.objects.all(), "no-es-un-cursor")
+
+    def test_limit(self):
+        self.assertEqual(self.paginator.get_limit(None), 50)
+        self.assertEqual(self.paginator.get_limit("1000"), 100)
+        with self.assertRaises(ValueError):
+            self.paginator.get_limit("0")
+
+    def test_orden_mixto_no_permitido(self):
+        with self.assertRaises(ValueError):
+            KeysetPaginator(ordering=("-started_at", "id"))
+
+
+class TimeBoundTest(SimpleTestCase):
+    """Tests UNITARIOS de los límites de fecha de los listados - SIN base de datos"""
+
+    def test_offset_se_normaliza_a_utc(self):
+        value = parse_time_bound("since", "2026-01-01T10:00:00-05:00")
+        self.assertEqual(value, datetime.datetime(2026, 1, 1, 15, tzinfo=datetime.timezone.utc))
+        self.assertEqual(value.utcoffset(), datetime.timedelta(0))
+
+    def test_sin_zona_y_solo_fecha_son_utc(self):
+        self.assertEqual(
+            parse_time_bound("since", "2026-01-01"),
+            datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc),
+        )
+
+    def test_db2_recibe_el_timestamp_en_utc(self):
+        ops = DatabaseOperations(type("Connection", (), {"timezone": datetime.timezone.utc})())
+        bogota = datetime.timezone(datetime.timedelta(hours=-5))
+        self.assertEqual(
+            ops.adapt_datetimefield_value(datetime.datetime(2026, 1, 1, 10, tzinfo=bogota)),
+            "2026-01-01 15:00:00.000000",
+        )
@@ -0,0 +1,39 @@
+from django.test import SimpleTestCase
+from dbal.ibmi.instrumentation import collect_queries, record_query
+from forms.utils.query_inspector import (
+    NPlusOneAssertionsMixin,
+    NPlusOneError,
+    find_repeated_queries,
+)
+
+
+class QueryInspectorTest(NPlusOneAssertionsMixin, SimpleTestCase):
+    """Tests UNITARIOS del detector de N+1 - SIN base de datos"""
+
+    def test_agrupa_selects_repetidas(self):
+        with collect_queries() as queries:
+            record_query("SELECT * FROM T", 0.001)
+            for i in range(6):
+                record_query(f"SELECT * FROM FORM WHERE ID = {i}", 0.001)
+                record_query("UPDATE T SET A = ?", 0.001)
+
+        repeated = find_repeated_queries(queries, threshold=5)
+        self.assertEqual(repeated, [("SELECT * FROM FORM WHERE ID = ?", 6)])
+
+    def test_assert_no_repeated_queries_falla(self):
+        with self.assertRaises(NPlusOneError):
+            with self.assertNoRepeatedQueries(threshold=3):
+                for i in range(3):
+                    record_query(f"SELECT * FROM FORM WHERE ID = {i}", 0.001)
+
+    def test_query_count_does_not_grow(self):
+        def constante(size):
+            record_query("SELECT * FROM T FETCH FIRST 50 ROWS ONLY", 0.001)
+
+        def por_fila(size):
+            for i in range(size):
+                record_query(f"SELECT * FROM FORM WHERE ID = {i}", 0.001)
+
+        self.assertQueryCountDoesNotGrow(constante, sizes=(1, 10))
+        with self.assertRaises(NPlusOneError):
+            self.assertQueryCountDoesNotGrow(por_fila, sizes=(1, 10))
@@ -0,0 +1,49 @@
+from django.test import SimpleTestCase, override_settings
+from dbal.ibmi import instrumentation
+
+
+class QueryInstrumentationTest(SimpleTestCase):
+    """Tests UNITARIOS de la instrumentación SQL de dbal - SIN base de datos"""
+
+    def setUp(self):
+        instrumentation.registry.reset()
+
+    def tearDown(self):
+        instrumentation.registry.reset()
+
+    def test_fingerprint_normaliza_literales(self):
+        """Literales y listas IN distintos generan el mismo fingerprint"""
+        a = instrumentation.fingerprint(
+            "SELECT * FROM T WHERE ID IN (?, ?, ?) AND NAME = 'ana'  FETCH FIRST 21 ROWS ONLY"
+        )
+        b = instrumentation.fingerprint(
+            "SELECT * FROM T WHERE ID IN (?, ?) AND NAME = 'o''neil' FETCH FIRST 5 ROWS ONLY"
+        )
+        self.assertEqual(a, b)
+        self.assertIn("IN (...)", a)
+
+    def test_fingerprint_conserva_identificadores(self):
+        fp = instrumentation.fingerprint('SELECT "T1"."COL2" FROM "TIFORMS"."FORM" T1')
+        self.assertEqual(fp, 'SELECT "T1"."COL2" FROM "TIFORMS"."FORM" T1')
+
+    def test_registry_acumula_por_fingerprint(self):
+        instrumentation.record_query("SELECT 1 FROM T WHERE ID = 7", 0.002, 1)
+        instrumentation.record_query("SELECT 1 FROM T WHERE ID = 9", 0.3, 1)
+
+        data = instrumentation.registry.snapshot()
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["count"], 2)
+        self.assertEqual(data[0]["rows"], 2)
+        self.assertEqual(data[0]["histogram"]["le_5ms"], 1)
+        self.assertEqual(data[0]["histogram"]["le_500ms"], 1)
+
+    @override_settings(DBAL_INSTRUMENTATION={"SLOW_QUERY_MS": 100})
+    def test_slow_query_log(self):
+        with self.assertLogs("dbal.slow_query", level="WARNING") as logs:
+            instrumentation.record_query("SELECT * FROM T", 0.25)
+        self.assertIn("Consulta lenta", logs.output[0])
+
+    @override_settings(DBAL_INSTRUMENTATION={"ENABLED": False})
+    def test_deshabilitado_no_registra(self):
+        instrumentation.record_query("SELECT * FROM T", 0.25)
+        self.assertEqual(instrumentation.registry.snapshot(), [])
@@ -0,0 +1,40 @@
+import json
+import zlib
+
+from django.test import SimpleTestCase
+from forms.utils.submission_codec import (
+    DEFAULTS,
+    ZLIB_MARKER,
+    compact_json,
+    decompress,
+    pack,
+    unpack,
+)
+
+
+class SubmissionCodecTest(SimpleTestCase):
+    """Tests UNITARIOS del almacenamiento comprimido de DATA - SIN base de datos"""
+
+    def setUp(self):
+        self.config = dict(DEFAULTS, CODEC="zlib", MIN_BYTES=100)
+        self.data = json.dumps({"nombre": "Ana María", "comentario": "texto " * 50, "edad": 30})
+
+    def test_ida_y_vuelta(self):
+        data, data_blob = pack(self.data, self.config)
+
+        self.assertIsNone(data)
+        self.assertTrue(data_blob.startswith(ZLIB_MARKER))
+        self.assertLess(len(data_blob), len(self.data))
+        self.assertEqual(json.loads(unpack(data, data_blob)), json.loads(self.data))
+
+    def test_payload_pequeno_queda_en_texto(self):
+        self.assertEqual(pack('{"a":1}', self.config), ('{"a":1}', None))
+        self.assertEqual(pack(self.data, dict(self.config, CODEC="json")), (self.data, None))
+        self.assertEqual(unpack('{"a":1}', None), '{"a":1}')
+
+    def test_json_compacto_con_claves_ordenadas(self):
+        self.assertEqual(compact_json('{"b": 1, "a": "ñ"}'), '{"a":"ñ","b":1}'.encode("utf-8"))
+
+    def test_marca_desconocida(self):
+        with self.assertRaises(ValueError):
+            decompress(b"XXXX" + zlib.compress(b"{}"))
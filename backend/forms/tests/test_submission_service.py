@@ -0,0 +1,102 @@
+import json
+from contextlib import nullcontext
+from unittest.mock import Mock, patch
+
+from django.db import OperationalError, connections
+from django.http import QueryDict
+from django.test import SimpleTestCase
+from forms.models.forms import Form
+from forms.services.submission_service import (
+    BatchItem,
+    FormCache,
+    FormNotFound,
+    SubmissionService,
+    encode_submission_data,
+)
+
+
+class SubmissionServiceTest(SimpleTestCase):
+    """Tests UNITARIOS de la ingesta de submissions - SIN base de datos"""
+
+    def test_json_compacto_y_ascii(self):
+        encoded = encode_submission_data({"nombre": "Muñoz", "edad": "30"})
+        self.assertEqual(encoded, '{"nombre":"Mu\\u00f1oz","edad":"30"}')
+        self.assertEqual(json.loads(encoded)["nombre"], "Muñoz")
+
+    def test_build_data_excluye_form_y_usa_urls_de_archivos(self):
+        request_data = QueryDict("form_id=1&nombre=Ana&soporte=archivo.pdf")
+        data = SubmissionService.build_data(
+            request_data, {"soporte": "https://host/uploads/abc.pdf"}
+        )
+        self.assertEqual(
+            data, {"nombre": "Ana", "soporte": "https://host/uploads/abc.pdf"}
+        )
+
+    def test_formulario_borrado_con_integrity_error_del_driver(self):
+        # La FK violada llega como pyodbc.IntegrityError en DB2
+        cache = Mock()
+        service = SubmissionService(cache=cache, repository=Mock())
+        service.indexed_fields = lambda form_id: ()
+        service.insert = Mock(side_effect=connections["default"].Database.IntegrityError("FK"))
+
+        with self.assertRaises(FormNotFound):
+            service.create(Form(id=7, name="Borrado"), {"nombre": "Ana"})
+        cache.invalidate.assert_called_once_with()
+
+    @patch("forms.services.submission_service.transaction.atomic", nullcontext)
+    def test_lote_fallido_borra_los_archivos_subidos(self):
+        service = SubmissionService(cache=Mock(), repository=Mock())
+        service.resolve_form = lambda form_id: Form(id=form_id, name="Soportes")
+        service.validate = lambda form, data: data
+        service.insert = Mock(side_effect=OperationalError("08S01"))
+        uploader = Mock()
+        uploader.handle_uploaded_files.side_effect = lambda uploads: [
+            f"https://host/uploads/{name}" for name in uploads
+        ]
+        items = [
+            BatchItem(1, {"nombre": "Ana"}, {"soporte": ["a.pdf"]}),
+            BatchItem(1, {"nombre": "Luis"}, {"soporte": ["b.pdf", "c.pdf"]}),
+        ]
+
+        with self.assertRaises(OperationalError):
+            service.create_batch(items, uploader)
+        uploader.delete_uploaded_files.assert_called_once_with(
+            [f"https://host/uploads/{name}" for name in ("a.pdf", "b.pdf", "c.pdf")]
+        )
+
+
+class FormCacheTest(SimpleTestCase):
+    """Tests UNITARIOS del mapa de formularios en memoria - SIN base de datos"""
+
+    def setUp(self):
+        self.now = 100.0
+        self.forms = {1: "Soportes"}
+        self.loads = 0
+
+        def values_list(*fields):
+            self.loads += 1
+            return list(self.forms.items())
+
+        for target, value in (
+            ("forms.services.submission_service.time.monotonic", lambda: self.now),
+            ("forms.services.submission_service.get_version", lambda ns: 0),
+        ):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch("forms.services.submission_service.Form.objects")
+        patcher.start().values_list.side_effect = values_list
+        self.addCleanup(patcher.stop)
+        self.cache = FormCache()
+
+    def test_ids_desconocidos_no_recargan_en_cada_peticion(self):
+        self.assertEqual(self.cache.lookup(1), (1, "Soportes"))
+        for form_id in (999, 998, 997):
+            with self.assertRaises(FormNotFound):
+                self.cache.lookup(form_id)
+        self.assertEqual(self.loads, 1)
+
+        self.forms[2] = "Nuevo"
+        self.now += 1.5
+        self.assertEqual(self.cache.lookup(2), (2, "Nuevo"))
+        self.assertEqual(self.loads, 2)
@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+from contextlib import nullcontext
+from unittest.mock import Mock, patch
+
+from django.db import IntegrityError, OperationalError
+from django.test import SimpleTestCase, override_settings
+from dbal.exceptions import DeadlineExceeded
+from forms.models.forms import Form
+from forms.services.idempotency_service import IdempotencyKeyReused
+from forms.services.submission_spool import (
+    DatabaseHealth,
+    SpoolDrainer,
+    SubmissionSpool,
+    is_database_unavailable,
+)
+
+
+class SubmissionSpoolTest(SimpleTestCase):
+    """Tests UNITARIOS del spool local de submissions - SIN base de datos"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.spool = SubmissionSpool(os.path.join(self.directory, ".spool", "s.sqlite3"))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_pendientes_en_orden_de_llegada(self):
+        first, _ = self.spool.append(1, {"nombre": "Ana"}, validated=True)
+        second, _ = self.spool.append(2, {"nombre": "Luis"}, validated=False)
+
+        entries = self.spool.pending(10)
+
+        self.assertEqual([e.seq for e in entries], [first, second])
+        self.assertEqual(entries[0].data, '{"nombre":"Ana"}')
+        self.assertFalse(entries[1].validated)
+
+    def test_reintento_con_la_misma_clave(self):
+        seq, created = self.spool.append(1, {}, True, key="k", scope="submissions", request_hash="h")
+        again, created_again = self.spool.append(1, {}, True, key="k", scope="submissions", request_hash="h")
+
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertEqual(seq, again)
+        with self.assertRaises(IdempotencyKeyReused):
+            self.spool.find("submissions", "k", "otro")
+
+    def test_rechazadas_y_borradas(self):
+        first, _ = self.spool.append(1, {}, True)
+        second, _ = self.spool.append(1, {}, True)
+
+        self.spool.reject(first, "Formulario no encontrado")
+        self.spool.remove([second])
+
+        self.assertEqual(self.spool.pending(10), [])
+        self.assertEqual(self.spool.counts(), {"rejected": 1})
+
+    def test_spool_inexistente(self):
+        self.assertEqual(self.spool.pending(10), [])
+        self.assertIsNone(self.spool.find("spool", "k"))
+
+
+class SpoolDrainerTest(SimpleTestCase):
+    """Tests UNITARIOS del drenado del spool con entradas que fallan - SIN base de datos"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        self.spool = SubmissionSpool(os.path.join(self.directory, ".spool", "s.sqlite3"))
+        keys = Mock()
+        keys.filter.return_value.values_list.return_value = []
+        for target, value in (
+            ("forms.services.submission_spool.transaction.atomic", nullcontext),
+            ("forms.services.submission_spool.IdempotencyKey.objects", keys),
+            ("forms.services.submission_spool.enqueue_submissions", Mock()),
+        ):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.inserts = []
+
+        def insert(rows, payloads):
+            # El formulario 9 se borró después de resolve_form: FK violada
+            if any(form_id == 9 for form_id, _, _ in rows):
+                raise IntegrityError("FK")
+            self.inserts.append(len(rows))
+            return list(range(len(rows)))
+
+        service = Mock()
+        service.resolve_form.side_effect = lambda form_id: Form(id=form_id, name="F")
+        service.insert.side_effect = insert
+        self.drainer = SpoolDrainer(spool=self.spool, service=service, log=lambda message: None)
+
+    def test_una_entrada_mala_no_bloquea_el_lote(self):
+        for form_id in (1, 9, 2):
+            self.spool.append(form_id, {}, validated=True)
+
+        stats = self.drainer.drain()
+
+        self.assertEqual((stats.inserted, stats.rejected), (2, 1))
+        self.assertEqual(self.inserts, [1, 1])
+        self.assertEqual(self.spool.counts(), {"rejected": 1})
+
+    def test_db2_caido_no_rechaza(self):
+        self.spool.append(1, {}, validated=True)
+        self.drainer.service.insert.side_effect = OperationalError("08S01")
+
+        with self.assertRaises(OperationalError):
+            self.drainer.drain()
+        self.assertEqual(self.spool.counts(), {"pending": 1})
+
+
+class DatabaseUnavailableTest(SimpleTestCase):
+    """Tests UNITARIOS de la detección de DB2 caído - SIN base de datos"""
+
+    def test_errores_de_disponibilidad(self):
+        self.assertTrue(is_database_unavailable(OperationalError("08S01")))
+        self.assertTrue(is_database_unavailable(DeadlineExceeded()))
+        self.assertFalse(is_database_unavailable(IntegrityError()))
+        self.assertFalse(is_database_unavailable(ValueError()))
+
+    @override_settings(SUBMISSION_SPOOL={"COOLDOWN": 60})
+    def test_cooldown(self):
+        health = DatabaseHealth()
+        self.assertTrue(health.is_available())
+        health.mark_unavailable()
+        self.assertFalse(health.is_available())
+        health.mark_available()
+        self.assertTrue(health.is_available())
@@ -0,0 +1,121 @@
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from django.test import SimpleTestCase
+from forms.listeners.webhook_listeners import buffer_for_batch
+from forms.models.forms import WebhookConfig
+from forms.services.webhook_batch import BatchConfig, WebhookBatcher, WebhookBatcherRegistry
+
+
+class _Queue:
+    """delivery_queue de mentira: guarda las tareas y las corre a mano"""
+
+    def __init__(self):
+        self.submitted = []
+        self.scheduled = []
+
+    def submit(self, fn, *args):
+        self.submitted.append((fn, args))
+
+    def schedule(self, delay, fn, *args):
+        self.scheduled.append((delay, fn, args))
+
+
+class BatchConfigTest(SimpleTestCase):
+    """Tests UNITARIOS de la config de batch de webhooks - SIN base de datos"""
+
+    def test_sin_batch_y_valores_por_defecto(self):
+        self.assertFalse(BatchConfig({}).enabled)
+        config = BatchConfig({"batch": True})
+        self.assertTrue(config.enabled)
+        self.assertEqual((config.max_items, config.max_wait_ms), (50, 1000))
+
+    def test_valores_no_validos(self):
+        for batch in ("si", {"max_items": 0}, {"max_wait_ms": -1}, {"max_items": 5000}):
+            with self.subTest(batch=batch), self.assertRaises(ValueError):
+                BatchConfig({"batch": batch})
+
+
+class WebhookBatcherTest(SimpleTestCase):
+    """Tests UNITARIOS del buffer de entregas en batch - SIN base de datos"""
+
+    def setUp(self):
+        self.queue = _Queue()
+        self.webhook = SimpleNamespace(id=1)
+        self.batcher = WebhookBatcher(
+            1, BatchConfig({"batch": {"max_items": 3, "max_wait_ms": 200}}), queue=self.queue
+        )
+        self.delivered = []
+        self.batcher.deliver = lambda webhook, entries: self.delivered.append(
+            [submission for submission, _, _ in entries]
+        )
+
+    def add(self, *submissions):
+        for submission in submissions:
+            self.batcher.add(self.webhook, [(submission, None, 0)])
+
+    def test_sale_al_llegar_a_max_items(self):
+        self.add("a", "b", "c", "d")
+        self.assertEqual(
+            [[entry[0] for entry in args[1]] for _, args in self.queue.submitted], [["a", "b", "c"]]
+        )
+        self.assertEqual(self.batcher.buffered, 1)
+        # Un temporizador por batch: el de "a" y el de "d"
+        self.assertEqual([delay for delay, _, _ in self.queue.scheduled], [0.2, 0.2])
+
+    def test_temporizador_envia_lo_acumulado(self):
+        self.add("a", "b")
+        _, fn, args = self.queue.scheduled[0]
+        fn(*args)
+        self.assertEqual(self.delivered, [["a", "b"]])
+        self.assertEqual(self.batcher.buffered, 0)
+
+    def test_temporizador_viejo_no_adelanta_el_siguiente_batch(self):
+        self.add("a", "b", "c", "d")
+        _, fn, args = self.queue.scheduled[0]
+        fn(*args)
+        self.assertEqual(self.delivered, [])
+        self.assertEqual(self.batcher.buffered, 1)
+
+        _, fn, args = self.queue.scheduled[1]
+        fn(*args)
+        self.assertEqual(self.delivered, [["d"]])
+
+    def test_varias_submissions_de_una_vez(self):
+        self.batcher.add(self.webhook, [(name, None, i) for i, name in enumerate("abcdefg")])
+        self.assertEqual(
+            [[entry[0] for entry in args[1]] for _, args in self.queue.submitted],
+            [["a", "b", "c"], ["d", "e", "f"]],
+        )
+        self.assertEqual(self.batcher.buffered, 1)
+        self.assertEqual(len(self.queue.scheduled), 1)
+
+
+class WebhookBatcherRegistryTest(SimpleTestCase):
+    """Tests UNITARIOS del registro de batchers por webhook - SIN base de datos"""
+
+    def test_solo_webhooks_con_batch(self):
+        registry = WebhookBatcherRegistry()
+        self.assertIsNone(registry.get(WebhookConfig(id=1, config="{}")))
+
+        webhook = WebhookConfig(id=2, config='{"batch": {"max_items": 10}}')
+        batcher = registry.get(webhook)
+        self.assertEqual(batcher.config.max_items, 10)
+        self.assertIs(registry.get(webhook), batcher)
+
+
+class BufferForBatchTest(SimpleTestCase):
+    """Tests UNITARIOS del alta de submissions en un batch - SIN base de datos"""
+
+    @patch("forms.listeners.webhook_listeners.TaskLogRepository")
+    def test_task_logs_pending_antes_del_buffer(self, repository):
+        repository.return_value.bulk_insert.return_value = [11, 12]
+        batcher = Mock()
+        webhook = SimpleNamespace(id=3)
+        first, second = SimpleNamespace(id=1), SimpleNamespace(id=2)
+
+        buffer_for_batch(batcher, webhook, [(first, "p1"), (second, "p2")])
+
+        [rows] = repository.return_value.bulk_insert.call_args.args
+        self.assertEqual([row[:3] for row in rows], [(1, 3, "pending"), (2, 3, "pending")])
+        batcher.add.assert_called_once_with(webhook, [(first, "p1", 11), (second, "p2", 12)])
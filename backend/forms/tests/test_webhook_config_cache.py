@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from forms.models.forms import WebhookConfig
+from forms.services.webhook_config_cache import WebhookConfigCache
+
+
+class WebhookConfigCacheTest(SimpleTestCase):
+    """Tests UNITARIOS de la caché de webhooks por formulario - SIN base de datos"""
+
+    def setUp(self):
+        self.cache = WebhookConfigCache()
+        self.webhooks = [
+            WebhookConfig(id=1, form_id=10, headers='{"X-Token": "a"}'),
+            WebhookConfig(id=2, form_id=20),
+        ]
+        self.version = 0
+        patcher = patch("forms.services.webhook_config_cache.get_version", lambda ns: self.version)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("forms.services.webhook_config_cache.WebhookConfig.objects")
+        self.objects = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.objects.filter.side_effect = lambda form_id__in, is_active: _Rows(
+            [w for w in self.webhooks if w.form_id in form_id__in]
+        )
+
+    def test_una_consulta_hasta_que_cambia_la_version(self):
+        self.assertEqual(self.cache.get_many([10, 20, 30]), {10: [self.webhooks[0]], 20: [self.webhooks[1]]})
+        self.assertEqual(self.cache.get(10), [self.webhooks[0]])
+        self.assertEqual(self.cache.get(30), [])
+        self.assertEqual(self.objects.filter.call_count, 1)
+
+        self.version = 1
+        self.cache.get(10)
+        self.assertEqual(self.objects.filter.call_count, 2)
+
+    def test_headers_decodificados_una_vez(self):
+        webhook = self.webhooks[0]
+
+        self.assertIs(webhook.headers_dict, webhook.headers_dict)
+        webhook.headers = '{"X-Token": "b"}'
+        self.assertEqual(webhook.headers_dict, {"X-Token": "b"})
+        self.assertEqual(self.webhooks[1].config_dict, {})
+
+
+class _Rows(list):
+    def order_by(self, *fields):
+        return self
@@ -0,0 +1,66 @@
+import datetime
+import json
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+from forms.services.webhook_payload import (
+    SubmissionPayload,
+    TransformCache,
+    WebhookTransform,
+)
+
+
+def make_submission(data):
+    return SimpleNamespace(
+        id=7,
+        form_id=3,
+        form=SimpleNamespace(name="Soportes"),
+        created_at=datetime.datetime(2025, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+        data=data,
+    )
+
+
+class WebhookPayloadTest(SimpleTestCase):
+    """Tests UNITARIOS del cuerpo de los webhooks - SIN base de datos"""
+
+    def setUp(self):
+        self.submission = make_submission('{"nombre":"Ana","doc":"123"}')
+        self.payload = SubmissionPayload(self.submission)
+
+    def test_raw_envia_data_sin_recodificar(self):
+        body = self.payload.body_for(WebhookTransform({}))
+
+        self.assertEqual(body, b'{"nombre":"Ana","doc":"123"}')
+        self.assertIsNone(self.payload._data)
+
+    def test_field_map_y_envelope(self):
+        transform = WebhookTransform(
+            {"payload": "envelope", "field_map": {"doc": "documento"}, "include_unmapped": False}
+        )
+
+        body = json.loads(self.payload.body_for(transform))
+
+        self.assertEqual(body["data"], {"documento": "123"})
+        self.assertEqual(body["submission_id"], 7)
+        self.assertEqual(body["submitted_at"], "2025-01-02T03:04:05+00:00")
+
+    def test_cuerpo_compartido_por_transformacion(self):
+        first = self.payload.body_for(WebhookTransform({"field_map": {"doc": "d"}}))
+        second = self.payload.body_for(WebhookTransform({"field_map": {"doc": "d"}}))
+
+        self.assertIs(first, second)
+        self.assertEqual(json.loads(first), {"nombre": "Ana", "d": "123"})
+
+    def test_config_no_valida(self):
+        with self.assertRaises(ValueError):
+            WebhookTransform({"payload": "xml"})
+
+    def test_cache_hasta_que_cambia_la_config(self):
+        cache = TransformCache()
+        webhook = SimpleNamespace(id=1, config="{}", config_dict={})
+
+        transform = cache.get(webhook)
+        self.assertIs(cache.get(webhook), transform)
+
+        webhook.config, webhook.config_dict = '{"payload":"envelope"}', {"payload": "envelope"}
+        self.assertEqual(cache.get(webhook).mode, "envelope")
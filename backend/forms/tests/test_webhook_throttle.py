@@ -0,0 +1,150 @@
+from django.test import SimpleTestCase
+from forms.models.forms import WebhookConfig
+from forms.services.webhook_throttle import (
+    TokenBucket,
+    WebhookLimits,
+    WebhookThrottle,
+    WebhookThrottleRegistry,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Queue:
+    """delivery_queue de mentira: guarda las tareas y las corre a mano"""
+
+    def __init__(self):
+        self.submitted = []
+        self.scheduled = []
+
+    def submit(self, fn, *args):
+        self.submitted.append((fn, args))
+
+    def schedule(self, delay, fn):
+        self.scheduled.append((delay, fn))
+
+    def run_submitted(self):
+        tasks, self.submitted = self.submitted, []
+        for fn, args in tasks:
+            fn(*args)
+
+    def run_scheduled(self):
+        tasks, self.scheduled = self.scheduled, []
+        for _, fn in tasks:
+            fn()
+
+
+class WebhookLimitsTest(SimpleTestCase):
+    """Tests UNITARIOS de la config de límites de webhooks - SIN base de datos"""
+
+    def test_sin_limites(self):
+        self.assertFalse(WebhookLimits({}).enabled)
+
+    def test_burst_por_defecto(self):
+        limits = WebhookLimits({"rate_limit": {"rate": 2.5}})
+        self.assertEqual((limits.rate, limits.burst), (2.5, 3))
+
+    def test_valores_no_validos(self):
+        for config in (
+            {"rate_limit": 5},
+            {"rate_limit": {"rate": 0}},
+            {"rate_limit": {"rate": "x"}},
+            {"max_in_flight": 0},
+            {"max_in_flight": True},
+        ):
+            with self.subTest(config=config), self.assertRaises(ValueError):
+                WebhookLimits(config)
+
+
+class TokenBucketTest(SimpleTestCase):
+    """Tests UNITARIOS del token bucket - SIN base de datos"""
+
+    def test_rafaga_y_reposicion(self):
+        clock = _Clock()
+        bucket = TokenBucket(rate=2, burst=2, clock=clock)
+        self.assertTrue(bucket.take())
+        self.assertTrue(bucket.take())
+        self.assertFalse(bucket.take())
+        self.assertAlmostEqual(bucket.wait_time(), 0.5)
+
+        clock.now += 10
+        self.assertTrue(bucket.take())
+        self.assertTrue(bucket.take())
+        self.assertFalse(bucket.take())
+
+
+class WebhookThrottleTest(SimpleTestCase):
+    """Tests UNITARIOS de la cola por webhook - SIN base de datos"""
+
+    def setUp(self):
+        self.clock = _Clock()
+        self.queue = _Queue()
+        self.done = []
+
+    def make(self, config):
+        return WebhookThrottle(1, WebhookLimits(config), clock=self.clock, queue=self.queue)
+
+    def test_max_in_flight_encola_y_libera_en_orden(self):
+        throttle = self.make({"max_in_flight": 1})
+        self.assertTrue(throttle.acquire())
+        self.assertFalse(throttle.acquire())
+        throttle.enqueue(self.done.append, "a")
+        throttle.enqueue(self.done.append, "b")
+        self.assertEqual(throttle.snapshot()["queued"], 2)
+        self.assertEqual(self.queue.submitted, [])
+
+        throttle.release()
+        self.queue.run_submitted()
+        self.queue.run_submitted()
+        self.assertEqual(self.done, ["a", "b"])
+        snapshot = throttle.snapshot()
+        self.assertEqual((snapshot["queued"], snapshot["in_flight"]), (0, 0))
+        self.assertEqual((snapshot["throttled"], snapshot["delivered"]), (2, 3))
+
+    def test_rate_limit_programa_el_vaciado(self):
+        throttle = self.make({"rate_limit": {"rate": 1, "burst": 1}})
+        self.assertTrue(throttle.acquire())
+        throttle.release()
+        throttle.enqueue(self.done.append, "a")
+        throttle.enqueue(self.done.append, "b")
+        self.assertEqual([delay for delay, _ in self.queue.scheduled], [1.0])
+
+        self.clock.now += 1
+        self.queue.run_scheduled()
+        self.queue.run_submitted()
+        self.assertEqual(self.done, ["a"])
+
+        self.clock.now += 1
+        self.queue.run_scheduled()
+        self.queue.run_submitted()
+        self.assertEqual(self.done, ["a", "b"])
+        self.assertEqual(self.queue.scheduled, [])
+
+    def test_nuevas_entregas_no_adelantan_a_la_cola(self):
+        throttle = self.make({"max_in_flight": 2})
+        throttle.acquire()
+        throttle.acquire()
+        throttle.enqueue(self.done.append, "a")
+        throttle.release()
+        self.assertFalse(throttle.acquire())
+
+
+class WebhookThrottleRegistryTest(SimpleTestCase):
+    """Tests UNITARIOS del registro de límites por webhook - SIN base de datos"""
+
+    def test_se_recrea_si_cambia_la_config(self):
+        registry = WebhookThrottleRegistry()
+        webhook = WebhookConfig(id=1, config="{}")
+        self.assertIsNone(registry.get(webhook))
+
+        webhook.config = '{"max_in_flight": 2}'
+        throttle = registry.get(webhook)
+        self.assertEqual(throttle.limits.max_in_flight, 2)
+        self.assertIs(registry.get(webhook), throttle)
+        self.assertEqual([s["webhook_id"] for s in registry.snapshot()], [1])
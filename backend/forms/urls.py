@@ -1,7 +1,7 @@
 from django.urls import path, include
 
 from forms.views.documentos_usuarios_cme import DocumentosUsuariosCmeView
-from forms.views.generic import GenericModelCreateView
+from forms.views.generic import GenericModelDetailView, GenericModelListCreateView
 from forms.views.submission_task_log import (
     SubmissionTaskLogByWebhookAPIView,
     SubmissionTaskLogDetailAPIView,
@@ -15,7 +15,11 @@ from forms.views.webhook_config import (
 from forms.views.consecutivos_recibos import ConsecutivosRecibosView
 from forms.views.beneficiarios import BeneficiarioView
 from forms.views.health_check import health_check
-from forms.views.submissions import FormSubmissionCreateAPIView
+from forms.views.metrics import CircuitBreakerView, QueryMetricsView, WebhookThrottleView
+from forms.views.submissions import (
+    FormSubmissionBatchAPIView,
+    FormSubmissionCreateAPIView,
+)
 
 from forms.views.forms import FormViewSet, FormFieldViewSet
 from rest_framework.routers import DefaultRouter
@@ -29,6 +33,11 @@ urlpatterns = [
     path(
         "submissions/", FormSubmissionCreateAPIView.as_view(), name="form-submissions"
     ),
+    path(
+        "submissions/batch/",
+        FormSubmissionBatchAPIView.as_view(),
+        name="form-submissions-batch",
+    ),
     path("beneficiarios/", BeneficiarioView.as_view(), name="beneficiarios"),
     path(
         "consecutivos/recibos/",
@@ -61,11 +70,32 @@ urlpatterns = [
         SubmissionTaskLogByWebhookAPIView.as_view(),
         name="api-task-log-by-webhook",
     ),
-    path("<str:model_name>/", GenericModelCreateView.as_view(), name="generic-create"),
+    path("metrics/queries/", QueryMetricsView.as_view(), name="api-query-metrics"),
+    path(
+        "metrics/circuit-breakers/",
+        CircuitBreakerView.as_view(),
+        name="api-circuit-breakers",
+    ),
+    path(
+        "metrics/webhook-throttles/",
+        WebhookThrottleView.as_view(),
+        name="api-webhook-throttles",
+    ),
     path(
         "documentos/usuarios/cme/",
         DocumentosUsuariosCmeView.as_view(),
         name="post-documentos-usuarios-cme",
     ),
     path("healthz/", health_check, name="health-check"),
+    # Al final: <model_name> captura cualquier segmento
+    path(
+        "<str:model_name>/",
+        GenericModelListCreateView.as_view(),
+        name="generic-list-create",
+    ),
+    path(
+        "<str:model_name>/<int:pk>/",
+        GenericModelDetailView.as_view(),
+        name="generic-detail",
+    ),
 ]
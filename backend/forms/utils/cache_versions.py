@@ -0,0 +1,110 @@
+"""
+Contadores de versión compartidos entre workers de gunicorn.
+
+Cada worker guarda en memoria lo que compila (validadores, mapas de
+formularios, etc.) junto con la versión con la que lo hizo; quien modifica
+los datos llama a bump_version() y los demás workers detectan el cambio en
+la siguiente lectura. Los contadores viven en la caché "shared"
+(FileBasedCache por defecto, ver settings.CACHES), que es obligatoria: con
+una caché por proceso ningún otro worker se enteraría de los cambios.
+
+Cada lectura es un fichero de la caché: dentro de versions_snapshot() (una
+petición, ver CacheVersionsMiddleware, o un lote del drenador del spool)
+cada contador se lee una sola vez y se reutiliza.
+"""
+
+import fcntl
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from django.conf import settings
+from django.core.cache import InvalidCacheBackendError, caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.exceptions import ImproperlyConfigured
+
+CACHE_ALIAS = "shared"
+KEY_PREFIX = "version"
+
+# Versiones ya leídas en el versions_snapshot() en curso; None = fuera de uno
+_snapshot: ContextVar[Optional[Dict[str, int]]] = ContextVar("cache_versions", default=None)
+
+
+def _cache():
+    try:
+        return caches[CACHE_ALIAS]
+    except InvalidCacheBackendError:
+        raise ImproperlyConfigured(
+            f'settings.CACHES["{CACHE_ALIAS}"] es obligatoria para los contadores de versión'
+        )
+
+
+def _key(namespace: str) -> str:
+    return f"{KEY_PREFIX}:{namespace}"
+
+
+@contextmanager
+def _file_lock(namespace: str):
+    """
+    flock sobre un fichero junto a la caché: FileBasedCache.incr es un get
+    + set, y dos incrementos simultáneos podrían escribir el mismo valor.
+    """
+    directory = settings.CACHES[CACHE_ALIAS]["LOCATION"]
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{KEY_PREFIX}-{namespace}.lock")
+    with open(path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+@contextmanager
+def versions_snapshot() -> Iterator[None]:
+    """Dentro del bloque cada contador se lee de la caché una sola vez"""
+    token = _snapshot.set({})
+    try:
+        yield
+    finally:
+        _snapshot.reset(token)
+
+
+def get_version(namespace: str) -> int:
+    snapshot = _snapshot.get()
+    if snapshot is not None and namespace in snapshot:
+        return snapshot[namespace]
+    version = _cache().get(_key(namespace), 0)
+    if snapshot is not None:
+        snapshot[namespace] = version
+    return version
+
+
+def bump_version(namespace: str) -> int:
+    version = _increment(namespace)
+    snapshot = _snapshot.get()
+    if snapshot is not None:
+        # Quien modifica ve su propio cambio en lo que queda de la petición
+        snapshot[namespace] = version
+    return version
+
+
+def _increment(namespace: str) -> int:
+    cache = _cache()
+    key = _key(namespace)
+
+    if isinstance(cache, FileBasedCache):
+        with _file_lock(namespace):
+            version = cache.get(key, 0) + 1
+            cache.set(key, version, timeout=None)
+            return version
+
+    # Otros backends (locmem, redis, memcached) incrementan de forma atómica
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Primera vez: add() no pisa un valor creado por otro worker
+        if cache.add(key, 1, timeout=None):
+            return 1
+        return cache.incr(key)
@@ -1,9 +1,21 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+from django.db import IntegrityError, connections
 from django.db.backends.utils import CursorWrapper
 
 
+def integrity_errors(alias: str = "default") -> Tuple[Type[Exception], ...]:
+    """
+    Clases de IntegrityError a capturar: la de Django y la del driver
+    (pyodbc.IntegrityError en DB2), por si el error llega sin traducir.
+    """
+    return (IntegrityError, connections[alias].Database.IntegrityError)
+
+
 def rows_to_dict(
-    cursor: CursorWrapper, strip: bool = True, single: bool = False
+    cursor: CursorWrapper,
+    strip: bool = True,
+    single: bool = False,
+    column_converters: Optional[Dict[str, Callable[[Any], Any]]] = None,
 ) -> Union[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
     """
     Convierte el resultado de un cursor a lista de diccionarios.
@@ -12,6 +24,8 @@ def rows_to_dict(
         cursor: Cursor después de ejecutar el SQL.
         strip (bool): Si es True, hace strip() a los strings.
         single (bool): Si es True, retorna solo un dict en lugar de lista.
+        column_converters: Conversiones opcionales por columna (en minúsculas),
+            p.ej. {"mrfecate": numeric_date} para fechas guardadas como número.
 
     Returns:
         - Si single=False → List[Dict[str, Any]]
@@ -29,6 +43,14 @@ def rows_to_dict(
             }
         data.append(row_dict)
 
+    if column_converters:
+        converters = [
+            (column, func) for column, func in column_converters.items() if column in columns
+        ]
+        for row_dict in data:
+            for column, func in converters:
+                row_dict[column] = func(row_dict[column])
+
     if single:
         return data[0] if data else None
     return data
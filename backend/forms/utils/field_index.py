@@ -0,0 +1,38 @@
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Largo de FORMSUBMISSION_FIELD_INDEX.VALUE
+MAX_VALUE_LENGTH = 255
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_value(value: Any) -> Optional[str]:
+    """
+    Forma canónica de un valor para el índice y para las búsquedas: texto
+    sin tildes, en minúsculas y con los espacios colapsados. Vacíos -> None.
+    """
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    if isinstance(value, bool):
+        value = int(value)
+    text = unicodedata.normalize("NFKD", str(value))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = _WHITESPACE.sub(" ", text).strip().casefold()
+    return text[:MAX_VALUE_LENGTH] or None
+
+
+def index_entries(fields: Iterable[str], data: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """(campo, valor normalizado) de los campos indexados; las listas dan una entrada por elemento"""
+    entries = []
+    for name in fields:
+        raw = data.get(name)
+        values = raw if isinstance(raw, list) else [raw]
+        seen = set()
+        for value in values:
+            normalized = normalize_value(value)
+            if normalized is not None and normalized not in seen:
+                seen.add(normalized)
+                entries.append((name, normalized))
+    return entries
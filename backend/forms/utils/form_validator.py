@@ -0,0 +1,154 @@
+import datetime
+import re
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+# Tipos cuyo valor debe estar entre las opciones estáticas del campo
+OPTION_TYPES = ("select", "radio", "checkbox")
+
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+REQUIRED_MESSAGE = "Este campo es obligatorio"
+OPTION_MESSAGE = "Opción no válida"
+DATE_MESSAGE = "Fecha no válida, se espera AAAA-MM-DD"
+
+
+class FieldSpec(NamedTuple):
+    """Definición mínima de un campo, independiente del ORM"""
+
+    name: str
+    field_type: str
+    required: bool = False
+    options: Optional[FrozenSet[str]] = None
+    depends_on: Optional[str] = None
+    depends_value: Optional[str] = None
+    indexed: bool = False
+
+
+class CompiledField(NamedTuple):
+    name: str
+    field_type: str
+    required: bool
+    options: Optional[FrozenSet[str]]
+    depends_on: Optional[str]
+    depends_value: Optional[str]
+    # El padre forma parte de un ciclo: se evalúa contra el dato recibido
+    cyclic: bool
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == []
+
+
+def _as_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+def _valid_date(value: str) -> bool:
+    if not _ISO_DATE.match(value):
+        return False
+    try:
+        datetime.date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def topological_order(specs: List[FieldSpec]) -> Tuple[List[FieldSpec], FrozenSet[str]]:
+    """
+    Ordena los campos para que cada uno aparezca después del campo del que
+    depende (Kahn, conservando el orden del formulario entre independientes).
+    Devuelve también los campos que quedaron en un ciclo, que van al final.
+    """
+    names = {spec.name for spec in specs}
+    children: Dict[str, List[FieldSpec]] = {}
+    pending: Dict[str, int] = {}
+
+    for spec in specs:
+        parent = spec.depends_on if spec.depends_on in names and spec.depends_on != spec.name else None
+        pending[spec.name] = 1 if parent else 0
+        if parent:
+            children.setdefault(parent, []).append(spec)
+
+    ready = [spec for spec in specs if pending[spec.name] == 0]
+    ordered: List[FieldSpec] = []
+    i = 0
+    while i < len(ready):
+        spec = ready[i]
+        i += 1
+        ordered.append(spec)
+        for child in children.get(spec.name, ()):
+            pending[child.name] -= 1
+            if pending[child.name] == 0:
+                ready.append(child)
+
+    placed = {spec.name for spec in ordered}
+    cyclic = [spec for spec in specs if spec.name not in placed]
+    self_dependent = {spec.name for spec in specs if spec.depends_on == spec.name}
+    return ordered + cyclic, frozenset(spec.name for spec in cyclic) | self_dependent
+
+
+class FormValidator:
+    """
+    Validador compilado de un formulario: tabla de campos en orden
+    topológico de depends_on, opciones como frozenset. validate() recorre
+    los campos una sola vez: decide si cada campo está activo con el valor
+    ya validado de su padre, quita los inactivos y valida los activos.
+
+    Replica las reglas del formulario web: un campo depende de que el valor
+    de depends_on sea igual a depends_value; si ese campo no existe en el
+    formulario, el dependiente siempre está activo.
+    """
+
+    def __init__(self, specs: Iterable[FieldSpec], strip_unknown: bool = False):
+        specs = list(specs)
+        ordered, cyclic = topological_order(specs)
+        names = {spec.name for spec in specs}
+
+        self.strip_unknown = strip_unknown
+        self.fields: Tuple[CompiledField, ...] = tuple(
+            CompiledField(
+                name=spec.name,
+                field_type=spec.field_type,
+                required=bool(spec.required),
+                options=spec.options or None,
+                depends_on=spec.depends_on if spec.depends_on in names else None,
+                depends_value=spec.depends_value,
+                cyclic=spec.name in cyclic,
+            )
+            for spec in ordered
+        )
+        self.field_names = frozenset(names)
+        # Campos con índice de valores, en el orden del formulario
+        self.indexed_fields: Tuple[str, ...] = tuple(spec.name for spec in specs if spec.indexed)
+
+    def validate(self, data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Devuelve (datos sin campos inactivos, errores por campo)"""
+        if self.strip_unknown:
+            cleaned = {key: value for key, value in data.items() if key in self.field_names}
+        else:
+            cleaned = dict(data)
+        errors: Dict[str, str] = {}
+
+        for field in self.fields:
+            if field.depends_on is not None:
+                source = data if field.cyclic else cleaned
+                if _as_text(source.get(field.depends_on)) != field.depends_value:
+                    cleaned.pop(field.name, None)
+                    continue
+
+            value = cleaned.get(field.name)
+            if _is_empty(value):
+                if field.required:
+                    errors[field.name] = REQUIRED_MESSAGE
+                continue
+
+            if field.options is not None and field.field_type in OPTION_TYPES:
+                if _as_text(value) not in field.options:
+                    errors[field.name] = OPTION_MESSAGE
+            elif field.field_type == "date":
+                if not isinstance(value, str) or not _valid_date(value):
+                    errors[field.name] = DATE_MESSAGE
+
+        return cleaned, errors
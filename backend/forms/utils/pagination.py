@@ -0,0 +1,122 @@
+import base64
+import datetime
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class KeysetPaginator:
+    """
+    Paginación por keyset (seek) sobre un orden estable, p.ej.
+    ("-started_at", "-id"). En lugar de OFFSET/COUNT se filtra a partir de
+    la última fila de la página anterior, así el costo no depende de la
+    profundidad de la página ni del tamaño de la tabla.
+
+    Todas las columnas del orden deben ir en la misma dirección y la última
+    debe ser única (normalmente la PK).
+    """
+
+    def __init__(
+        self,
+        ordering: Sequence[str],
+        default_limit: int = 50,
+        max_limit: int = 500,
+    ):
+        directions = {field.startswith("-") for field in ordering}
+        if len(directions) != 1:
+            raise ValueError("Todas las columnas del orden deben tener la misma dirección")
+
+        self.ordering = tuple(ordering)
+        self.descending = directions.pop()
+        self.fields = tuple(field.lstrip("-") for field in ordering)
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+
+    def get_limit(self, raw_limit: Optional[str]) -> int:
+        if not raw_limit:
+            return self.default_limit
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            raise ValueError("El parámetro limit debe ser un número entero")
+        if limit < 1:
+            raise ValueError("El parámetro limit debe ser mayor que cero")
+        return min(limit, self.max_limit)
+
+    def paginate(
+        self, queryset: QuerySet, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Any], Optional[str], bool]:
+        """
+        Devuelve (filas, next_cursor, has_more) leyendo limit + 1 filas,
+        sin ejecutar COUNT.
+        """
+        queryset = queryset.order_by(*self.ordering)
+        if cursor:
+            queryset = queryset.filter(self._seek_filter(queryset, cursor))
+
+        rows = list(queryset[: limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        next_cursor = self.encode_cursor(rows[-1]) if has_more and rows else None
+        return rows, next_cursor, has_more
+
+    def encode_cursor(self, row: Any) -> str:
+        values = [self._serialize(getattr(row, field)) for field in self.fields]
+        raw = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, queryset: QuerySet, cursor: str) -> List[Any]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (ValueError, TypeError):
+            raise InvalidCursor("Cursor de paginación inválido")
+
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise InvalidCursor("Cursor de paginación inválido")
+
+        opts = queryset.model._meta
+        try:
+            return [
+                self._deserialize(opts.get_field(field), value)
+                for field, value in zip(self.fields, values)
+            ]
+        except Exception:
+            raise InvalidCursor("Cursor de paginación inválido")
+
+    def _seek_filter(self, queryset: QuerySet, cursor: str) -> Q:
+        values = self.decode_cursor(queryset, cursor)
+        lookup = "lt" if self.descending else "gt"
+
+        # (a < x) OR (a = x AND b < y) OR ...
+        condition = Q()
+        for i, field in enumerate(self.fields):
+            clause = Q(**{f"{field}__{lookup}": values[i]})
+            for prev_field, prev_value in zip(self.fields[:i], values[:i]):
+                clause &= Q(**{prev_field: prev_value})
+            condition |= clause
+        return condition
+
+    @staticmethod
+    def _serialize(value: Any) -> Any:
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def _deserialize(model_field, value: Any) -> Any:
+        value = model_field.to_python(value)
+        if isinstance(value, datetime.datetime) and settings.USE_TZ:
+            if timezone.is_naive(value):
+                value = timezone.make_aware(value, datetime.timezone.utc)
+            else:
+                value = value.astimezone(datetime.timezone.utc)
+        return value
@@ -0,0 +1,88 @@
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from dbal.ibmi.instrumentation import QueryRecord, collect_queries
+
+DEFAULTS = {
+    "ENABLED": False,
+    "THRESHOLD": 5,
+    "RAISE": False,
+}
+
+
+class NPlusOneError(AssertionError):
+    """Se detectaron consultas repetidas (patrón N+1)"""
+
+    pass
+
+
+def get_detector_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "NPLUSONE_DETECTOR", {}) or {})
+    return config
+
+
+def find_repeated_queries(
+    queries: Iterable[QueryRecord], threshold: int
+) -> List[Tuple[str, int]]:
+    """
+    Agrupa las consultas por fingerprint y devuelve las SELECT que se
+    repiten `threshold` o más veces, de mayor a menor.
+    """
+    counts = Counter(
+        q.fingerprint
+        for q in queries
+        if q.fingerprint.lstrip("( ").upper().startswith("SELECT")
+    )
+    return [(fp, n) for fp, n in counts.most_common() if n >= threshold]
+
+
+def describe_repeated(repeated: Sequence[Tuple[str, int]], view: Optional[str]) -> str:
+    lines = [f"Posible N+1 en {view or '-'}:"]
+    for fp, n in repeated:
+        lines.append(f"  {n}x {fp}")
+    return "\n".join(lines)
+
+
+class NPlusOneAssertionsMixin:
+    """
+    Helpers para TestCase que fallan cuando un endpoint ejecuta consultas
+    por fila.
+
+    Uso:
+        class MiTest(NPlusOneAssertionsMixin, TestCase):
+            def test_listado(self):
+                with self.assertNoRepeatedQueries():
+                    self.client.get("/api/task-logs/")
+    """
+
+    @contextmanager
+    def assertNoRepeatedQueries(self, threshold: Optional[int] = None):
+        threshold = threshold or get_detector_config()["THRESHOLD"]
+        with collect_queries() as queries:
+            yield queries
+        repeated = find_repeated_queries(queries, threshold)
+        if repeated:
+            raise NPlusOneError(describe_repeated(repeated, view=None))
+
+    def assertQueryCountDoesNotGrow(
+        self, run: Callable[[int], object], sizes: Sequence[int] = (1, 10)
+    ):
+        """
+        Ejecuta `run(size)` con cada tamaño de resultado (el callable se
+        encarga de preparar `size` filas y llamar al endpoint) y falla si el
+        número de consultas cambia con el tamaño.
+        """
+        counts = []
+        for size in sizes:
+            with collect_queries() as queries:
+                run(size)
+            counts.append(len(queries))
+
+        if len(set(counts)) > 1:
+            raise NPlusOneError(
+                "El número de consultas crece con el tamaño del resultado: "
+                + ", ".join(f"{s} filas -> {c}" for s, c in zip(sizes, counts))
+            )
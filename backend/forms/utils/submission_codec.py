@@ -0,0 +1,81 @@
+"""
+Almacenamiento de FORMSUBMISSION.DATA. Por defecto el JSON va como texto en
+el CLOB DATA; con SUBMISSION_STORAGE["CODEC"] = "zlib" o "zstd" los payloads
+de al menos MIN_BYTES se guardan comprimidos en el BLOB DATA_BLOB (y DATA
+queda NULL). El BLOB empieza con una marca de formato de 4 bytes, así que
+filas escritas con distintos códecs conviven y se leen sin configuración.
+"""
+
+import json
+import zlib
+from typing import Optional, Tuple
+
+from django.conf import settings
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependencia opcional
+    zstandard = None
+
+DEFAULTS = {
+    # "json" (sin comprimir), "zlib" o "zstd"
+    "CODEC": "json",
+    # Por debajo de este tamaño comprimir no compensa la cabecera ni el CPU
+    "MIN_BYTES": 1024,
+    "ZLIB_LEVEL": 6,
+    "ZSTD_LEVEL": 3,
+}
+
+ZLIB_MARKER = b"TFZ1"
+ZSTD_MARKER = b"TFS1"
+CODECS = ("json", "zlib", "zstd")
+
+
+def get_storage_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "SUBMISSION_STORAGE", {}) or {})
+    return config
+
+
+def compact_json(data: str) -> bytes:
+    """JSON sin espacios y con claves ordenadas: comprime mejor y es estable"""
+    return json.dumps(
+        json.loads(data), sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def compress(data: str, codec: str, config=None) -> bytes:
+    config = config or get_storage_config()
+    raw = compact_json(data)
+    if codec == "zstd" and zstandard is not None:
+        return ZSTD_MARKER + zstandard.ZstdCompressor(level=config["ZSTD_LEVEL"]).compress(raw)
+    # zstd sin el paquete instalado cae a zlib
+    return ZLIB_MARKER + zlib.compress(raw, config["ZLIB_LEVEL"])
+
+
+def decompress(blob: bytes) -> str:
+    blob = bytes(blob)
+    marker, payload = blob[:4], blob[4:]
+    if marker == ZLIB_MARKER:
+        return zlib.decompress(payload).decode("utf-8")
+    if marker == ZSTD_MARKER:
+        if zstandard is None:
+            raise RuntimeError("DATA_BLOB comprimido con zstd y el paquete zstandard no está instalado")
+        return zstandard.ZstdDecompressor().decompress(payload).decode("utf-8")
+    raise ValueError(f"Formato de DATA_BLOB desconocido: {marker!r}")
+
+
+def pack(data: str, config=None) -> Tuple[Optional[str], Optional[bytes]]:
+    """Valores de (DATA, DATA_BLOB) para guardar el JSON `data`"""
+    config = config or get_storage_config()
+    codec = config["CODEC"]
+    if codec == "json" or data is None or len(data) < config["MIN_BYTES"]:
+        return data, None
+    return None, compress(data, codec, config)
+
+
+def unpack(data: Optional[str], data_blob: Optional[bytes]) -> Optional[str]:
+    """JSON de una fila leída con sus columnas DATA y DATA_BLOB"""
+    if data_blob is not None:
+        return decompress(data_blob)
+    return data
@@ -1,4 +1,5 @@
 from forms.services.beneficiario_service import BeneficiarioService
+from dbal.exceptions import DeadlineExceeded
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -24,6 +25,9 @@ class BeneficiarioView(APIView):
 
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except DeadlineExceeded:
+            # DeadlineMiddleware responde 503
+            raise
         except Exception as e:
             return Response(
                 {"error": "Error interno del servidor"},
@@ -1,6 +1,7 @@
 from forms.services.consecutivos_recibos_service import (
     ConsecutivosRecibosService,
 )
+from dbal.exceptions import DeadlineExceeded
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -26,6 +27,9 @@ class ConsecutivosRecibosView(APIView):
 
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except DeadlineExceeded:
+            # DeadlineMiddleware responde 503
+            raise
         except Exception as e:
             return Response(
                 {"error": "Error interno del servidor"},
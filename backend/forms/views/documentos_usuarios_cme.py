@@ -1,15 +1,25 @@
 import os
 import requests
+from dbal import deadline
+from dbal.exceptions import DeadlineExceeded
+from forms.services.circuit_breaker import CircuitOpen, circuit_breakers, guarded_request
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
+CME_API_URL = "https://cme_php/app_dev.php/api/documentos/usuarios"
+
 
 class DocumentosUsuariosCmeView(APIView):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
     def post(self, req, *args, **kwargs):
+        # Con el circuito de CME abierto no vale la pena descargar los documentos
+        breaker = circuit_breakers.for_url(CME_API_URL)
+        if breaker.is_open():
+            return self._circuit_open_response(CircuitOpen(breaker.host, breaker.retry_after()))
+
         try:
             json_data = req.data
 
@@ -31,7 +41,7 @@ class DocumentosUsuariosCmeView(APIView):
             ]
 
             responses = []
-            api_url = "https://cme_php/app_dev.php/api/documentos/usuarios"
+            api_url = CME_API_URL
 
             for doc_config in documentos_config:
                 doc_url = doc_config["url"]
@@ -61,12 +71,13 @@ class DocumentosUsuariosCmeView(APIView):
                         "Accept-Encoding": "gzip, deflate, br",
                     }
 
-                    response = requests.post(
+                    response = guarded_request(
+                        "POST",
                         api_url,
                         data=form_data,
                         files=files,
                         headers=headers,
-                        timeout=30,
+                        timeout=deadline.timeout_for(30),
                         verify=False,
                     )
 
@@ -88,6 +99,8 @@ class DocumentosUsuariosCmeView(APIView):
                             }
                         )
 
+                except (DeadlineExceeded, CircuitOpen):
+                    raise
                 except requests.exceptions.RequestException as re:
                     responses.append(
                         {
@@ -109,6 +122,11 @@ class DocumentosUsuariosCmeView(APIView):
 
             return self._build_final_response(responses)
 
+        except DeadlineExceeded:
+            # DeadlineMiddleware responde 503
+            raise
+        except CircuitOpen as e:
+            return self._circuit_open_response(e)
         except Exception as e:
             return Response(
                 {"error": f"Error interno: {str(e)}"},
@@ -123,7 +141,9 @@ class DocumentosUsuariosCmeView(APIView):
 
             headers = {"User-Agent": "Django-App/1.0"}
 
-            response = requests.get(url, verify=False, headers=headers, timeout=30)
+            response = guarded_request(
+                "GET", url, verify=False, headers=headers, timeout=deadline.timeout_for(30)
+            )
             response.raise_for_status()
 
             filename = os.path.basename(url.split("?")[0])
@@ -150,9 +170,21 @@ class DocumentosUsuariosCmeView(APIView):
                 response.headers.get("content-type", "application/octet-stream"),
             )
 
+        except (DeadlineExceeded, CircuitOpen):
+            raise
         except Exception as e:
             raise Exception(f"No se pudo descargar el archivo: {str(e)}")
 
+    def _circuit_open_response(self, error):
+        """503 inmediato mientras el circuito del host está abierto"""
+        retry_after = max(1, int(error.retry_after + 0.5))
+        response = Response(
+            {"status": "error", "message": str(error), "retry_after": retry_after},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+        response["Retry-After"] = str(retry_after)
+        return response
+
     def _build_final_response(self, responses):
         """Construye la respuesta final basada en los resultados de las subidas"""
         successful = [r for r in responses if r.get("success")]
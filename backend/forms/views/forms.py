@@ -1,19 +1,135 @@
-from forms.models.forms import Form, FormField
-from rest_framework import viewsets
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from forms.models.forms import Form, FormField, FormFieldForm
+from forms.services.export_service import (
+    CONTENT_TYPES,
+    EXPORT_FORMATS,
+    SubmissionExporter,
+    parse_since,
+)
+from forms.services.field_index_service import search_submissions
+from forms.services.submission_service import SubmissionService
+from forms.utils.pagination import KeysetPaginator
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from forms.serializers.forms import (
     FormSerializer,
     FormFieldSerializer,
     FormSubmissionSerializer,
 )
 
+submission_paginator = KeysetPaginator(ordering=("-id",))
+
+# Parámetros de /submissions/search/ que no son filtros de campo
+SEARCH_RESERVED_PARAMS = ("limit", "cursor", "format")
+
 
 class FormViewSet(viewsets.ModelViewSet):
-    queryset = Form.objects.all().order_by("-created_at")
+    queryset = (
+        Form.objects.all()
+        .prefetch_related(
+            Prefetch(
+                "formfieldform_set",
+                queryset=FormFieldForm.objects.select_related("formfield")
+                .prefetch_related("formfield__options")
+                .order_by("field_order"),
+            )
+        )
+        .order_by("-created_at")
+    )
     serializer_class = FormSerializer
     lookup_field = "slug"
     lookup_url_kwarg = "slug"
 
+    @action(detail=True, methods=["get"], url_path="export", url_name="export")
+    def export(self, request, slug=None):
+        """
+        GET /api/forms/<slug>/export/?output=csv|jsonl&since=<id o fecha>
+
+        Descarga en streaming las submissions del formulario, una columna por
+        campo. Con since= solo las posteriores a ese ID (o desde esa fecha),
+        para exportaciones incrementales.
+        """
+        export_format = request.query_params.get("output", "csv")
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {"error": f"output debe ser uno de {list(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            since = parse_since(request.query_params.get("since"))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        form = get_object_or_404(Form.objects.only("id", "slug", "name"), slug=slug)
+        exporter = SubmissionExporter(form, since=since)
+
+        response = StreamingHttpResponse(
+            exporter.iter_format(export_format), content_type=CONTENT_TYPES[export_format]
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{form.slug}-submissions.{export_format}"'
+        )
+        return response
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="submissions/search",
+        url_name="submissions-search",
+    )
+    def search_submissions(self, request, slug=None):
+        """
+        GET /api/forms/<slug>/submissions/search/?<campo>=<valor>&limit=&cursor=
+
+        Busca submissions por el valor de campos marcados como indexed
+        (FORMSUBMISSION_FIELD_INDEX); la comparación ignora mayúsculas,
+        tildes y espacios sobrantes. Paginado por keyset sobre id descendente.
+        """
+        filters = {
+            key: value
+            for key, value in request.query_params.items()
+            if key not in SEARCH_RESERVED_PARAMS
+        }
+        if not filters:
+            return Response(
+                {"status": "error", "error": "Se requiere al menos un filtro campo=valor"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        form = get_object_or_404(Form.objects.only("id", "slug", "name"), slug=slug)
+        try:
+            queryset = search_submissions(SubmissionService(), form, filters)
+            limit = submission_paginator.get_limit(request.query_params.get("limit"))
+            rows, next_cursor, has_more = submission_paginator.paginate(
+                queryset.only("id", "created_at", "data", "data_blob"),
+                limit=limit,
+                cursor=request.query_params.get("cursor"),
+            )
+        except ValueError as e:
+            return Response(
+                {"status": "error", "error": str(e)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(
+            {
+                "status": "success",
+                "data": [
+                    {
+                        "id": row.id,
+                        "created_at": row.created_at,
+                        "data": SubmissionExporter.decode(row.data),
+                    }
+                    for row in rows
+                ],
+                "next_cursor": next_cursor,
+                "has_more": has_more,
+            }
+        )
+
 
 class FormFieldViewSet(viewsets.ModelViewSet):
-    queryset = FormField.objects.all().order_by("-created_at")
+    queryset = FormField.objects.prefetch_related("options").order_by("-created_at")
     serializer_class = FormFieldSerializer
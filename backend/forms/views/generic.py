@@ -1,16 +1,100 @@
+from django.core.exceptions import ValidationError
 from rest_framework import generics, status
 from rest_framework.response import Response
 from .mixins import DynamicSerializerMixin
+from ..services.generic_model_service import GenericModelService, get_generic_api_config
+from ..utils.pagination import KeysetPaginator
 
+# Parámetros del listado que no son filtros
+LIST_RESERVED_PARAMS = ("limit", "cursor", "fields", "format")
 
-class GenericModelCreateView(DynamicSerializerMixin, generics.CreateAPIView):
+
+class GenericModelProjectionMixin(DynamicSerializerMixin):
+    """Proyección fields=a,b,c sobre el serializer y las columnas leídas"""
+
+    def get_fields_param(self):
+        raw_fields = self.request.query_params.get("fields")
+        if not raw_fields:
+            return None
+
+        available = list(self.get_serializer_class()().fields)
+        fields = [f.strip() for f in raw_fields.split(",") if f.strip()]
+        unknown = [f for f in fields if f not in available]
+        if unknown:
+            raise ValueError(f"Campos no válidos: {unknown}. Disponibles: {available}")
+        return fields
+
+    def project(self, queryset, fields):
+        if fields is None:
+            return queryset
+        pk_name = queryset.model._meta.pk.name
+        return queryset.only(pk_name, *(f for f in fields if f != pk_name))
+
+
+class GenericModelListCreateView(GenericModelProjectionMixin, generics.ListCreateAPIView):
     """
-    Vista genérica para CREAR recursos
+    Vista genérica para LISTAR y CREAR recursos
     Endpoints:
-    - POST /api/{model_name}/
+    - GET /api/{model_name}/ pagina por keyset sobre la PK descendente:
+      limit, cursor (next_cursor de la página anterior), fields=a,b,c y
+      filtros de igualdad solo por los filter_fields declarados en
+      register_model_for_api (otros parámetros devuelven 400)
+    - POST /api/{model_name}/ con un objeto, o con una lista de objetos
+      para crearlos en una sola transacción (ver bulk_create)
     """
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.model_service = GenericModelService()
+
+    def get_queryset(self):
+        return self.get_model_class()._default_manager.all()
+
+    def filter_queryset(self, queryset):
+        allowed = self.get_filter_fields()
+        opts = queryset.model._meta
+        for name, raw_value in self.request.query_params.items():
+            if name in LIST_RESERVED_PARAMS:
+                continue
+            if name not in allowed:
+                raise ValueError(f"Filtro no permitido: {name}. Disponibles: {list(allowed)}")
+            try:
+                value = opts.get_field(name).to_python(raw_value)
+            except ValidationError:
+                raise ValueError(f"Valor no válido para {name}: {raw_value}")
+            queryset = queryset.filter(**{name: value})
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        try:
+            queryset = self.get_queryset()
+            paginator = KeysetPaginator(ordering=(f"-{queryset.model._meta.pk.name}",))
+            fields = self.get_fields_param()
+            limit = paginator.get_limit(request.query_params.get("limit"))
+            rows, next_cursor, has_more = paginator.paginate(
+                self.project(self.filter_queryset(queryset), fields),
+                limit=limit,
+                cursor=request.query_params.get("cursor"),
+            )
+        except ValueError as e:
+            return Response(
+                {"success": False, "error": str(e)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = self.get_serializer(rows, many=True, fields=fields)
+        return Response(
+            {
+                "success": True,
+                "data": serializer.data,
+                "next_cursor": next_cursor,
+                "has_more": has_more,
+            }
+        )
+
     def create(self, request, *args, **kwargs):
+        if isinstance(request.data, list):
+            return self.bulk_create(request)
+
         try:
             response = super().create(request, *args, **kwargs)
             return Response(
@@ -25,3 +109,86 @@ class GenericModelCreateView(DynamicSerializerMixin, generics.CreateAPIView):
             return Response(
                 {"success": False, "error": str(e)}, status=status.HTTP_400_BAD_REQUEST
             )
+
+    def bulk_create(self, request):
+        """
+        Valida cada objeto de la lista e inserta los válidos con INSERT
+        multi-fila en una transacción. Responde 201 si se crean todos, 207 si
+        solo algunos y 400 si ninguno, con el resultado de cada índice.
+        """
+        config = get_generic_api_config()
+        items = request.data
+        if not items:
+            return Response(
+                {"success": False, "error": "Se espera una lista de objetos no vacía"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > config["BULK_MAX_ITEMS"]:
+            return Response(
+                {"success": False, "error": f"Máximo {config['BULK_MAX_ITEMS']} objetos por petición"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            serializer = self.get_serializer(data=items, many=True)
+            valid, errors = serializer.validate_rows()
+
+            results = [None] * len(items)
+            for index, detail in errors:
+                results[index] = {"index": index, "status": 400, "errors": detail}
+
+            created = []
+            if valid:
+                created = self.model_service.bulk_create(
+                    self.get_model_class(),
+                    [data for _, data in valid],
+                    config["BULK_BATCH_SIZE"],
+                )
+            for (index, _), instance in zip(valid, created):
+                results[index] = {"index": index, "status": 201, "id": instance.pk}
+        except Exception as e:
+            return Response(
+                {"success": False, "error": str(e)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not errors:
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+
+        return Response(
+            {
+                "success": not errors,
+                "created": len(created),
+                "failed": len(errors),
+                "results": results,
+            },
+            status=response_status,
+        )
+
+
+class GenericModelDetailView(GenericModelProjectionMixin, generics.RetrieveAPIView):
+    """
+    Vista genérica para OBTENER un recurso por PK
+    Endpoints:
+    - GET /api/{model_name}/{pk}/ (admite fields=a,b,c)
+    """
+
+    projection = None
+
+    def get_queryset(self):
+        return self.project(self.get_model_class()._default_manager.all(), self.projection)
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            self.projection = self.get_fields_param()
+            instance = self.get_object()
+        except ValueError as e:
+            return Response(
+                {"success": False, "error": str(e)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = self.get_serializer(instance, fields=self.projection)
+        return Response({"success": True, "data": serializer.data})
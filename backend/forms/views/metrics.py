@@ -0,0 +1,95 @@
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from dbal.ibmi import instrumentation
+from forms.services.circuit_breaker import circuit_breakers, get_breaker_config
+from forms.services.webhook_delivery import delivery_queue
+from forms.services.webhook_throttle import webhook_throttles
+
+
+class MetricsView(APIView):
+    """
+    Base de las APIs de métricas: muestran datos internos del proceso, así
+    que solo las consultan usuarios staff. GET solo lee; donde se puede
+    reiniciar, es con POST.
+    """
+
+    permission_classes = [IsAdminUser]
+
+
+class QueryMetricsView(MetricsView):
+    """
+    API para consultar los histogramas de consultas SQL por fingerprint
+    acumulados en este proceso (worker).
+
+    GET: parámetro limit, número máximo de fingerprints (ordenados por
+    tiempo total).
+    POST: devuelve lo acumulado (mismo limit) y lo reinicia.
+    """
+
+    def get(self, request):
+        return Response(self.metrics(request))
+
+    def post(self, request):
+        data = self.metrics(request)
+        instrumentation.registry.reset()
+        return Response(data)
+
+    @staticmethod
+    def metrics(request):
+        try:
+            limit = int(request.query_params.get("limit", 50))
+        except ValueError:
+            limit = 50
+
+        return {
+            "status": "success",
+            "config": instrumentation.get_config(),
+            "dropped": instrumentation.registry.dropped,
+            "data": instrumentation.registry.snapshot(limit=limit),
+        }
+
+
+class CircuitBreakerView(MetricsView):
+    """
+    API para consultar el estado de los circuit breakers por host de este
+    proceso (worker) y cuántas entregas de webhook esperan reintento.
+
+    POST: devuelve el estado y cierra y olvida todos los circuitos.
+    """
+
+    def get(self, request):
+        return Response(self.state())
+
+    def post(self, request):
+        data = self.state()
+        circuit_breakers.reset()
+        return Response(data)
+
+    @staticmethod
+    def state():
+        return {
+            "status": "success",
+            "config": get_breaker_config(),
+            "delayed": delivery_queue.delayed_count,
+            "data": circuit_breakers.snapshot(),
+        }
+
+
+class WebhookThrottleView(MetricsView):
+    """
+    API para consultar los límites de entrega por webhook (rate_limit,
+    max_in_flight) de este proceso (worker): llamadas en curso, entregas en
+    cola ahora y total de entregas que tuvieron que esperar.
+    """
+
+    def get(self, request):
+        data = webhook_throttles.snapshot()
+        return Response(
+            {
+                "status": "success",
+                "throttled": sum(item["throttled"] for item in data),
+                "queued": sum(item["queued"] for item in data),
+                "data": data,
+            }
+        )
@@ -1,6 +1,23 @@
 # forms/views/mixins.py
-from rest_framework import serializers
-from ..decorators import get_model_by_name, get_registered_models
+import threading
+from typing import Dict
+
+from rest_framework import status
+from rest_framework.response import Response
+from ..decorators import get_model_by_name, get_model_filter_fields, get_registered_models
+from ..serializers.forms import (
+    BulkListSerializer,
+    CachedFieldsModelSerializer,
+    DynamicFieldsMixin,
+)
+from ..services.idempotency_service import (
+    IdempotencyConflict,
+    IdempotencyKeyReused,
+    IdempotencyService,
+    fingerprint_request,
+    get_idempotency_config,
+)
+from ..services.submission_spool import db_health, is_database_unavailable
 
 
 class DynamicSerializerMixin:
@@ -29,17 +46,143 @@ class DynamicSerializerMixin:
 
         return model_class
 
+    def get_filter_fields(self):
+        return get_model_filter_fields(self.kwargs.get("model_name"))
+
     def get_serializer_class(self):
         """
-        Crea un serializer dinámico para el modelo específico
+        Serializer dinámico del modelo, creado una vez por modelo registrado
         """
-        model_class = self.get_model_class()
+        return dynamic_serializers.get(self.get_model_class())
+
+
+class DynamicSerializerCache:
+    """
+    Serializers generados para los modelos registrados con
+    register_model_for_api. Se crean la primera vez que se piden y se
+    reutilizan en las siguientes peticiones, junto con los campos ya
+    construidos (CachedFieldsModelSerializer).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._serializers: Dict[type, type] = {}
+
+    def get(self, model_class) -> type:
+        serializer_class = self._serializers.get(model_class)
+        if serializer_class is not None:
+            return serializer_class
+
+        with self._lock:
+            serializer_class = self._serializers.get(model_class)
+            if serializer_class is None:
+                serializer_class = type(
+                    f"Dynamic{model_class.__name__}Serializer",
+                    (DynamicFieldsMixin, CachedFieldsModelSerializer),
+                    {
+                        "Meta": type(
+                            "Meta",
+                            (),
+                            {
+                                "model": model_class,
+                                "fields": "__all__",
+                                "list_serializer_class": BulkListSerializer,
+                            },
+                        )
+                    },
+                )
+                self._serializers[model_class] = serializer_class
+        return serializer_class
+
+    def clear(self) -> None:
+        with self._lock:
+            self._serializers.clear()
+
+
+dynamic_serializers = DynamicSerializerCache()
+
+
+class IdempotentMixin:
+    """
+    Soporte del header Idempotency-Key para vistas POST. La vista llama a
+    self.idempotent(request, handler): sin header se ejecuta el handler tal
+    cual; con header, un reintento devuelve la respuesta original (header
+    Idempotent-Replayed) sin ejecutarlo otra vez.
+
+    Solo se guardan las respuestas 2xx; si el handler falla la clave se
+    libera para que el cliente pueda reintentar.
+
+    Con degrade_when_unavailable, si DB2 no responde al reservar la clave el
+    handler se ejecuta igual; la clave queda en request.idempotency para que
+    el handler la guarde con lo que encole (ver submission_spool).
+    """
+
+    idempotency_scope = None
+    degrade_when_unavailable = False
+
+    def idempotent(self, request, handler, *args, **kwargs):
+        config = get_idempotency_config()
+        key = request.headers.get(config["HEADER"])
+        if not key:
+            return handler(request, *args, **kwargs)
+
+        key = key.strip()
+        if not key or len(key) > config["MAX_KEY_LENGTH"]:
+            return Response(
+                {"error": f"{config['HEADER']} inválido"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        service = IdempotencyService(self.idempotency_scope)
+        request_hash = fingerprint_request(request.data, request.FILES)
+        request.idempotency = (self.idempotency_scope, key, request_hash)
+
+        try:
+            stored = service.lookup_cached(key, request_hash)
+            record = None
+            if stored is None:
+                record, stored = service.reserve(key, request_hash)
+        except IdempotencyKeyReused:
+            return Response(
+                {"error": f"{config['HEADER']} ya usado con otro contenido"},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        except IdempotencyConflict:
+            return Response(
+                {"error": "Una petición con la misma clave sigue en proceso"},
+                status=status.HTTP_409_CONFLICT,
+            )
+        except Exception as e:
+            if not (self.degrade_when_unavailable and is_database_unavailable(e)):
+                raise
+            db_health.mark_unavailable()
+            return handler(request, *args, **kwargs)
+
+        if stored is not None:
+            return Response(
+                stored.body, status=stored.status, headers={"Idempotent-Replayed": "true"}
+            )
 
-        # Crear serializer dinámico
-        DynamicSerializer = type(
-            f"Dynamic{model_class.__name__}Serializer",
-            (serializers.ModelSerializer,),
-            {"Meta": type("Meta", (), {"model": model_class, "fields": "__all__"})},
-        )
+        try:
+            response = handler(request, *args, **kwargs)
+        except BaseException:
+            service.release(record)
+            raise
 
-        return DynamicSerializer
+        try:
+            if 200 <= response.status_code < 300:
+                service.complete(
+                    record,
+                    response.status_code,
+                    response.data,
+                    submission_id=getattr(response, "submission_id", None),
+                )
+            else:
+                service.release(record)
+        except Exception as e:
+            if not (self.degrade_when_unavailable and is_database_unavailable(e)):
+                raise
+            # El trabajo ya se hizo: la reserva queda "processing" hasta que
+            # venza o el drenador del spool la complete
+            db_health.mark_unavailable()
+        return response
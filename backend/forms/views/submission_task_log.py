@@ -1,38 +1,162 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+import datetime
+
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from forms.models.forms import WebhookConfig, SubmissionTaskLog
 from forms.serializers.forms import SubmissionTaskLogSerializer
+from forms.utils.pagination import KeysetPaginator
 import json
 
+# Columnas que necesita cada campo del serializer, para proyectar con only()
+# y hacer JOIN solo con las tablas que se van a mostrar.
+TASK_LOG_FIELD_SOURCES = {
+    "id": ("id",),
+    "submission": ("submission",),
+    "submission_info": ("submission__form__name",),
+    "webhook": ("webhook",),
+    "webhook_name": ("webhook__name",),
+    "status": ("status",),
+    "attempt": ("attempt",),
+    "response_data": ("response_data",),
+    "response_dict": ("response_data",),
+    "error_message": ("error_message",),
+    "started_at": ("started_at",),
+    "completed_at": ("completed_at",),
+}
+
+task_log_paginator = KeysetPaginator(ordering=("-started_at", "-id"))
+
+
+def parse_task_log_fields(raw_fields):
+    """
+    Convierte el parámetro fields=a,b,c en lista validada.
+    Sin parámetro se devuelven todos los campos.
+    """
+    if not raw_fields:
+        return list(TASK_LOG_FIELD_SOURCES)
+
+    fields = [f.strip() for f in raw_fields.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in TASK_LOG_FIELD_SOURCES]
+    if unknown:
+        raise ValueError(
+            f"Campos no válidos: {unknown}. Disponibles: {list(TASK_LOG_FIELD_SOURCES)}"
+        )
+    return fields
+
+
+def project_task_logs(queryset, fields):
+    """Aplica only()/select_related() según los campos solicitados"""
+    columns = {"id", "started_at"}
+    for field in fields:
+        columns.update(TASK_LOG_FIELD_SOURCES[field])
+
+    related = []
+    if "submission__form__name" in columns:
+        related.append("submission__form")
+    if "webhook__name" in columns:
+        related.append("webhook")
+
+    if related:
+        queryset = queryset.select_related(*related)
+    return queryset.only(*columns)
+
+
+def parse_time_bound(name, raw_value):
+    """Acepta fecha (YYYY-MM-DD) o fecha-hora ISO 8601; devuelve UTC"""
+    value = parse_datetime(raw_value)
+    if value is None:
+        date_value = parse_date(raw_value)
+        if date_value is None:
+            raise ValueError(f"El parámetro {name} debe ser una fecha ISO 8601")
+        value = datetime.datetime.combine(date_value, datetime.time.min)
+    if timezone.is_naive(value):
+        return timezone.make_aware(value, datetime.timezone.utc)
+    # STARTED_AT se guarda en UTC: 10:00-05:00 se compara como 15:00
+    return value.astimezone(datetime.timezone.utc)
+
+
+def filter_task_logs(task_logs, params):
+    """
+    Filtros comunes de los listados. Las combinaciones soportadas están
+    cubiertas por los índices de SUBMISSION_TASK_LOG (ver sql/sentences.sql):
+    (WEBHOOK_CONFIG_ID, STATUS, STARTED_AT, ID), (WEBHOOK_CONFIG_ID,
+    STARTED_AT, ID), (FORMSUBMISSION_ID, STARTED_AT, ID) y (STARTED_AT, ID).
+    """
+    for name, lookup in (("webhook_id", "webhook_id"), ("submission_id", "submission_id")):
+        value = params.get(name)
+        if value:
+            if not value.isdigit():
+                raise ValueError(f"El parámetro {name} debe ser numérico")
+            task_logs = task_logs.filter(**{lookup: int(value)})
+
+    status_filter = params.get("status")
+    if status_filter:
+        valid_statuses = {choice for choice, _ in SubmissionTaskLog.STATUS_CHOICES}
+        if status_filter not in valid_statuses:
+            raise ValueError(f"Estado no válido. Disponibles: {sorted(valid_statuses)}")
+        task_logs = task_logs.filter(status=status_filter)
+
+    started_after = params.get("started_after")
+    if started_after:
+        task_logs = task_logs.filter(
+            started_at__gte=parse_time_bound("started_after", started_after)
+        )
+
+    started_before = params.get("started_before")
+    if started_before:
+        task_logs = task_logs.filter(
+            started_at__lt=parse_time_bound("started_before", started_before)
+        )
+
+    return task_logs
+
+
+def paginated_task_logs_response(request, task_logs):
+    """Respuesta paginada por keyset (started_at, id) sin COUNT"""
+    try:
+        task_logs = filter_task_logs(task_logs, request.GET)
+        fields = parse_task_log_fields(request.GET.get("fields"))
+        limit = task_log_paginator.get_limit(request.GET.get("limit"))
+        rows, next_cursor, has_more = task_log_paginator.paginate(
+            project_task_logs(task_logs, fields),
+            limit=limit,
+            cursor=request.GET.get("cursor"),
+        )
+    except ValueError as e:
+        return Response(
+            {"status": "error", "error": str(e)}, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    serializer = SubmissionTaskLogSerializer(rows, many=True, fields=fields)
+    return Response(
+        {
+            "status": "success",
+            "data": serializer.data,
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        }
+    )
+
 
 class SubmissionTaskLogListAPIView(APIView):
     """
     API para listar y crear SubmissionTaskLog
+
+    GET pagina por keyset sobre (started_at, id) descendente:
+    - limit: tamaño de página (máx. 500)
+    - cursor: valor next_cursor de la página anterior
+    - fields: proyección, p.ej. fields=id,status,started_at
+
+    Filtros opcionales: webhook_id, status, submission_id,
+    started_after (inclusive) y started_before (exclusivo).
     """
 
     def get(self, request):
-        task_logs = SubmissionTaskLog.objects.select_related(
-            "submission", "webhook"
-        ).all()
-
-        # Filtros opcionales
-        webhook_id = request.GET.get("webhook_id")
-        status_filter = request.GET.get("status")
-        submission_id = request.GET.get("submission_id")
-
-        if webhook_id:
-            task_logs = task_logs.filter(webhook_id=webhook_id)
-        if status_filter:
-            task_logs = task_logs.filter(status=status_filter)
-        if submission_id:
-            task_logs = task_logs.filter(submission_id=submission_id)
-
-        serializer = SubmissionTaskLogSerializer(task_logs, many=True)
-        return Response(
-            {"status": "success", "count": task_logs.count(), "data": serializer.data}
-        )
+        return paginated_task_logs_response(request, SubmissionTaskLog.objects.all())
 
     def post(self, request):
         serializer = SubmissionTaskLogSerializer(data=request.data)
@@ -59,7 +183,10 @@ class SubmissionTaskLogDetailAPIView(APIView):
     """
 
     def get_object(self, pk):
-        return get_object_or_404(SubmissionTaskLog, pk=pk)
+        return get_object_or_404(
+            SubmissionTaskLog.objects.select_related("submission__form", "webhook"),
+            pk=pk,
+        )
 
     def get(self, request, pk):
         task_log = self.get_object(pk)
@@ -108,18 +235,10 @@ class SubmissionTaskLogDetailAPIView(APIView):
 class SubmissionTaskLogByWebhookAPIView(APIView):
     """
     API para obtener logs de tareas por webhook
+
+    Misma paginación y filtros que SubmissionTaskLogListAPIView.
     """
 
     def get(self, request, webhook_id):
         task_logs = SubmissionTaskLog.objects.filter(webhook_id=webhook_id)
-
-        status_filter = request.GET.get("status")
-        if status_filter:
-            task_logs = task_logs.filter(status=status_filter)
-
-        task_logs = task_logs.order_by("-started_at")
-
-        serializer = SubmissionTaskLogSerializer(task_logs, many=True)
-        return Response(
-            {"status": "success", "count": task_logs.count(), "data": serializer.data}
-        )
+        return paginated_task_logs_response(request, task_logs)
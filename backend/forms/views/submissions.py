@@ -1,18 +1,50 @@
 import json
+from dbal import deadline
+from forms.services.idempotency_service import IdempotencyKeyReused
+from forms.services.submission_service import (
+    RESERVED_KEYS,
+    BatchItem,
+    FormNotFound,
+    SubmissionService,
+    SubmissionValidationError,
+    get_ingest_config,
+)
+from forms.services.submission_spool import (
+    SPOOL_SCOPE,
+    db_health,
+    get_spool_config,
+    is_database_unavailable,
+    submission_spool,
+)
+from forms.services.webhook_delivery import enqueue_submissions
 from forms.services.uploaded_file import UploadedFile
+from forms.views.mixins import IdempotentMixin
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from forms.models.forms import Form
-from forms.serializers.forms import FormSubmissionSerializer
 
 
-class FormSubmissionCreateAPIView(APIView):
+class FormSubmissionCreateAPIView(IdempotentMixin, APIView):
+    """
+    POST /api/submissions/
+
+    Si DB2 no responde en SUBMISSION_SPOOL["DB_TIMEOUT"] segundos la
+    submission se guarda en el spool local y se responde 202 con su número
+    de cola; drain_submission_spool la inserta cuando DB2 vuelve.
+    """
+
+    idempotency_scope = "submissions"
+    degrade_when_unavailable = True
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.uploaded_file = UploadedFile()
+        self.submission_service = SubmissionService()
 
     def post(self, request, *args, **kwargs):
+        return self.idempotent(request, self.create_submission, *args, **kwargs)
+
+    def create_submission(self, request, *args, **kwargs):
         form_id = request.data.get("form_id") or request.data.get("form")
 
         if not form_id:
@@ -20,28 +52,193 @@ class FormSubmissionCreateAPIView(APIView):
                 {"error": "form_id es obligatorio"}, status=status.HTTP_400_BAD_REQUEST
             )
 
+        spool_config = get_spool_config()
+        spool_enabled = spool_config["ENABLED"]
+        db_timeout = spool_config["DB_TIMEOUT"] if spool_enabled else None
+        submission_data = self.submission_service.build_data(
+            request.data, {key: request.FILES.getlist(key) for key in request.FILES}
+        )
+
+        if spool_enabled and not db_health.is_available():
+            return self.spool_submission(request, form_id, submission_data, validated=False)
+
+        # Se valida antes de subir los archivos: los campos inactivos o una
+        # submission rechazada no dejan archivos huérfanos
         try:
-            form = Form.objects.get(id=form_id)
-        except Form.DoesNotExist:
+            with deadline.deadline(db_timeout):
+                form = self.submission_service.resolve_form(form_id)
+                submission_data = self.submission_service.validate(form, submission_data)
+        except FormNotFound:
             return Response(
                 {"error": "Formulario no encontrado"}, status=status.HTTP_404_NOT_FOUND
             )
+        except SubmissionValidationError as e:
+            return Response(
+                {"error": str(e), "fields": e.errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except Exception as e:
+            if not (spool_enabled and is_database_unavailable(e)):
+                raise
+            db_health.mark_unavailable()
+            return self.spool_submission(request, form_id, submission_data, validated=False)
 
-        submission_data = {}
+        uploaded = self.upload_files(request, submission_data)
+
+        try:
+            submission = self.submission_service.create(form, submission_data, db_timeout)
+        except FormNotFound:
+            # El formulario se borró entre la validación y el INSERT
+            self.uploaded_file.delete_uploaded_files(uploaded)
+            return Response(
+                {"error": "Formulario no encontrado"}, status=status.HTTP_404_NOT_FOUND
+            )
+        except Exception as e:
+            if not (spool_enabled and is_database_unavailable(e)):
+                raise
+            db_health.mark_unavailable()
+            return self.spool_submission(
+                request, form.id, submission_data, validated=True, uploaded=True
+            )
 
-        for key, value in request.data.items():
-            if key not in ["form_id", "form"]:
-                submission_data[key] = value
+        response = Response(
+            self.submission_service.to_representation(submission),
+            status=status.HTTP_201_CREATED,
+        )
+        response.submission_id = submission.id
+        return response
 
+    def upload_files(self, request, submission_data):
+        """Sube los archivos de los campos aceptados y devuelve todas sus URLs"""
+        uploaded = []
         for key in request.FILES:
-            files = request.FILES.getlist(key)
-            urls = self.uploaded_file.handle_uploaded_files(files)
+            if key not in submission_data:
+                continue
+            urls = self.uploaded_file.handle_uploaded_files(request.FILES.getlist(key))
             submission_data[key] = urls[0] if len(urls) == 1 else urls
+            uploaded.extend(urls)
+        return uploaded
+
+    def spool_submission(self, request, form_id, submission_data, validated, uploaded=False):
+        """Encola en el spool local y responde 202 (sin validar si DB2 no dio el formulario)"""
+        try:
+            form_id = int(form_id)
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "Formulario no encontrado"}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        scope, key, request_hash = getattr(request, "idempotency", None) or (
+            SPOOL_SCOPE, None, None
+        )
+        try:
+            # Un reintento de algo ya encolado no vuelve a subir los archivos
+            seq = submission_spool.find(scope, key, request_hash) if key else None
+            created = seq is None
+            if created:
+                if not uploaded:
+                    self.upload_files(request, submission_data)
+                seq, created = submission_spool.append(
+                    form_id,
+                    submission_data,
+                    validated,
+                    key=key,
+                    scope=scope,
+                    request_hash=request_hash,
+                )
+        except IdempotencyKeyReused:
+            return Response(
+                {"error": "Idempotency-Key ya usado con otro contenido"},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+
+        return Response(
+            {"status": "queued", "spool_id": seq, "form": form_id},
+            status=status.HTTP_202_ACCEPTED,
+            headers=None if created else {"Idempotent-Replayed": "true"},
+        )
+
+
+class FormSubmissionBatchAPIView(IdempotentMixin, APIView):
+    """
+    POST /api/submissions/batch/
+
+    Crea varias submissions (de uno o varios formularios) en una petición:
+    - JSON: [{"form_id": 1, "data": {...}}, ...] o {"submissions": [...]};
+      los campos también pueden ir al nivel del ítem en lugar de en "data".
+    - multipart: "submissions" con el mismo JSON y los archivos en partes
+      llamadas "<índice>.<campo>", p.ej. "0.soporte".
+
+    Responde 201 si todas se crean, 207 si solo algunas y 400 si ninguna,
+    con el resultado de cada ítem. Los webhooks se encolan en segundo plano.
+    """
+
+    idempotency_scope = "submissions-batch"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.uploaded_file = UploadedFile()
+        self.submission_service = SubmissionService()
+
+    def post(self, request, *args, **kwargs):
+        return self.idempotent(request, self.create_batch, *args, **kwargs)
+
+    def create_batch(self, request, *args, **kwargs):
+        try:
+            items = self.parse_items(request)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        max_items = get_ingest_config()["BATCH_MAX_ITEMS"]
+        if len(items) > max_items:
+            return Response(
+                {"error": f"Máximo {max_items} submissions por lote"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results, submissions = self.submission_service.create_batch(items, self.uploaded_file)
+        enqueue_submissions(submissions)
 
-        serializer = FormSubmissionSerializer(
-            data={"form": form.id, "data": json.dumps(submission_data)}
+        if len(submissions) == len(items):
+            response_status = status.HTTP_201_CREATED
+        elif submissions:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+
+        return Response(
+            {"created": len(submissions), "failed": len(items) - len(submissions), "results": results},
+            status=response_status,
         )
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
 
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    @staticmethod
+    def parse_items(request):
+        payload = request.data
+        if hasattr(payload, "getlist") and "submissions" in payload:
+            # multipart: el lote viaja como JSON en un campo de texto
+            try:
+                payload = json.loads(payload["submissions"])
+            except (TypeError, ValueError):
+                raise ValueError("El campo submissions debe ser un JSON válido")
+        if isinstance(payload, dict):
+            payload = payload.get("submissions")
+        if not isinstance(payload, list) or not payload:
+            raise ValueError("Se espera una lista de submissions no vacía")
+
+        files = {}
+        for part in request.FILES:
+            index, _, field = part.partition(".")
+            if not index.isdigit() or not field:
+                raise ValueError(f"Parte de archivo inválida: {part} (se espera <índice>.<campo>)")
+            files.setdefault(int(index), {})[field] = request.FILES.getlist(part)
+
+        items = []
+        for index, raw in enumerate(payload):
+            if not isinstance(raw, dict):
+                raise ValueError(f"La submission {index} debe ser un objeto")
+            form_id = raw.get("form_id") or raw.get("form")
+            data = raw.get("data")
+            if not isinstance(data, dict):
+                data = {key: value for key, value in raw.items() if key not in RESERVED_KEYS}
+            items.append(BatchItem(form_id, data, files.get(index, {})))
+        return items
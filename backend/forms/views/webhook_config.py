@@ -4,6 +4,7 @@ from rest_framework import status
 from django.shortcuts import get_object_or_404
 from forms.models.forms import WebhookConfig, SubmissionTaskLog
 from forms.serializers.forms import WebhookConfigSerializer
+from forms.services.webhook_config_cache import invalidate_webhook_configs
 import json
 
 
@@ -21,6 +22,7 @@ class WebhookConfigListAPIView(APIView):
         serializer = WebhookConfigSerializer(data=request.data)
         if serializer.is_valid():
             webhook = serializer.save()
+            invalidate_webhook_configs()
             return Response(
                 {
                     "status": "success",
@@ -42,7 +44,7 @@ class WebhookConfigDetailAPIView(APIView):
     """
 
     def get_object(self, pk):
-        return get_object_or_404(WebhookConfig, pk=pk)
+        return get_object_or_404(WebhookConfig.objects.select_related("form"), pk=pk)
 
     def get(self, request, pk):
         webhook = self.get_object(pk)
@@ -54,6 +56,7 @@ class WebhookConfigDetailAPIView(APIView):
         serializer = WebhookConfigSerializer(webhook, data=request.data)
         if serializer.is_valid():
             updated_webhook = serializer.save()
+            invalidate_webhook_configs()
             return Response(
                 {
                     "status": "success",
@@ -72,6 +75,7 @@ class WebhookConfigDetailAPIView(APIView):
         serializer = WebhookConfigSerializer(webhook, data=request.data, partial=True)
         if serializer.is_valid():
             updated_webhook = serializer.save()
+            invalidate_webhook_configs()
             return Response(
                 {
                     "status": "success",
@@ -89,6 +93,7 @@ class WebhookConfigDetailAPIView(APIView):
         webhook = self.get_object(pk)
         webhook_name = webhook.name
         webhook.delete()
+        invalidate_webhook_configs()
         return Response(
             {
                 "status": "success",
@@ -104,7 +109,9 @@ class WebhookConfigByFormAPIView(APIView):
     """
 
     def get(self, request, form_id):
-        webhooks = WebhookConfig.objects.filter(form_id=form_id, is_active=True)
+        webhooks = WebhookConfig.objects.select_related("form").filter(
+            form_id=form_id, is_active=True
+        )
         serializer = WebhookConfigSerializer(webhooks, many=True)
         return Response(
             {"status": "success", "count": webhooks.count(), "data": serializer.data}
@@ -0,0 +1,13 @@
+"""
+Hooks de gunicorn (las opciones de arranque están en docker/Dockerfile).
+"""
+
+
+def worker_exit(server, worker):
+    """
+    Al reciclar o apagar un worker se envían los batches de webhooks a medio
+    juntar y se espera a las entregas encoladas en sus hilos.
+    """
+    from forms.services.webhook_batch import drain_deliveries
+
+    drain_deliveries()
@@ -91,5 +91,129 @@ CREATE TABLE TIFORMS.SUBMISSION_TASK_LOG (
     FOREIGN KEY (WEBHOOK_CONFIG_ID) REFERENCES TIFORMS.WEBHOOK_CONFIG(ID) ON DELETE CASCADE
 );
 
+-- Índices de los listados de SUBMISSION_TASK_LOG. Todos terminan en
+-- (STARTED_AT DESC, ID DESC), el orden de la paginación por keyset, para
+-- que cada página se lea del índice sin ordenar ni contar la tabla.
+
+-- Listado general y filtros por rango de STARTED_AT
+CREATE INDEX "TIFORMS"."TASK_LOG_STARTED_IDX"
+ON "TIFORMS"."SUBMISSION_TASK_LOG" ("STARTED_AT" DESC, "ID" DESC);
+
+-- /task-logs/by-webhook/<id>/ y ?webhook_id=
+CREATE INDEX "TIFORMS"."TASK_LOG_WEBHOOK_IDX"
+ON "TIFORMS"."SUBMISSION_TASK_LOG" ("WEBHOOK_CONFIG_ID", "STARTED_AT" DESC, "ID" DESC);
+
+-- webhook + status
+CREATE INDEX "TIFORMS"."TASK_LOG_WEBHOOK_STATUS_IDX"
+ON "TIFORMS"."SUBMISSION_TASK_LOG" ("WEBHOOK_CONFIG_ID", "STATUS", "STARTED_AT" DESC, "ID" DESC);
+
+-- ?submission_id= (también usado por el ON DELETE CASCADE)
+CREATE INDEX "TIFORMS"."TASK_LOG_SUBMISSION_IDX"
+ON "TIFORMS"."SUBMISSION_TASK_LOG" ("FORMSUBMISSION_ID", "STARTED_AT" DESC, "ID" DESC);
+
+-- Tablas de archivo para `manage.py archive_submissions --mode table`.
+-- Mismas columnas que las tablas calientes, sin identidad ni claves foráneas.
+CREATE TABLE TIFORMS.FORMSUBMISSION_ARCHIVE (
+    ID INTEGER NOT NULL PRIMARY KEY,
+    FORM_ID INTEGER NOT NULL,
+    DATA CLOB,
+    CREATED_AT TIMESTAMP,
+    ARCHIVED_AT TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX "TIFORMS"."FORMSUBMISSION_ARCHIVE_FORM_IDX"
+ON "TIFORMS"."FORMSUBMISSION_ARCHIVE" ("FORM_ID", "CREATED_AT");
+
+CREATE TABLE TIFORMS.SUBMISSION_TASK_LOG_ARCHIVE (
+    ID INTEGER NOT NULL PRIMARY KEY,
+    FORMSUBMISSION_ID INTEGER NOT NULL,
+    WEBHOOK_CONFIG_ID INTEGER NOT NULL,
+    STATUS VARCHAR(20) NOT NULL,
+    ATTEMPT INTEGER NOT NULL,
+    RESPONSE_DATA VARCHAR(4000),
+    ERROR_MESSAGE CLOB,
+    STARTED_AT TIMESTAMP NOT NULL,
+    COMPLETED_AT TIMESTAMP,
+    ARCHIVED_AT TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX "TIFORMS"."TASK_LOG_ARCHIVE_SUBMISSION_IDX"
+ON "TIFORMS"."SUBMISSION_TASK_LOG_ARCHIVE" ("FORMSUBMISSION_ID");
+
+-- Índices para seleccionar los lotes a archivar por antigüedad
+CREATE INDEX "TIFORMS"."FORMSUBMISSION_FORM_CREATED_IDX"
+ON "TIFORMS"."FORMSUBMISSION" ("FORM_ID", "CREATED_AT", "ID");
+
+-- Exportación por formulario (GET /api/forms/<slug>/export/?since=<id>):
+-- lotes por keyset FORM_ID = ? AND ID > ? ORDER BY ID
+CREATE INDEX "TIFORMS"."FORMSUBMISSION_FORM_ID_IDX"
+ON "TIFORMS"."FORMSUBMISSION" ("FORM_ID", "ID");
+
+-- Claves de idempotencia de POST /api/submissions/ (header Idempotency-Key).
+-- El índice único (SCOPE, IDEMPOTENCY_KEY) es el que reserva la clave: el
+-- primer INSERT gana y los reintentos concurrentes reciben 409.
+CREATE TABLE TIFORMS.IDEMPOTENCY_KEY (
+    ID INTEGER GENERATED ALWAYS AS IDENTITY (START WITH 1 INCREMENT BY 1),
+    SCOPE VARCHAR(50) NOT NULL,
+    IDEMPOTENCY_KEY VARCHAR(255) NOT NULL,
+    REQUEST_HASH CHAR(64) NOT NULL,
+    STATUS VARCHAR(20) NOT NULL DEFAULT 'processing',
+    RESPONSE_STATUS SMALLINT,
+    RESPONSE_BODY CLOB,
+    SUBMISSION_ID INTEGER,
+    CREATED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    EXPIRES_AT TIMESTAMP NOT NULL,
+    PRIMARY KEY (ID)
+);
+
+CREATE UNIQUE INDEX "TIFORMS"."IDEMPOTENCY_KEY_SCOPE_KEY_IDX"
+ON "TIFORMS"."IDEMPOTENCY_KEY" ("SCOPE", "IDEMPOTENCY_KEY");
+
+-- Purga de claves vencidas
+CREATE INDEX "TIFORMS"."IDEMPOTENCY_KEY_EXPIRES_IDX"
+ON "TIFORMS"."IDEMPOTENCY_KEY" ("EXPIRES_AT");
+
+-- Índice de valores de campos (FormField.indexed) para buscar submissions
+-- por valor sin leer el CLOB DATA. Se llena al insertar cada submission;
+-- las existentes con `manage.py backfill_field_index`.
+ALTER TABLE TIFORMS.FORMFIELD
+ADD COLUMN INDEXED SMALLINT NOT NULL DEFAULT 0;
+
+CREATE TABLE TIFORMS.FORMSUBMISSION_FIELD_INDEX (
+    ID INTEGER GENERATED ALWAYS AS IDENTITY (START WITH 1 INCREMENT BY 1),
+    FORMSUBMISSION_ID INTEGER NOT NULL,
+    FORM_ID INTEGER NOT NULL,
+    FIELD_NAME VARCHAR(200) NOT NULL,
+    VALUE VARCHAR(255) NOT NULL,
+    PRIMARY KEY (ID),
+    FOREIGN KEY (FORMSUBMISSION_ID) REFERENCES TIFORMS.FORMSUBMISSION(ID) ON DELETE CASCADE
+);
+
+-- Búsqueda: FORM_ID = ? AND FIELD_NAME = ? AND VALUE = ? solo con el índice
+CREATE INDEX "TIFORMS"."FIELD_INDEX_LOOKUP_IDX"
+ON "TIFORMS"."FORMSUBMISSION_FIELD_INDEX" ("FORM_ID", "FIELD_NAME", "VALUE", "FORMSUBMISSION_ID");
+
+-- ON DELETE CASCADE y reindexado del backfill
+CREATE INDEX "TIFORMS"."FIELD_INDEX_SUBMISSION_IDX"
+ON "TIFORMS"."FORMSUBMISSION_FIELD_INDEX" ("FORMSUBMISSION_ID");
+
+-- Almacenamiento comprimido de DATA (SUBMISSION_STORAGE / forms/utils/submission_codec.py).
+-- Las filas comprimidas tienen DATA NULL y el JSON en DATA_BLOB con una marca
+-- de formato; las existentes se migran con `manage.py compress_submissions`.
+ALTER TABLE TIFORMS.FORMSUBMISSION
+ADD COLUMN DATA_BLOB BLOB(16M) DEFAULT NULL;
+
+-- El archivado en modo tabla copia todas las columnas
+ALTER TABLE TIFORMS.FORMSUBMISSION_ARCHIVE
+ADD COLUMN DATA_BLOB BLOB(16M) DEFAULT NULL;
+
+-- Filtros de GET /api/soporte_fomag/ (filter_fields en register_model_for_api):
+-- cada filtro con la PK para paginar por keyset dentro del rango del índice
+CREATE INDEX "BDSALUD"."TBSOPORTES_BENUMDOCBE_IDX"
+ON "BDSALUD"."TBSOPORTES" ("BENUMDOCBE", "ID");
+
+CREATE INDEX "BDSALUD"."TBSOPORTES_MRCODCONS_IDX"
+ON "BDSALUD"."TBSOPORTES" ("MRCODCONS", "ID");
+
 ALTER TABLE BDSALUD.TBSOPORTES 
 ADD COLUMN FIRMA_USUARIO VARCHAR(255) DEFAULT NULL;
\ No newline at end of file
@@ -41,11 +41,15 @@ export async function POST(
     try {
         const body = await req.text();
 
+        const headers: Record<string, string> = {
+            "Content-Type": req.headers.get("Content-Type") || "application/json",
+        };
+        const idempotencyKey = req.headers.get("Idempotency-Key");
+        if (idempotencyKey) headers["Idempotency-Key"] = idempotencyKey;
+
         const res = await fetch(backendUrl, {
             method: "POST",
-            headers: {
-                "Content-Type": req.headers.get("Content-Type") || "application/json",
-            },
+            headers,
             body,
         });
 
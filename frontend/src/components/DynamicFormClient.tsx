@@ -51,6 +51,9 @@ export default function DynamicFormClient({ form }: { form: FormData }) {
     const valuesRef = useRef<Record<number, string>>({});
     const fileRefs = useRef<Record<number, FileItem[]>>({});
     const signatureRef = useRef<SignaturePadHandle | null>(null);
+    // Se reutiliza en los reintentos del mismo envío para que el backend no
+    // duplique la submission; cambia al editar el formulario o tras enviarlo.
+    const idempotencyKeyRef = useRef<string | null>(null);
 
     // Función para determinar si un campo debe ser visible
     const shouldShowField = (field: FormField): boolean => {
@@ -118,6 +121,7 @@ export default function DynamicFormClient({ form }: { form: FormData }) {
     }
 
     const handleFieldChange = (fieldId: number, value: string) => {
+        idempotencyKeyRef.current = null;
         const previousValue = valuesRef.current[fieldId];
         valuesRef.current[fieldId] = value;
 
@@ -196,13 +200,22 @@ export default function DynamicFormClient({ form }: { form: FormData }) {
                 }
             }
 
+            if (!idempotencyKeyRef.current) {
+                // randomUUID solo existe en contextos seguros (https)
+                idempotencyKeyRef.current = typeof crypto.randomUUID === "function"
+                    ? crypto.randomUUID()
+                    : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}${Math.random().toString(36).slice(2)}`;
+            }
+
             const res = await fetch('/api/proxy/submissions/', {
                 method: "POST",
+                headers: { "Idempotency-Key": idempotencyKeyRef.current },
                 body: fd,
             });
 
             if (!res.ok) throw new Error("Error al enviar formulario");
 
+            idempotencyKeyRef.current = null;
             setSuccessMsg("✅ Formulario enviado correctamente");
             formEl.reset();
             signatureRef.current?.clear();